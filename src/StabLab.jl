@@ -2,21 +2,41 @@ module StabLab
 
 using Statistics
 using LinearAlgebra
+using Mmap
+using CodecZlib
 
 # Export main deviation functions
 export adev, mdev, mhdev, hdev, mhtotdev, tdev, ldev, totdev, mtotdev, htotdev
 
 # Export time interval error functions
-export tie, mtie, pdev, theo1
+export tie, mtie, pdev, theo1, theobr, theoh, MTIEIndex
+
+# Export multi-statistic engine
+export stability_suite
+
+# Export reusable analysis plans
+export stability_plan, execute!, StabilityPlan
+
+# Export online accumulators
+export OnlineADEV, OnlineMDEV, OnlineHDEV, OnlineTDEV, update
+
+# Export binary phase files
+export PhaseFile, write_phase_file, open_phase_file
+
+# Export decimation pyramids
+export PhasePyramid, phase_pyramid, write_pyramid, read_pyramid
+
+# Export text readers
+export read_phase_data, phase_chunks
 
 # Export helper functions
-export noise_id, compute_ci
+export noise_id, compute_ci, precompute_ci_tables
 
 # Export plotting functions
 export stabplot, load_phase_data, print_results_table, stability_report
 
 # Export data types
-export DeviationResult
+export DeviationResult, BatchDeviationResult
 
 # Core data structures
 """
@@ -51,10 +71,24 @@ end
 
 # Include source files
 include("core.jl")
+include("kernels.jl")
+include("detrend.jl")
+include("parallel.jl")
 include("noise.jl")
+include("dense.jl")
+include("edfcache.jl")
 include("confidence.jl")
+include("bootstrap.jl")
+include("totaltables.jl")
 include("deviations.jl")
+include("suite.jl")
+include("plan.jl")
+include("online.jl")
+include("phasefile.jl")
+include("reader.jl")
 include("time_error.jl")
+include("pyramid.jl")
+include("batch.jl")
 include("plotting.jl")
 
 end
\ No newline at end of file
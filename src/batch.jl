@@ -0,0 +1,102 @@
+# Batch API: many equal-length clock series per call
+#
+# Every deviation function also accepts a matrix whose columns are clocks. The
+# columns are split into one contiguous block per thread; each task copies its
+# column into contiguous memory and runs the single-series function, so tasks
+# share nothing but the read-only input and write disjoint result slots.
+
+"""
+    BatchDeviationResult{T}
+
+Deviations of several clocks on a common τ grid.
+
+# Fields
+- `tau::Vector{T}`: Averaging times τ = m·τ₀ (seconds)
+- `deviation::Matrix{T}`: Deviation values, one row per τ and one column per clock
+- `alpha::Matrix{Int}`: Noise type exponents, same layout as `deviation`
+- `neff::Vector{Int}`: Effective number of samples per τ
+- `tau0::T`: Sampling interval (seconds)
+- `N::Int`: Length of every series
+- `method::String`: Deviation type identifier
+- `confidence::T`: Confidence level used
+
+`batch[j]` returns clock j as a `DeviationResult`, e.g. for `compute_ci`.
+"""
+struct BatchDeviationResult{T<:Real}
+    tau::Vector{T}
+    deviation::Matrix{T}
+    alpha::Matrix{Int}
+    neff::Vector{Int}
+    tau0::T
+    N::Int
+    method::String
+    confidence::T
+end
+
+function BatchDeviationResult(results::AbstractVector{<:DeviationResult})
+    first_result = first(results)
+    for r in results
+        if r.tau != first_result.tau
+            throw(ArgumentError("Batch results must share one τ grid"))
+        end
+    end
+    T = eltype(first_result.deviation)
+    deviation = Matrix{T}(undef, length(first_result.tau), length(results))
+    alpha = Matrix{Int}(undef, length(first_result.tau), length(results))
+    for (j, r) in enumerate(results)
+        deviation[:, j] = r.deviation
+        alpha[:, j] = r.alpha
+    end
+    return BatchDeviationResult{T}(
+        first_result.tau, deviation, alpha, first_result.neff,
+        first_result.tau0, first_result.N, first_result.method, first_result.confidence
+    )
+end
+
+Base.length(b::BatchDeviationResult) = size(b.deviation, 2)
+
+function Base.getindex(b::BatchDeviationResult{T}, j::Int) where T
+    n = length(b.tau)
+    return DeviationResult{T}(b.tau, b.deviation[:, j], fill(T(NaN), n), fill(T(NaN), n, 2),
+                              b.alpha[:, j], b.neff, b.tau0, b.N, b.method, b.confidence)
+end
+
+"""
+    batch_deviation(func, X, tau0; threaded_columns=false, kwargs...)
+
+Apply `func(X[:, j], tau0; kwargs...)` to every column of `X` and collect the
+results in a [`BatchDeviationResult`](@ref). With `threaded_columns=true`, the
+columns are divided into `Threads.nthreads()` contiguous blocks that run as
+tasks; results do not depend on the thread count. Other keywords, including a
+per-series `threaded`, are passed on to `func`.
+"""
+function batch_deviation(func, X::AbstractMatrix{<:Real}, tau0::Real;
+                         threaded_columns::Bool=false, kwargs...)
+    n = size(X, 2)
+    if n < 1
+        throw(ArgumentError("Phase data matrix must have at least one column"))
+    end
+    results = Vector{DeviationResult}(undef, n)
+    function run_block(cols)
+        for j in cols
+            results[j] = func(X[:, j], tau0; kwargs...)
+        end
+    end
+    if threaded_columns && n > 1
+        blocks = Iterators.partition(1:n, cld(n, Threads.nthreads()))
+        @sync for cols in blocks
+            Threads.@spawn run_block(cols)
+        end
+    else
+        run_block(1:n)
+    end
+    return BatchDeviationResult(results)
+end
+
+for func in (:adev, :mdev, :mhdev, :hdev, :tdev, :ldev, :totdev, :mtotdev, :htotdev, :mhtotdev)
+    @eval $func(X::AbstractMatrix{<:Real}, tau0::Real; kwargs...) = batch_deviation($func, X, tau0; kwargs...)
+end
+
+for func in (:tie, :mtie, :pdev, :theo1, :theobr, :theoh)
+    @eval $func(X::AbstractMatrix{<:Real}, tau0::Real=1.0; kwargs...) = batch_deviation($func, X, tau0; kwargs...)
+end
@@ -0,0 +1,207 @@
+# Monte-Carlo confidence intervals (compute_ci(result; method="bootstrap"))
+#
+# For each τ, power-law noise with the identified α is simulated at the
+# record's length N and the deviation recomputed nsim times. The spread of
+# σ̂²/E[σ̂²] over the replicates gives the interval for any deviation type,
+# including mhtotdev, which has no EDF model. Replicate r always draws from
+# its own stream seeded by (seed, r), so the tables do not depend on the
+# thread count, and the sorted ratios are cached per (method, N, α, m).
+
+using Random
+
+# Replicates per τ
+const BOOTSTRAP_NSIM = 1000
+
+# Distributions kept before the least recently used are evicted
+const BOOTSTRAP_CACHE_SIZE = 256
+
+# (method, N, α, m, nsim, seed) => sorted σ̂²/mean(σ̂²) over the replicates
+const BOOTSTRAP_CACHE = LRUCache{Tuple{String,Int,Int,Int,Int,Int},Vector{Float64}}(BOOTSTRAP_CACHE_SIZE)
+
+# Statistic simulated for each deviation type: the ones that are rescaled
+# versions of another share its replicates
+const BOOTSTRAP_BASE = Dict(
+    "adev" => "adev", "mdev" => "mdev", "tdev" => "mdev", "hdev" => "hdev",
+    "mhdev" => "mhdev", "ldev" => "mhdev", "totdev" => "totdev",
+    "mtotdev" => "mtotdev", "htotdev" => "htotdev", "mhtotdev" => "mhtotdev"
+)
+
+"""
+    BootstrapWorkspace(N)
+
+Per-worker buffers for the replicates of one record length: the simulated
+phase `x`, its first difference `y` (for htotdev), the random stream and the
+reflected-subsequence scratch space.
+"""
+struct BootstrapWorkspace
+    x::Vector{Float64}
+    y::Vector{Float64}
+    rng::MersenneTwister
+    reflected::ReflectedWorkspace{Float64}
+end
+
+BootstrapWorkspace(N::Int) =
+    BootstrapWorkspace(zeros(N), zeros(N - 1), MersenneTwister(0), ReflectedWorkspace{Float64}())
+
+"""
+    powerlaw_noise!(x, alpha, rng)
+
+Fill `x` with phase data whose fractional frequency has power-law exponent
+`alpha` ∈ -2..2: white (α even) or flicker (α odd) noise integrated
+(2 - α) ÷ 2 times. The level is arbitrary; the bootstrap only uses ratios.
+"""
+function powerlaw_noise!(x::Vector{Float64}, alpha::Int, rng::AbstractRNG)
+    if isodd(alpha)
+        flicker_noise!(x, rng)
+    else
+        randn!(rng, x)
+    end
+    for _ in 1:(2 - alpha) ÷ 2
+        @inbounds for i in 2:length(x)
+            x[i] += x[i-1]
+        end
+    end
+    return x
+end
+
+"""
+    flicker_noise!(x, rng)
+
+1/f noise as the sum of unit-variance first-order autoregressive processes
+with corner frequencies π·2⁻ᵏ, one per octave down to below 1/N. Each process
+starts in its stationary distribution, so the series has no start-up
+transient.
+"""
+function flicker_noise!(x::Vector{Float64}, rng::AbstractRNG)
+    fill!(x, 0.0)
+    for k in 1:ceil(Int, log2(length(x))) + 1
+        a = exp(-π * 2.0^-k)
+        b = sqrt(1 - a^2)
+        s = randn(rng)
+        @inbounds for i in eachindex(x)
+            s = a * s + b * randn(rng)
+            x[i] += s
+        end
+    end
+    return x
+end
+
+"""
+    bootstrap_sumsq(method, ws, m)
+
+Raw sum behind `method` at averaging factor m for the replicate in `ws`. Its
+normalization depends only on N and m, so it cancels in σ̂²/E[σ̂²].
+"""
+function bootstrap_sumsq(method::String, ws::BootstrapWorkspace, m::Int)
+    x = ws.x
+    if method == "adev"
+        return adev_sumsq(x, m)
+    elseif method == "mdev"
+        return mdev_sumsq(x, m)
+    elseif method == "hdev"
+        return hdev_sumsq(x, m)
+    elseif method == "mhdev"
+        return first(mhdev_sumsq(x, m))
+    elseif method == "totdev"
+        return totdev_sumsq(x, m)
+    elseif method == "mtotdev"
+        return mtotdev_sumsq!(ws.reflected, x, m)
+    elseif method == "htotdev"
+        return m == 1 ? hdev_sumsq(x, 1) : htotdev_sumsq!(ws.reflected, ws.y, m)
+    else
+        return mhtotdev_sumsq!(ws.reflected, x, m)
+    end
+end
+
+"""
+    bootstrap_ratios(method, N, alpha, mlist, nsim, seed; threaded=false)
+
+Simulate `nsim` records of N points at noise exponent α and return, for each
+m of `mlist`, the sorted ratios σ̂²/mean(σ̂²) as the columns of an nsim×length(mlist)
+matrix. Replicates go through a [`work_queue`](@ref) with one
+[`BootstrapWorkspace`](@ref) per worker.
+"""
+function bootstrap_ratios(method::String, N::Int, alpha::Int, mlist::AbstractVector{Int},
+                          nsim::Int, seed::Int; threaded::Bool=false)
+    sums = zeros(nsim, length(mlist))
+    work_queue(collect(1:nsim), () -> BootstrapWorkspace(N); threaded=threaded) do r, ws
+        Random.seed!(ws.rng, hash((seed, r)))
+        powerlaw_noise!(ws.x, alpha, ws.rng)
+        if method == "htotdev"
+            @inbounds for i in eachindex(ws.y)
+                ws.y[i] = ws.x[i+1] - ws.x[i]
+            end
+        end
+        for (j, m) in enumerate(mlist)
+            sums[r, j] = bootstrap_sumsq(method, ws, m)
+        end
+    end
+    for j in eachindex(mlist)
+        col = view(sums, :, j)
+        col ./= mean(col)
+        sort!(col)
+    end
+    return sums
+end
+
+"""
+    bootstrap_ci(result, confidence_level; nsim=BOOTSTRAP_NSIM, seed=0, threaded=false)
+
+Monte-Carlo intervals behind `compute_ci(result; method="bootstrap")`.
+
+With q_lo and q_hi the (1 ∓ confidence)/2 quantiles of σ̂²/E[σ̂²] over the
+replicates, the interval is [σ̂/√q_hi, σ̂/√q_lo], and the EDF is the
+chi-squared equivalent 2/var(σ̂²/E[σ̂²]). For the total deviations E[σ̂²]
+includes their bias, matching the uncorrected values they report. α outside
+-2..2 is simulated at the nearest end of that range. All τ sharing an α are
+simulated from the same replicates; τ whose distribution is cached are not
+simulated again.
+"""
+function bootstrap_ci(result::DeviationResult{T}, confidence_level::Real;
+                      nsim::Int=BOOTSTRAP_NSIM, seed::Int=0,
+                      threaded::Bool=false) where T<:Real
+    haskey(BOOTSTRAP_BASE, result.method) ||
+        throw(ArgumentError("Bootstrap confidence intervals are not available for $(result.method)"))
+    nsim >= 2 || throw(ArgumentError("nsim must be at least 2"))
+    method = BOOTSTRAP_BASE[result.method]
+    dev = result.deviation
+    L = length(dev)
+    N = result.N
+    ms = [round(Int, tau / result.tau0) for tau in result.tau]
+    alphas = clamp.(result.alpha, -2, 2)
+    key(k) = (method, N, alphas[k], ms[k], nsim, seed)
+
+    ratios = Vector{Vector{Float64}}(undef, L)
+    valid = [k for k in 1:L if isfinite(dev[k])]
+    for alpha in unique(alphas[valid])
+        ks = [k for k in valid if alphas[k] == alpha]
+        todo = unique([ms[k] for k in ks if !haskey(BOOTSTRAP_CACHE, key(k))])
+        if !isempty(todo)
+            table = bootstrap_ratios(method, N, alpha, todo, nsim, seed; threaded=threaded)
+            for (j, m) in enumerate(todo)
+                cached!(() -> table[:, j], BOOTSTRAP_CACHE, (method, N, alpha, m, nsim, seed))
+            end
+        end
+        for k in ks
+            ratios[k] = cached!(BOOTSTRAP_CACHE, key(k)) do
+                vec(bootstrap_ratios(method, N, alpha, [ms[k]], nsim, seed; threaded=threaded))
+            end
+        end
+    end
+
+    ci = fill(T(NaN), L, 2)
+    edf = fill(T(NaN), L)
+    p = (1 - confidence_level) / 2
+    for k in valid
+        q = ratios[k]
+        q_lo, q_hi = quantile(q, p; sorted=true), quantile(q, 1 - p; sorted=true)
+        ci[k, 1] = dev[k] / sqrt(q_hi)
+        ci[k, 2] = q_lo > 0 ? dev[k] / sqrt(q_lo) : T(Inf)
+        edf[k] = 2 / var(q)
+    end
+
+    return DeviationResult(
+        result.tau, dev, edf, ci, result.alpha, result.neff,
+        result.tau0, result.N, result.method, T(confidence_level)
+    )
+end
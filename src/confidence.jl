@@ -4,21 +4,29 @@
 using Statistics, Distributions
 
 """
-    compute_ci(result::DeviationResult{T}, confidence_level::T=0.683; method::String="full") where T<:Real
+    compute_ci(result::DeviationResult{T}, confidence_level::Real=0.683; method::String="full",
+               nsim=1000, seed=0, threaded=false) where T<:Real
 
 Compute confidence intervals for stability deviations.
 
 # Arguments
 - `result`: DeviationResult struct containing deviation values and metadata
 - `confidence_level`: Confidence level (default: 0.683 for 68.3%)
-- `method`: Computation method ("full" or "simple")
+- `method`: Computation method ("full", "simple" or "bootstrap")
   - "full": EDF-based chi-squared intervals with noise identification (default)
   - "simple": Basic statistical errors σ/√n (matches AllanTools)
+  - "bootstrap": Monte-Carlo intervals from simulated power-law noise
+- `nsim`, `seed`, `threaded`: Replicates per τ, random seed and whether replicates
+  are spread over threads (opt-in, "bootstrap" only; results do not depend on the
+  thread count)
 
 # Returns
 Updated DeviationResult with confidence intervals computed.
 
 # Method (full)
+Noise exponents are taken from `result.alpha`, which holds the α values identified
+by the deviation call (`noise=:auto` or a precomputed vector) and White FM otherwise.
+
 1. Calculate equivalent degrees of freedom (EDF) for each tau point
 2. Use chi-squared confidence intervals when EDF is available
 3. Fall back to Gaussian intervals with Kn factors when EDF unavailable
@@ -27,11 +35,24 @@ Updated DeviationResult with confidence intervals computed.
 1. Use simple statistical standard error: σ/√n
 2. Apply Gaussian confidence intervals with z-scores
 
+# Method (bootstrap)
+1. Simulate `nsim` records of the same length with the noise type α of each τ
+2. Recompute the deviation of every replicate with the allocation-free kernels
+3. Take the interval from the quantiles of σ̂²/E[σ̂²] over the replicates
+
+Works for every deviation type, including mhtotdev, which has no EDF model.
+Distributions are cached per (method, N, α, m), so repeated calls do not simulate again.
+
 # References
 - NIST SP1065 Appendix A (EDF calculation)
 - Riley & Howe frequency stability analysis
 """
-function compute_ci(result::DeviationResult{T}, confidence_level::T=0.683; method::String="full") where T<:Real
+function compute_ci(result::DeviationResult{T}, confidence_level::Real=0.683; method::String="full",
+                    nsim::Int=BOOTSTRAP_NSIM, seed::Int=0, threaded::Bool=false) where T<:Real
+    if method == "bootstrap"
+        return bootstrap_ci(result, confidence_level; nsim=nsim, seed=seed, threaded=threaded)
+    end
+    
     dev = result.deviation
     alpha = result.alpha
     N = fill(result.N, length(dev))  # Original data length for all tau
@@ -63,7 +84,7 @@ function compute_ci(result::DeviationResult{T}, confidence_level::T=0.683; metho
         # Return updated result
         return DeviationResult(
             result.tau, dev, edf, ci, alpha, result.neff,
-            result.tau0, result.N, result.method, confidence_level
+            result.tau0, result.N, result.method, T(confidence_level)
         )
     end
     
@@ -84,10 +105,8 @@ function compute_ci(result::DeviationResult{T}, confidence_level::T=0.683; metho
             ci[k, 1] = dev[k] - margin
             ci[k, 2] = dev[k] + margin
         else
-            # Chi-squared confidence intervals using EDF
-            alpha_chi = 1 - confidence_level
-            chi2_lo = quantile(Chisq(edf_val), alpha_chi/2)
-            chi2_hi = quantile(Chisq(edf_val), 1 - alpha_chi/2)
+            # Chi-squared confidence intervals using EDF (memoized quantiles)
+            chi2_lo, chi2_hi = chi2_bounds(edf_val, confidence_level)
             ci[k, 1] = dev[k] * sqrt(edf_val / chi2_hi)
             ci[k, 2] = dev[k] * sqrt(edf_val / chi2_lo)
         end
@@ -96,7 +115,7 @@ function compute_ci(result::DeviationResult{T}, confidence_level::T=0.683; metho
     # Return updated result with computed confidence intervals and EDF
     return DeviationResult(
         result.tau, dev, edf, ci, alpha, result.neff,
-        result.tau0, result.N, result.method, confidence_level
+        result.tau0, result.N, result.method, T(confidence_level)
     )
 end
 
@@ -117,10 +136,19 @@ function calculate_edf_for_method(method::String, alpha::Int, tau::Real,
         # Overlapping Allan deviation: d=2, F=m (unmodified), S=m (overlapped)
         return calculate_edf(alpha, 2, m, m, m, N)
         
+    elseif method in ["adev_decimated"]
+        # ADEV of x[1:m:end] from a PhasePyramid: terms every m samples, S=1
+        return calculate_edf(alpha, 2, m, m, 1, N)
+        
     elseif method in ["mdev"]  
         # Modified Allan deviation: d=2, F=1 (modified), S=1 (non-overlapped)
         return calculate_edf(alpha, 2, m, 1, 1, N)
         
+    elseif method in ["mdev_strided"]
+        # MDEV from a PhasePyramid: windows every g = 2^trailing_zeros(m) samples,
+        # i.e. stride factor S = m/g
+        return calculate_edf(alpha, 2, m, 1, m >> trailing_zeros(m), N)
+        
     elseif method in ["hdev"]
         # Hadamard deviation (non-overlapping): d=3, F=m (unmodified), S=1 (non-overlapped)
         return calculate_edf(alpha, 3, m, m, 1, N)
@@ -177,8 +205,19 @@ Core EDF calculation using NIST SP1065 formulation.
 - `F`: Filter factor (1: modified, m: unmodified)  
 - `S`: Stride factor (1: non-overlapped, m: overlapped)
 - `N`: Number of phase data points
+
+Results are memoized in a bounded LRU cache shared by all threads.
 """
 function calculate_edf(alpha::Int, d::Int, m::Int, F::Int, S::Int, N::Int)
+    return cached!(() -> sp1065_edf(alpha, d, m, F, S, N), EDF_CACHE, (alpha, d, m, F, S, N))
+end
+
+"""
+    sp1065_edf(alpha, d, m, F, S, N)
+
+Uncached EDF of [`calculate_edf`](@ref).
+"""
+function sp1065_edf(alpha::Int, d::Int, m::Int, F::Int, S::Int, N::Int)
     # Check restriction
     if alpha + 2*d <= 1
         return NaN  # Invalid parameters
@@ -210,9 +249,14 @@ end
 """
     totaldev_edf(var_type, alpha, T, tau)
 
-Specialized EDF calculation for total deviation types.
+Specialized EDF calculation for total deviation types. Read from the simulated
+tables ([`table_lookup`](@ref)) when they cover α and T/τ, otherwise from the
+published coefficients.
 """
 function totaldev_edf(var_type::String, alpha::Int, T::Real, tau::Real)
+    edf = table_lookup(:edf, var_type, alpha, T / tau)
+    isnan(edf) || return edf
+    
     if var_type == "totvar"
         b, c = coeff_totvar(alpha)
         return b * (T / tau) - c
@@ -355,13 +399,21 @@ end
 """
     bias_correction(alpha, var_type, tau, T)
 
-Bias factor B(α) for TOTVAR, MTOT, and HTOT corrections.
+Bias factor B(α) for TOTVAR, MTOT, HTOT and MHTOT corrections.
 
 Translated from MATLAB stablab/+stablab/bias_correction.m
 
+Every factor is a deviation ratio B = √R, where R = E[total]/E[underlying
+variance] (AVAR, MVAR, HVAR or MHVAR), so that σ/B in
+[`apply_bias_correction!`](@ref) estimates the underlying deviation. R is read
+from the simulated tables ([`table_lookup`](@ref)) for the α they cover, which
+hold it constant beyond both ends of the T/τ grid. For other α, R comes from
+the published values below, converted to the same ratio; α with no published
+value get R = 1 (no correction).
+
 # Arguments
 - `alpha`: noise exponent α (scalar or vector)
-- `var_type`: "totvar", "mtot", or "htot"
+- `var_type`: "totvar", "mtot", "htot" or "mhtot"
 - `tau`: averaging time τ (same shape as alpha)
 - `T`: record duration T = N·τ₀ (scalar)
 
@@ -393,63 +445,47 @@ function bias_correction(alpha::Union{Int,Vector{Int}}, var_type::String,
     end
     
     var_type_lower = lowercase(var_type)
+    if !(var_type_lower in ("totvar", "mtot", "htot", "mhtot"))
+        error("Unknown var_type \"$var_type\". Use \"totvar\", \"mtot\", \"htot\" or \"mhtot\".")
+    end
     
-    if var_type_lower == "totvar"
-        # TOTVAR: B(τ) = 1 - a * (τ / T)
-        for k in eachindex(alpha)
-            if alpha[k] == -1
-                a = 1 / (3 * log(2))  # ≈ 0.481
-                B[k] = 1 - a * (tau[k] / T)
-            elseif alpha[k] == -2
-                a = 0.75
-                B[k] = 1 - a * (tau[k] / T)
-            else
-                B[k] = 1.0  # no correction for other α
-            end
-        end
-        
-    elseif var_type_lower == "mtot"
-        # MTOTDEV bias factors from SP1065 Table 11
-        bias_table = Dict(
-            2 => 1.06,
-            1 => 1.17,
-            0 => 1.27,
-            -1 => 1.30,
-            -2 => 1.31
-        )
-        for k in eachindex(alpha)
-            if haskey(bias_table, alpha[k])
-                B[k] = bias_table[alpha[k]]
-            else
-                B[k] = 1.0
-            end
-        end
-        
-    elseif var_type_lower == "htot"
-        # HTOT bias: B = 1 / (1 + a), using a(α) from Table 1 (FCS 2001)
-        a_table = Dict(
-            0 => -0.005,
-            -1 => -0.149,
-            -2 => -0.229,
-            -3 => -0.283,
-            -4 => -0.321
-        )
-        for k in eachindex(alpha)
-            if haskey(a_table, alpha[k])
-                a = a_table[alpha[k]]
-                B[k] = 1 / (1 + a)  # bias factor = 1 / (1 + a)
-            else
-                B[k] = 1.0  # fallback if α not listed
-            end
+    for k in eachindex(alpha)
+        R = table_lookup(:bias, var_type_lower, alpha[k], T / tau[k])
+        if isnan(R)
+            R = published_bias_ratio(var_type_lower, alpha[k], tau[k] / T)
         end
-        
-    else
-        error("Unknown var_type \"$var_type\". Use \"totvar\", \"mtot\", or \"htot\".")
+        B[k] = sqrt(R)
     end
     
     return B
 end
 
+"""
+    published_bias_ratio(var_type, alpha, tau_over_T)
+
+Published E[total]/E[underlying variance] for `var_type` at α, or 1.0 when
+none is published:
+
+- TOTVAR: 1 - a·τ/T with a = 1/(3 ln 2) (Flicker FM) or 0.75 (Random Walk FM)
+- MTOT: the inverse of the SP1065 Table 11 factors E[MVAR]/E[MTOT]
+- HTOT: 1 + a with a(α) from Table 1 (FCS 2001)
+- MHTOT: none; the HTOT values do not carry over
+"""
+function published_bias_ratio(var_type::String, alpha::Int, tau_over_T::Real)
+    if var_type == "totvar"
+        alpha == -1 && return 1 - tau_over_T / (3 * log(2))  # a ≈ 0.481
+        alpha == -2 && return 1 - 0.75 * tau_over_T
+    elseif var_type == "mtot"
+        # MTOTDEV bias factors from SP1065 Table 11
+        mtot_table = Dict(2 => 1.06, 1 => 1.17, 0 => 1.27, -1 => 1.30, -2 => 1.31)
+        haskey(mtot_table, alpha) && return 1 / mtot_table[alpha]
+    elseif var_type == "htot"
+        htot_a = Dict(0 => -0.005, -1 => -0.149, -2 => -0.229, -3 => -0.283, -4 => -0.321)
+        haskey(htot_a, alpha) && return 1 + htot_a[alpha]
+    end
+    return 1.0
+end
+
 """
     apply_bias_correction!(result::DeviationResult)
 
@@ -467,7 +503,7 @@ function apply_bias_correction!(result::DeviationResult)
             "totdev" => "totvar",
             "mtotdev" => "mtot", 
             "htotdev" => "htot",
-            "mhtotdev" => "htot"  # Use htot correction for mhtotdev
+            "mhtotdev" => "mhtot"
         )
         
         var_type = var_type_map[method]
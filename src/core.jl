@@ -33,24 +33,3 @@ function default_m_list(N::Int)
     max_power = floor(Int, log2(N/2))
     return [2^k for k in 0:max_power]
 end
-
-"""
-    detrend_linear(x)
-
-Remove linear trend from data using least squares fit.
-"""
-function detrend_linear(x::AbstractVector{T}) where T<:Real
-    n = length(x)
-    if n < 2
-        return copy(x)
-    end
-    
-    # Create design matrix [ones(n) 1:n] for linear fit y = a + b*t
-    A = [ones(T, n) T.(1:n)]
-    
-    # Least squares solution: coeffs = A \ x
-    coeffs = A \ x
-    
-    # Remove trend: x - A*coeffs  
-    return x - A * coeffs
-end
\ No newline at end of file
@@ -0,0 +1,248 @@
+# Dense "every m" sums for ADEV, HDEV and MDEV through FFT correlations
+#
+# Expanding the squared difference of a τ kernel turns its sum over i into
+# sums of x², the autocorrelation R(ℓ) = Σ x[j]·x[j+ℓ], and the first or last
+# few terms of R(ℓ) that fall outside the kernel's range of i. One FFT gives
+# R at every lag, and a divide-and-conquer over lags gives the partial terms,
+# so all m = 1..M cost O(N log N + M log² M) instead of O(N·M).
+#
+# Expanding squares cancels: the rounding error scales with Σx² rather than
+# with the result. The data are detrended first (the differences do not see a
+# line, or for HDEV a parabola), and any m whose error bound exceeds
+# DENSE_RTOL of its sum is recomputed with the direct kernel.
+
+# Lag ranges at most this wide are summed directly in head_sums
+const DENSE_DIRECT_LAGS = 64
+
+# Relative rounding bound above which a dense sum is recomputed directly
+const DENSE_RTOL = 1e-8
+
+"""
+    dense_mlist(mlist)
+
+True for `mlist=:all`, the dense every-m mode of `adev`, `mdev`, `hdev` and `tdev`.
+"""
+function dense_mlist(mlist)
+    if mlist isa Symbol && mlist !== :all
+        throw(ArgumentError("mlist must be a vector of averaging factors or :all, got :$mlist"))
+    end
+    return mlist === :all
+end
+
+"""
+    fft_radix2!(a; inverse=false)
+
+In-place iterative radix-2 FFT of a complex vector whose length is a power of
+two, with a precomputed twiddle table. The inverse includes the 1/n factor.
+"""
+function fft_radix2!(a::Vector{ComplexF64}; inverse::Bool=false)
+    n = length(a)
+    if !ispow2(n)
+        throw(ArgumentError("FFT length must be a power of two, got $n"))
+    end
+
+    # Bit-reversal permutation
+    j = 0
+    @inbounds for i in 1:n-1
+        bit = n >> 1
+        while j & bit != 0
+            j ⊻= bit
+            bit >>= 1
+        end
+        j |= bit
+        if i < j
+            a[i+1], a[j+1] = a[j+1], a[i+1]
+        end
+    end
+
+    sgn = inverse ? 1 : -1
+    tw = [cispi(sgn * 2 * k / n) for k in 0:n÷2-1]
+    len = 2
+    @inbounds while len <= n
+        half = len ÷ 2
+        step = n ÷ len
+        for s in 0:len:n-1
+            for k in 0:half-1
+                u = a[s+k+1]
+                v = a[s+k+half+1] * tw[k*step+1]
+                a[s+k+1] = u + v
+                a[s+k+half+1] = u - v
+            end
+        end
+        len <<= 1
+    end
+    if inverse
+        a ./= n
+    end
+    return a
+end
+
+"""
+    xcorr_fft(a, b, D)
+
+Cross-correlation c[d+1] = Σₜ a[t]·b[t+d] for d = 0..D, with b taken as zero
+past its end. a and b travel as the real and imaginary parts of one complex
+FFT, padded so that no other lag aliases onto 0..D.
+"""
+function xcorr_fft(a::AbstractVector{Float64}, b::AbstractVector{Float64}, D::Int)
+    n = nextpow(2, max(length(b), length(a) + D, 1))
+    z = zeros(ComplexF64, n)
+    @inbounds for t in 1:length(a)
+        z[t] = a[t]
+    end
+    @inbounds for t in 1:length(b)
+        z[t] += im * b[t]
+    end
+    fft_radix2!(z)
+
+    w = similar(z)
+    @inbounds for k in 0:n-1
+        Zk = z[k+1]
+        Zc = conj(z[(n-k)%n+1])
+        A = (Zk + Zc) / 2
+        B = (Zk - Zc) / 2im
+        w[k+1] = conj(A) * B
+    end
+    fft_radix2!(w; inverse=true)
+    return [real(w[d+1]) for d in 0:D]
+end
+
+"""
+    head_sums(x, lim, L)
+
+H[ℓ] = Σ_{j=1}^{lim(ℓ)} x[j]·x[j+ℓ] for ℓ = 1..L, with `lim` nondecreasing.
+The region j ≤ lim(ℓ) is split recursively into the lower half of the lag
+range, a rectangle of whole columns evaluated as one FFT correlation, and the
+triangle left above it, O(L log² L) in total.
+"""
+function head_sums(x::AbstractVector{Float64}, lim, L::Int)
+    H = zeros(L)
+    head_sums!(H, x, lim, 1, L, 1)
+    return H
+end
+
+function head_sums!(H::Vector{Float64}, x::AbstractVector{Float64}, lim, la::Int, lb::Int, ja::Int)
+    la > lb && return H
+    if lb - la < DENSE_DIRECT_LAGS
+        @inbounds for ℓ in la:lb
+            s = 0.0
+            for j in ja:lim(ℓ)
+                s += x[j] * x[j+ℓ]
+            end
+            H[ℓ] += s
+        end
+        return H
+    end
+    mid = (la + lb + 1) ÷ 2
+    head_sums!(H, x, lim, la, mid - 1, ja)
+    jb = lim(mid)
+    if jb >= ja
+        c = xcorr_fft(view(x, ja:jb), view(x, ja+mid:jb+lb), lb - mid)
+        for d in 0:lb-mid
+            H[mid+d] += c[d+1]
+        end
+    end
+    return head_sums!(H, x, lim, mid, lb, max(ja, jb + 1))
+end
+
+# Σ z² over a..b from the running sums P
+energy(P, a, b) = P[b+1] - P[a]
+
+"""
+    second_difference_sums(z, M)
+
+Σᵢ(z[i+2m] - 2z[i+m] + z[i])², i = 1..N-2m, for m = 1..M (2M < N), plus the
+absolute rounding bound shared by all m.
+"""
+function second_difference_sums(z::Vector{Float64}, M::Int)
+    N = length(z)
+    R = xcorr_fft(z, z, 2*M)                  # R[ℓ+1] = Σ_{j=1}^{N-ℓ} z[j]z[j+ℓ]
+    P = [0.0; cumsum(z .^ 2)]
+    H = head_sums(z, identity, M)             # first m terms of R(m)
+    T = head_sums(reverse(z), identity, M)    # last m terms of R(m)
+    S = [energy(P, 2m+1, N) + 4*energy(P, m+1, N-m) + energy(P, 1, N-2m) -
+         4*(R[m+1] - H[m]) - 4*(R[m+1] - T[m]) + 2*R[2m+1] for m in 1:M]
+    bound = 16 * eps() * (log2(nextpow(2, N + 2M)) + 1) * P[end]
+    return S, bound
+end
+
+"""
+    third_difference_sums(z, M)
+
+Σᵢ(z[i+3m] - 3z[i+2m] + 3z[i+m] - z[i])², i = 1..N-3m, for m = 1..M (3M < N),
+plus the absolute rounding bound shared by all m.
+"""
+function third_difference_sums(z::Vector{Float64}, M::Int)
+    N = length(z)
+    zr = reverse(z)
+    R = xcorr_fft(z, z, 3*M)
+    P = [0.0; cumsum(z .^ 2)]
+    H1 = head_sums(z, identity, M)            # first m terms of R(m)
+    H2 = head_sums(z, ℓ -> 2ℓ, M)             # first 2m terms of R(m)
+    Hh = head_sums(z, ℓ -> ℓ ÷ 2, 2M)         # first m terms of R(2m)
+    T1 = head_sums(zr, identity, M)
+    T2 = head_sums(zr, ℓ -> 2ℓ, M)
+    Th = head_sums(zr, ℓ -> ℓ ÷ 2, 2M)
+    S = Vector{Float64}(undef, M)
+    for m in 1:M
+        squares = energy(P, 3m+1, N) + 9*energy(P, 2m+1, N-m) +
+                  9*energy(P, m+1, N-2m) + energy(P, 1, N-3m)
+        # Products of the taps at offsets (a·m, b·m), each over its own range of j
+        p01 = R[m+1] - T2[m]
+        p02 = R[2m+1] - Th[2m]
+        p12 = R[m+1] - H1[m] - T1[m]
+        p13 = R[2m+1] - Hh[2m]
+        p23 = R[m+1] - H2[m]
+        S[m] = squares - 6*p01 + 6*p02 - 2*R[3m+1] - 18*p12 + 6*p13 - 6*p23
+    end
+    bound = 64 * eps() * (log2(nextpow(2, N + 3M)) + 1) * P[end]
+    return S, bound
+end
+
+# Recompute the m whose dense sum is not clearly above its rounding bound
+function refine_dense!(S::Vector{Float64}, bound::Float64, direct)
+    for m in eachindex(S)
+        if !(S[m] > bound / DENSE_RTOL)
+            S[m] = direct(m)
+        end
+    end
+    return S
+end
+
+"""
+    dense_adev_sumsq(x, M)
+
+`adev_sumsq(x, m)` for every m = 1..M, M < N/2, through FFT correlations of the
+linearly detrended data.
+"""
+function dense_adev_sumsq(x::AbstractVector{<:Real}, M::Int)
+    z = detrend!(Vector{Float64}(x), 1)
+    S, bound = second_difference_sums(z, M)
+    return refine_dense!(S, bound, m -> adev_sumsq(x, m))
+end
+
+"""
+    dense_hdev_sumsq(x, M)
+
+`hdev_sumsq(x, m)` for every m = 1..M, M < N/3, through FFT correlations of the
+quadratically detrended data.
+"""
+function dense_hdev_sumsq(x::AbstractVector{<:Real}, M::Int)
+    z = detrend!(Vector{Float64}(x), 2)
+    S, bound = third_difference_sums(z, M)
+    return refine_dense!(S, bound, m -> hdev_sumsq(x, m))
+end
+
+"""
+    dense_mdev_sumsq(x, M)
+
+`mdev_sumsq(x, m)` for every m = 1..M, M ≤ N/3. The MDEV window sum Dᵢ is the
+lag-m third difference of the running sum C = [0; cumsum(x)], so this is the
+HDEV computation applied to C.
+"""
+function dense_mdev_sumsq(x::AbstractVector{<:Real}, M::Int)
+    C = [0.0; cumsum(Vector{Float64}(x))]
+    z = detrend!(C, 2)
+    S, bound = third_difference_sums(z, M)
+    return refine_dense!(S, bound, m -> mdev_sumsq(x, m))
+end
@@ -0,0 +1,175 @@
+# Closed-form least-squares polynomial detrending
+#
+# Linear and quadratic trends are fitted from running power sums instead of a
+# design matrix. The sample index is centred and scaled,
+# u = (i - centre)/halfwidth, so on the n-point grid the odd power sums of u
+# vanish and Σu², Σu⁴ have closed forms: the normal equations decouple and
+# only Σx, Σu·x and Σu²·x are needed, gathered in one pass. TrendSums
+# collects them one chunk at a time (phase files, streamed records); the
+# resulting TrendFit is subtracted in place (detrend!), into a copy (detrend)
+# or as elements are read (detrended).
+
+"""
+    TrendSums{S}(n)
+
+Running power sums Σx, Σu·x and Σu²·x of an n-point record, fed in order with
+`append!(sums, chunk)`. The record length is fixed up front because it sets
+the centre and scale of u. Turn the sums into a fit with
+[`trend_fit`](@ref).
+"""
+mutable struct TrendSums{S<:Real}
+    n::Int
+    centre::Float64
+    halfwidth::Float64
+    seen::Int
+    s0::S
+    s1::S
+    s2::S
+end
+
+TrendSums{S}(n::Int) where S<:Real =
+    TrendSums{S}(n, (n + 1) / 2, max(n / 2, 1.0), 0, zero(S), zero(S), zero(S))
+
+function Base.append!(sums::TrendSums{S}, chunk::AbstractVector{<:Real}) where S
+    base = sums.seen
+    if base + length(chunk) > sums.n
+        throw(ArgumentError("Chunks exceed the $(sums.n)-point record"))
+    end
+    centre, halfwidth = sums.centre, sums.halfwidth
+    s0, s1, s2 = sums.s0, sums.s1, sums.s2
+    @inbounds for j in 1:length(chunk)
+        u = (base + j - centre) / halfwidth
+        xj = S(chunk[j])
+        s0 += xj
+        s1 += u * xj
+        s2 += u * u * xj
+    end
+    sums.s0, sums.s1, sums.s2 = s0, s1, s2
+    sums.seen = base + length(chunk)
+    return sums
+end
+
+"""
+    TrendFit{S}
+
+Least-squares polynomial c0 + c1·u + c2·u² in the centred, scaled index
+u = (i - centre)/halfwidth of a record (c2 = 0 for a line). `fit(i)` is the
+trend at sample i.
+"""
+struct TrendFit{S<:Real}
+    c0::S
+    c1::S
+    c2::S
+    centre::Float64
+    halfwidth::Float64
+end
+
+@inline function (fit::TrendFit)(i::Integer)
+    u = (i - fit.centre) / fit.halfwidth
+    return fit.c0 + (fit.c1 + fit.c2 * u) * u
+end
+
+"""
+    trend_fit(x, degree)
+    trend_fit(sums::TrendSums, degree)
+
+Least-squares polynomial of `degree` (1 or 2) through x, from one pass of
+power sums accumulated in `accumulation_type(eltype(x))`, or from sums that
+cover the whole record. With Σu² = n(n²-1)/12h² and Σu⁴ = n(n²-1)(3n²-7)/240h⁴
+the coefficients are closed form. Returns a [`TrendFit`](@ref).
+"""
+function trend_fit(sums::TrendSums{S}, degree::Int) where S
+    if !(degree in (1, 2))
+        throw(ArgumentError("Trend degree must be 1 or 2, got $degree"))
+    end
+    if sums.seen != sums.n
+        throw(ArgumentError("Trend sums cover $(sums.seen) of $(sums.n) points"))
+    end
+    n = sums.n
+    nf = Float64(n)
+    h = sums.halfwidth
+    U2 = nf * (nf^2 - 1) / 12 / h^2
+    U4 = nf * (nf^2 - 1) * (3 * nf^2 - 7) / 240 / h^4
+    c1 = n > 1 ? sums.s1 / U2 : zero(S)
+    if degree == 2 && n > 2
+        D = nf * U4 - U2^2
+        c0 = (U4 * sums.s0 - U2 * sums.s2) / D
+        c2 = (nf * sums.s2 - U2 * sums.s0) / D
+    else
+        c0, c2 = sums.s0 / max(n, 1), zero(S)
+    end
+    return TrendFit{S}(c0, c1, c2, sums.centre, h)
+end
+
+trend_fit(x::AbstractVector{T}, degree::Int) where T<:Real =
+    trend_fit(append!(TrendSums{accumulation_type(T)}(length(x)), x), degree)
+
+"""
+    detrend!(x, degree)
+    detrend!(x, fit; offset=0)
+
+Subtract the least-squares polynomial of `degree` (1 or 2) from x in place and
+return x; no design matrix or trend vector is allocated. With a
+[`TrendFit`](@ref), x holds samples offset+1 .. offset+length(x) of the fitted
+record, so a chunked record is detrended one chunk at a time.
+"""
+function detrend!(x::AbstractVector{<:Real}, fit::TrendFit; offset::Int=0)
+    @inbounds for j in 1:length(x)
+        x[j] -= fit(offset + j)
+    end
+    return x
+end
+
+detrend!(x::AbstractVector{<:Real}, degree::Int) = detrend!(x, trend_fit(x, degree))
+
+"""
+    detrend(x, degree)
+
+Detrended copy of x (floating point), see [`detrend!`](@ref).
+"""
+detrend(x::AbstractVector{T}, degree::Int) where T<:Real =
+    detrend!(copyto!(Vector{float(T)}(undef, length(x)), x), degree)
+
+"""
+    DetrendedView(x, fit)
+
+Read-only vector x[i] - fit(i), computed as elements are read. Create with
+[`detrended`](@ref).
+"""
+struct DetrendedView{T<:AbstractFloat,V<:AbstractVector,S} <: AbstractVector{T}
+    parent::V
+    fit::TrendFit{S}
+end
+
+DetrendedView(x::AbstractVector{T}, fit::TrendFit{S}) where {T<:Real,S} =
+    DetrendedView{float(T),typeof(x),S}(x, fit)
+
+Base.size(v::DetrendedView) = (length(v.parent),)
+
+Base.@propagate_inbounds Base.getindex(v::DetrendedView{T}, i::Int) where T =
+    T(v.parent[i] - v.fit(i))
+
+"""
+    detrended(x, degree)
+
+Lazy detrended x: the fit takes one pass and the trend is subtracted as
+elements are read, so strided views and memory-mapped samples are detrended
+without a copy.
+"""
+detrended(x::AbstractVector{<:Real}, degree::Int) = DetrendedView(x, trend_fit(x, degree))
+
+"""
+    detrend_linear(x)
+
+Remove linear trend from data using least squares fit. Records of fewer than
+2 points are returned as a copy.
+"""
+detrend_linear(x::AbstractVector{<:Real}) = length(x) < 2 ? copy(x) : detrend(x, 1)
+
+"""
+    detrend_quadratic(x)
+
+Remove quadratic trend from data (for phase data). Records of fewer than 3
+points are returned unchanged.
+"""
+detrend_quadratic(x::AbstractVector{<:Real}) = length(x) < 3 ? x : detrend(x, 2)
@@ -1,7 +1,8 @@
 # Main deviation calculation functions
 
 """
-    adev(phase_data, tau0; mlist=nothing, confidence=0.683)
+    adev(phase_data, tau0; mlist=nothing, confidence=0.683, noise=:skip, return_state=false,
+         threaded=false)
 
 Compute Allan deviation from phase data.
 
@@ -12,12 +13,18 @@ use a specialized function or set appropriate stride parameters.
 # Arguments
 - `phase_data`: Phase data vector (seconds)
 - `tau0`: Sampling interval (seconds)
-- `mlist`: Averaging factors (optional, defaults to octave spacing)
+- `mlist`: Averaging factors (optional, defaults to octave spacing); `:all` for every
+  m = 1..N/4 in O(N log N) via FFT correlations
 - `confidence`: Confidence level for intervals (default: 0.683)
+- `noise`: `:skip` (default, assume White FM), `:auto` (run `noise_id` once), or precomputed α per m
+- `return_state`: Also return a resumable state for [`update`](@ref)
+- `threaded`: Spread τ and, for long records, blocks of each τ over threads
+  (results do not depend on the thread count)
 
 # Returns
 - Single output: `DeviationResult` struct
 - Multiple outputs: `(tau, adev)`, `(tau, adev, edf)`, etc.
+- With `return_state=true`: `(result, state)`
 
 # Example
 ```julia
@@ -38,27 +45,36 @@ Computes overlapping Allan variance using the formula:
 where x is phase data and m is the averaging factor.
 """
 function adev(phase_data::AbstractVector{T}, tau0::Real; 
-              mlist::Union{Nothing,AbstractVector{Int}}=nothing,
-              confidence::Real=0.683) where T<:Real
+              mlist::Union{Nothing,Symbol,AbstractVector{Int}}=nothing,
+              confidence::Real=0.683,
+              noise::Union{Symbol,AbstractVector{<:Real}}=:skip,
+              return_state::Bool=false,
+              threaded::Bool=false) where T<:Real
     
     # Validate inputs
     x = validate_phase_data(phase_data)
     tau0 = validate_tau0(tau0)
     N = length(x)
     
-    # Default m_list if not provided
+    # Default m_list if not provided; mlist=:all selects every m up to N/4
+    dense = dense_mlist(mlist)
     if mlist === nothing
         mlist = default_m_list(N)
+    elseif dense
+        mlist = collect(1:max(N ÷ 4, 1))
     end
+    dense_sums = dense ? dense_adev_sumsq(x, min(length(mlist), (N - 1) ÷ 2)) : nothing
+    tau_sums = threaded && !dense ? threaded_sumsq(adev_sumsq, x, mlist, m -> N - 2*m) : nothing
     
     # Initialize outputs
     tau = mlist .* tau0
     adev_vals = fill(NaN, length(mlist))
     edf_vals = fill(NaN, length(mlist))
     neff = fill(0, length(mlist))
+    sums = zeros(length(mlist))
     
-    # Noise identification (placeholder)
-    alpha = noise_id(x, mlist, "phase")
+    # Noise identification (only when requested via the noise keyword)
+    alpha = resolve_noise(x, mlist, noise)
     
     # Compute Allan deviation for each m
     for (k, m) in enumerate(mlist)
@@ -68,11 +84,12 @@ function adev(phase_data::AbstractVector{T}, tau0::Real;
         end
         neff[k] = L
         
-        # Second differences: x(n+2m) - 2x(n+m) + x(n)
-        d2 = x[1+2*m:N] - 2*x[1+m:N-m] + x[1:L]
+        # Second differences x(n+2m) - 2x(n+m) + x(n), fused into one pass
+        sumsq = dense ? dense_sums[m] : threaded ? tau_sums[k] : adev_sumsq(x, m)
+        sums[k] = sumsq
         
         # Allan variance: σ²_y(τ) = ⟨(Δ²x)²⟩ / (2·m²·τ₀²)
-        avar = mean(d2.^2) / (2 * m^2 * tau0^2)
+        avar = sumsq / L / (2 * m^2 * tau0^2)
         adev_vals[k] = sqrt(avar)
         
         # EDF calculation (placeholder)
@@ -82,14 +99,16 @@ function adev(phase_data::AbstractVector{T}, tau0::Real;
     # Placeholder EDF and CI (computed on demand via compute_ci())
     edf_placeholder = fill(NaN, length(adev_vals))
     ci_placeholder = fill(NaN, length(adev_vals), 2)
-    alpha_placeholder = fill(0, length(adev_vals))  # Default to White FM
     
     # Create result structure
-    result = DeviationResult(
-        tau, adev_vals, edf_placeholder, ci_placeholder, alpha_placeholder, neff,
+    result = DeviationResult{float(T)}(
+        tau, adev_vals, edf_placeholder, ci_placeholder, alpha, neff,
         tau0, N, "adev", confidence
     )
     
+    if return_state
+        return result, resume_state(OnlineADEV(tau0, mlist), x, sums)
+    end
     return result
 end
 
@@ -115,14 +134,21 @@ function adev(phase_data::AbstractVector, tau0::Real, ::Val{5}; kwargs...)
 end
 
 """
-    mdev(phase_data, tau0; mlist=nothing, confidence=0.683)
+    mdev(phase_data, tau0; mlist=nothing, confidence=0.683, noise=:skip, return_state=false,
+         threaded=false)
 
 Compute Modified Allan deviation from phase data.
 Modified Allan deviation removes dead time effects using triple-difference algorithm.
+With `return_state=true` returns `(result, state)` for [`update`](@ref);
+`mlist=:all` evaluates every m = 1..N/4 in O(N log N) via FFT correlations;
+`threaded=true` spreads τ and blocks of each τ over threads.
 """
 function mdev(phase_data::AbstractVector{T}, tau0::Real;
-              mlist::Union{Nothing,AbstractVector{Int}}=nothing,
-              confidence::Real=0.683) where T<:Real
+              mlist::Union{Nothing,Symbol,AbstractVector{Int}}=nothing,
+              confidence::Real=0.683,
+              noise::Union{Symbol,AbstractVector{<:Real}}=:skip,
+              return_state::Bool=false,
+              threaded::Bool=false) where T<:Real
     
     # Validate inputs
     x = validate_phase_data(phase_data)
@@ -130,21 +156,24 @@ function mdev(phase_data::AbstractVector{T}, tau0::Real;
     N = length(x)
     
     # Default m_list: octave-spaced values with ≥3m points available (exact MATLAB logic)
+    dense = dense_mlist(mlist)
     if mlist === nothing
         mlist = [2^k for k in 0:floor(Int, log2(N/3))]
+    elseif dense
+        mlist = collect(1:max(N ÷ 4, 1))
     end
+    dense_sums = dense ? dense_mdev_sumsq(x, min(length(mlist), N ÷ 3)) : nothing
+    tau_sums = threaded && !dense ? threaded_sumsq(mdev_sumsq, x, mlist, m -> N - 3*m + 1) : nothing
     
     # Initialize outputs
     tau = mlist .* tau0
     mdev_vals = fill(NaN, length(mlist))
     edf_vals = fill(NaN, length(mlist))
     neff = fill(0, length(mlist))
+    sums = zeros(length(mlist))
     
-    # Noise identification (placeholder)
-    alpha = noise_id(x, mlist, "phase")
-    
-    # Precompute cumulative sum (exact MATLAB: x_cumsum = cumsum([0; x]))
-    x_cumsum = cumsum([zero(T); x])
+    # Noise identification (only when requested via the noise keyword)
+    alpha = resolve_noise(x, mlist, noise)
     
     # Main loop - exactly matching MATLAB logic
     for k in eachindex(mlist)
@@ -156,17 +185,13 @@ function mdev(phase_data::AbstractVector{T}, tau0::Real;
             break
         end
         
-        # Exact MATLAB indexing translation:
-        # s1 = x_cumsum(1+m : N_eff_k+m)     - x_cumsum(1:N_eff_k);
-        # s2 = x_cumsum(1+2*m : N_eff_k+2*m) - x_cumsum(1+m : N_eff_k+m);  
-        # s3 = x_cumsum(1+3*m : N_eff_k+3*m) - x_cumsum(1+2*m : N_eff_k+2*m);
-        s1 = x_cumsum[1+m:N_eff_k+m] - x_cumsum[1:N_eff_k]
-        s2 = x_cumsum[1+2*m:N_eff_k+2*m] - x_cumsum[1+m:N_eff_k+m]
-        s3 = x_cumsum[1+3*m:N_eff_k+3*m] - x_cumsum[1+2*m:N_eff_k+2*m]
-        d = (s3 - 2*s2 + s1) / m
+        # MATLAB forms s1, s2, s3 from cumsum([0; x]) and d = (s3 - 2*s2 + s1) / m.
+        # The window sum s3 - 2*s2 + s1 is carried forward in a single pass instead.
+        sums[k] = dense ? dense_sums[m] : threaded ? tau_sums[k] : mdev_sumsq(x, m)
+        sumsq = sums[k] / m^2
         
-        # Exact MATLAB calculation
-        mvar = mean(d.^2) / (2 * m^2 * tau0^2)
+        # Exact MATLAB calculation: mvar = mean(d.^2) / (2 * m^2 * tau0^2)
+        mvar = sumsq / N_eff_k / (2 * m^2 * tau0^2)
         mdev_vals[k] = sqrt(mvar)
         
         # EDF calculation (placeholder - would match MATLAB calculate_edf call)
@@ -176,26 +201,31 @@ function mdev(phase_data::AbstractVector{T}, tau0::Real;
     # Placeholder EDF and CI (computed on demand via compute_ci())
     edf_placeholder = fill(NaN, length(mdev_vals))
     ci_placeholder = fill(NaN, length(mdev_vals), 2)
-    alpha_placeholder = fill(0, length(mdev_vals))  # Default to White FM
     
     # Create result structure
-    result = DeviationResult(
-        tau, mdev_vals, edf_placeholder, ci_placeholder, alpha_placeholder, neff,
+    result = DeviationResult{float(T)}(
+        tau, mdev_vals, edf_placeholder, ci_placeholder, alpha, neff,
         tau0, N, "mdev", confidence
     )
     
+    if return_state
+        return result, resume_state(OnlineMDEV(tau0, mlist), x, sums)
+    end
     return result
 end
 
 """
-    mhdev(phase_data, tau0; mlist=nothing, confidence=0.683)
+    mhdev(phase_data, tau0; mlist=nothing, confidence=0.683, noise=:skip, threaded=false)
 
 Compute Modified Hadamard deviation from phase data.
 Modified Hadamard deviation combines Hadamard robustness with better convergence.
+`threaded=true` spreads τ and blocks of each τ over threads.
 """
 function mhdev(phase_data::AbstractVector{T}, tau0::Real;
                mlist::Union{Nothing,AbstractVector{Int}}=nothing,
-               confidence::Real=0.683) where T<:Real
+               confidence::Real=0.683,
+               noise::Union{Symbol,AbstractVector{<:Real}}=:skip,
+               threaded::Bool=false) where T<:Real
     
     # Validate inputs
     x = validate_phase_data(phase_data)
@@ -213,8 +243,9 @@ function mhdev(phase_data::AbstractVector{T}, tau0::Real;
     edf_vals = fill(NaN, length(mlist))
     neff = fill(0, length(mlist))
     
-    # Noise identification (placeholder)
-    alpha = noise_id(x, mlist, "phase")
+    # Noise identification (only when requested via the noise keyword)
+    alpha = resolve_noise(x, mlist, noise)
+    tau_sums = threaded ? threaded_sumsq(mhdev_window_sumsq, x, mlist, m -> N - 5*m + 2) : nothing
     
     # Main loop - exactly matching MATLAB logic
     for k in eachindex(mlist)
@@ -228,16 +259,13 @@ function mhdev(phase_data::AbstractVector{T}, tau0::Real;
         
         # Third difference: x(n) - 3x(n+m) + 3x(n+2m) - x(n+3m)
         # MATLAB: d4 = x(1:N_eff) - 3*x(1+m:N_eff+m) + 3*x(1+2*m:N_eff+2*m) - x(1+3*m:N_eff+3*m);
-        d4 = x[1:N_eff] - 3*x[1+m:N_eff+m] + 3*x[1+2*m:N_eff+2*m] - x[1+3*m:N_eff+3*m]
-        
-        # Prefix sum for efficient moving average of third differences
-        # MATLAB: S = cumsum([0; d4]); avg = S(m+1:end) - S(1:end-m);
-        S = cumsum([zero(T); d4])
-        avg = S[m+1:end] - S[1:end-m]  # mean over m-point windows
+        #         S = cumsum([0; d4]); avg = S(m+1:end) - S(1:end-m);
+        # The m-point moving sums of d4 are slid in place rather than materialized.
+        sumsq, n_avg = threaded ? (tau_sums[k], max(N - 5*m + 2, 0)) : mhdev_sumsq(x, m)
         
         # SP1065 §5.2.10: σ²_H,mod(τ) = ⟨(⟨Δ³x⟩_m)²⟩ / (6·m²)
         # MATLAB: mhvar = mean(avg.^2) / (6 * m^2); mhdev(k) = sqrt(mhvar) / tau(k);
-        mhvar = mean(avg.^2) / (6 * m^2)
+        mhvar = sumsq / n_avg / (6 * m^2)
         mhdev_vals[k] = sqrt(mhvar) / tau[k]
         
         # EDF calculation (placeholder - would match MATLAB calculate_edf call)
@@ -247,11 +275,10 @@ function mhdev(phase_data::AbstractVector{T}, tau0::Real;
     # Placeholder EDF and CI (computed on demand via compute_ci())
     edf_placeholder = fill(NaN, length(mhdev_vals))
     ci_placeholder = fill(NaN, length(mhdev_vals), 2)
-    alpha_placeholder = fill(0, length(mhdev_vals))  # Default to White FM
     
     # Create result structure
-    result = DeviationResult(
-        tau, mhdev_vals, edf_placeholder, ci_placeholder, alpha_placeholder, neff,
+    result = DeviationResult{float(T)}(
+        tau, mhdev_vals, edf_placeholder, ci_placeholder, alpha, neff,
         tau0, N, "mhdev", confidence
     )
     
@@ -259,7 +286,7 @@ function mhdev(phase_data::AbstractVector{T}, tau0::Real;
 end
 
 """
-    tdev(phase_data, tau0; mlist=nothing, confidence=0.683)
+    tdev(phase_data, tau0; mlist=nothing, confidence=0.683, noise=:skip, threaded=false)
 
 Compute Time deviation from phase data.
 Time deviation: TDEV = τ · MDEV / √3
@@ -267,18 +294,23 @@ Time deviation: TDEV = τ · MDEV / √3
 # Arguments
 - `phase_data`: Phase data vector (seconds)
 - `tau0`: Sampling interval (seconds)
-- `mlist`: Averaging factors (optional, defaults to octave spacing)
+- `mlist`: Averaging factors (optional, defaults to octave spacing); `:all` for every m = 1..N/4
 - `confidence`: Confidence level for intervals (default: 0.683)
+- `noise`: `:skip` (default, assume White FM), `:auto` (run `noise_id` once), or precomputed α per m
+- `threaded`: Compute the underlying MDEV with threads (see [`mdev`](@ref))
 
 # Returns
 Time deviation in seconds (note: different units than other deviations)
 """
 function tdev(phase_data::AbstractVector{T}, tau0::Real;
-              mlist::Union{Nothing,AbstractVector{Int}}=nothing,
-              confidence::Real=0.683) where T<:Real
+              mlist::Union{Nothing,Symbol,AbstractVector{Int}}=nothing,
+              confidence::Real=0.683,
+              noise::Union{Symbol,AbstractVector{<:Real}}=:skip,
+              threaded::Bool=false) where T<:Real
     
     # Compute MDEV first using existing implementation
-    mdev_result = mdev(phase_data, tau0, mlist=mlist, confidence=confidence)
+    mdev_result = mdev(phase_data, tau0, mlist=mlist, confidence=confidence, noise=noise,
+                       threaded=threaded)
     
     # Apply TDEV transformation: TDEV = τ · MDEV / √3
     tdev_vals = mdev_result.tau .* mdev_result.deviation ./ sqrt(3)
@@ -287,7 +319,7 @@ function tdev(phase_data::AbstractVector{T}, tau0::Real;
     ci_scaled = mdev_result.ci .* (mdev_result.tau ./ sqrt(3))
     
     # Create result structure
-    result = DeviationResult(
+    result = DeviationResult{float(T)}(
         mdev_result.tau, tdev_vals, mdev_result.edf, ci_scaled, mdev_result.alpha, mdev_result.neff,
         mdev_result.tau0, mdev_result.N, "tdev", mdev_result.confidence
     )
@@ -296,7 +328,7 @@ function tdev(phase_data::AbstractVector{T}, tau0::Real;
 end
 
 """
-    ldev(phase_data, tau0; mlist=nothing, confidence=0.683)
+    ldev(phase_data, tau0; mlist=nothing, confidence=0.683, noise=:skip, threaded=false)
 
 Compute Lapinski deviation from phase data.
 Lapinski deviation: LDEV = τ · MHDEV / √(10/3)
@@ -306,16 +338,21 @@ Lapinski deviation: LDEV = τ · MHDEV / √(10/3)
 - `tau0`: Sampling interval (seconds)
 - `mlist`: Averaging factors (optional, defaults to octave spacing with ≥4m points)
 - `confidence`: Confidence level for intervals (default: 0.683)
+- `noise`: `:skip` (default, assume White FM), `:auto` (run `noise_id` once), or precomputed α per m
+- `threaded`: Compute the underlying MHDEV with threads (see [`mhdev`](@ref))
 
 # Returns
 Lapinski deviation in seconds (note: different units than other deviations)
 """
 function ldev(phase_data::AbstractVector{T}, tau0::Real;
               mlist::Union{Nothing,AbstractVector{Int}}=nothing,
-              confidence::Real=0.683) where T<:Real
+              confidence::Real=0.683,
+              noise::Union{Symbol,AbstractVector{<:Real}}=:skip,
+              threaded::Bool=false) where T<:Real
     
     # Compute MHDEV first using existing implementation
-    mhdev_result = mhdev(phase_data, tau0, mlist=mlist, confidence=confidence)
+    mhdev_result = mhdev(phase_data, tau0, mlist=mlist, confidence=confidence, noise=noise,
+                         threaded=threaded)
     
     # Apply LDEV scaling: σ_L(τ) = τ / √(10/3) · σ_MH(τ)
     scale = mhdev_result.tau ./ sqrt(10/3)
@@ -325,7 +362,7 @@ function ldev(phase_data::AbstractVector{T}, tau0::Real;
     ci_scaled = mhdev_result.ci .* scale
     
     # Create result structure  
-    result = DeviationResult(
+    result = DeviationResult{float(T)}(
         mhdev_result.tau, ldev_vals, mhdev_result.edf, ci_scaled, mhdev_result.alpha, mhdev_result.neff,
         mhdev_result.tau0, mhdev_result.N, "ldev", mhdev_result.confidence
     )
@@ -334,7 +371,7 @@ function ldev(phase_data::AbstractVector{T}, tau0::Real;
 end
 
 """
-    totdev(phase_data, tau0; mlist=nothing, confidence=0.683)
+    totdev(phase_data, tau0; mlist=nothing, confidence=0.683, noise=:skip, threaded=false)
 
 Compute Total deviation from phase data.
 Total deviation uses all overlapping samples with detrending and symmetric reflection.
@@ -344,13 +381,17 @@ Total deviation uses all overlapping samples with detrending and symmetric refle
 - `tau0`: Sampling interval (seconds)
 - `mlist`: Averaging factors (optional, defaults to octave spacing with ≥2m points)
 - `confidence`: Confidence level for intervals (default: 0.683)
+- `noise`: `:skip` (default, assume White FM), `:auto` (run `noise_id` once), or precomputed α per m
+- `threaded`: Spread τ and, for long records, blocks of each τ over threads
 
 # Returns
 Total deviation (dimensionless frequency stability measure)
 """
 function totdev(phase_data::AbstractVector{T}, tau0::Real;
                 mlist::Union{Nothing,AbstractVector{Int}}=nothing,
-                confidence::Real=0.683) where T<:Real
+                confidence::Real=0.683,
+                noise::Union{Symbol,AbstractVector{<:Real}}=:skip,
+                threaded::Bool=false) where T<:Real
     
     # Validate inputs
     x = validate_phase_data(phase_data)
@@ -362,17 +403,6 @@ function totdev(phase_data::AbstractVector{T}, tau0::Real;
         mlist = [2^k for k in 0:floor(Int, log2(N/2))]
     end
     
-    # Remove linear frequency drift (detrending)
-    x_drift_removed = detrend_linear(x)
-    
-    # Symmetric reflection about endpoints
-    # MATLAB: x_left = 2*x_drift_removed(1) - x_drift_removed(2:N-1);
-    #         x_right = 2*x_drift_removed(end) - x_drift_removed(end-1:-1:2);
-    x_left = 2*x_drift_removed[1] .- x_drift_removed[2:N-1]
-    x_right = 2*x_drift_removed[end] .- x_drift_removed[end-1:-1:2]
-    x_star = [x_left; x_drift_removed; x_right]
-    offset = length(x_left)
-    
     # Initialize outputs
     tau = mlist .* tau0
     totdev_vals = fill(NaN, length(mlist))
@@ -380,42 +410,37 @@ function totdev(phase_data::AbstractVector{T}, tau0::Real;
     edf_vals = fill(NaN, length(mlist))
     neff = fill(0, length(mlist))
     
-    # Noise identification (placeholder)
-    alpha = noise_id(x, mlist, "phase")
+    # Noise identification (only when requested via the noise keyword)
+    alpha = resolve_noise(x, mlist, noise)
     
     # Compute raw total deviation for each m
+    # MATLAB detrends x, builds x_star = [x_left; x; x_right] with the odd
+    # reflections x_right = 2*x(end) - x(end-1:-1:2), and takes second
+    # differences at i = 1:(3N-2m-4) whose centre i+m lies in 1..N. Only the
+    # right reflection is ever reached, and it maps a line onto itself, so the
+    # detrend leaves d2 unchanged; d2 is read straight from x.
+    tau_sums = threaded ? threaded_sumsq(adev_sumsq, x, mlist, m -> N - 2*m) : nothing
     valid_indices = Int[]
     for (k, m) in enumerate(mlist)
-        # MATLAB: i_all = 1:(3*N - 2*m - 4);
-        #         center = i_all + m;
-        #         valid = (center >= 1) & (center <= N);
-        i_all = 1:(3*N - 2*m - 4)
-        center = i_all .+ m
-        valid_mask = (center .>= 1) .& (center .<= N)
-        
-        if !any(valid_mask)
+        n_d2 = min(3*N - 2*m - 4, N - m)
+        if n_d2 < 1
             continue
         end
         
         push!(valid_indices, k)
-        i = i_all[valid_mask]
-        
-        # Second differences on extended data
-        # MATLAB: d2 = x_star(offset + i + 2*m) - 2*x_star(offset + i + m) + x_star(offset + i);
-        d2 = x_star[offset .+ i .+ 2*m] - 2*x_star[offset .+ i .+ m] + x_star[offset .+ i]
         
         # Total variance calculation
-        D = sum(d2.^2)
+        D = threaded ? tau_sums[k] + totdev_tail_sumsq(x, m) : totdev_sumsq(x, m)
         den = 2 * (N - 2) * (m * tau0)^2
         rawvar[k] = D / den
         
-        neff[k] = length(d2)
+        neff[k] = n_d2
     end
     
     # Trim to valid results only
     if isempty(valid_indices)
         # Return empty results if no valid calculations
-        result = DeviationResult(
+        result = DeviationResult{float(T)}(
             T[], T[], T[], Matrix{T}(undef, 0, 2), T[], Int[],
             tau0, N, "totdev", confidence
         )
@@ -443,11 +468,10 @@ function totdev(phase_data::AbstractVector{T}, tau0::Real;
     # Placeholder EDF and CI (computed on demand via compute_ci())
     edf_placeholder = fill(NaN, length(totdev_vals))
     ci_placeholder = fill(NaN, length(totdev_vals), 2)
-    alpha_placeholder = fill(0, length(totdev_vals))  # Default to White FM
     
     # Create result structure
-    result = DeviationResult(
-        tau, totdev_vals, edf_placeholder, ci_placeholder, alpha_placeholder, neff,
+    result = DeviationResult{float(T)}(
+        tau, totdev_vals, edf_placeholder, ci_placeholder, alpha, neff,
         tau0, N, "totdev", confidence
     )
     
@@ -455,7 +479,8 @@ function totdev(phase_data::AbstractVector{T}, tau0::Real;
 end
 
 """
-    hdev(phase_data, tau0; mlist=nothing, confidence=0.683)
+    hdev(phase_data, tau0; mlist=nothing, confidence=0.683, noise=:skip, return_state=false,
+         threaded=false)
 
 Compute Hadamard deviation from phase data.
 
@@ -468,9 +493,13 @@ for robust frequency drift rejection.
 - `tau0`: Sampling interval (seconds)
 - `mlist`: Averaging factors (optional, defaults to octave spacing with ≥4m points)
 - `confidence`: Confidence level for intervals (default: 0.683)
+- `noise`: `:skip` (default, assume White FM), `:auto` (run `noise_id` once), or precomputed α per m
+- `return_state`: Also return a resumable state for [`update`](@ref)
+- `threaded`: Spread τ and, for long records, blocks of each τ over threads
 
 # Returns
-Hadamard deviation (dimensionless frequency stability measure)
+Hadamard deviation (dimensionless frequency stability measure); `(result, state)`
+with `return_state=true`
 
 # Algorithm
 Computes overlapping Hadamard variance using third differences:
@@ -482,8 +511,11 @@ where x is phase data and m is the averaging factor.
 NIST SP1065 Sections 5.2.8–5.2.9
 """
 function hdev(phase_data::AbstractVector{T}, tau0::Real;
-              mlist::Union{Nothing,AbstractVector{Int}}=nothing,
-              confidence::Real=0.683) where T<:Real
+              mlist::Union{Nothing,Symbol,AbstractVector{Int}}=nothing,
+              confidence::Real=0.683,
+              noise::Union{Symbol,AbstractVector{<:Real}}=:skip,
+              return_state::Bool=false,
+              threaded::Bool=false) where T<:Real
     
     # Validate inputs
     x = validate_phase_data(phase_data)
@@ -491,18 +523,24 @@ function hdev(phase_data::AbstractVector{T}, tau0::Real;
     N = length(x)
     
     # Default m_list: octave-spaced values with ≥4m points available (exact MATLAB logic)
+    dense = dense_mlist(mlist)
     if mlist === nothing
         mlist = [2^k for k in 0:floor(Int, log2(N/4))]
+    elseif dense
+        mlist = collect(1:max(N ÷ 4, 1))
     end
+    dense_sums = dense ? dense_hdev_sumsq(x, min(length(mlist), (N - 1) ÷ 3)) : nothing
+    tau_sums = threaded && !dense ? threaded_sumsq(hdev_sumsq, x, mlist, m -> N - 3*m) : nothing
     
     # Initialize outputs
     tau = mlist .* tau0
     hdev_vals = fill(NaN, length(mlist))
     edf_vals = fill(NaN, length(mlist))
     neff = fill(0, length(mlist))
+    sums = zeros(length(mlist))
     
-    # Noise identification (placeholder)
-    alpha = noise_id(x, mlist, "phase")
+    # Noise identification (only when requested via the noise keyword)
+    alpha = resolve_noise(x, mlist, noise)
     
     # Compute overlapping HDEV using third differences
     for (k, m) in enumerate(mlist)
@@ -514,10 +552,11 @@ function hdev(phase_data::AbstractVector{T}, tau0::Real;
         
         # Third difference: x(n+3m) - 3x(n+2m) + 3x(n+m) - x(n)
         # MATLAB: d3 = x(1+3*m:N) - 3*x(1+2*m:N-m) + 3*x(1+m:N-2*m) - x(1:L);
-        d3 = x[1+3*m:N] - 3*x[1+2*m:N-m] + 3*x[1+m:N-2*m] - x[1:L]
+        sumsq = dense ? dense_sums[m] : threaded ? tau_sums[k] : hdev_sumsq(x, m)
+        sums[k] = sumsq
         
         # SP1065: σ²_H(τ) = ⟨(Δ³x)²⟩ / (6·τ²)
-        hvar = mean(d3.^2) / (6 * tau[k]^2)
+        hvar = sumsq / L / (6 * tau[k]^2)
         hdev_vals[k] = sqrt(hvar)
         
         # EDF calculation (placeholder)
@@ -527,14 +566,16 @@ function hdev(phase_data::AbstractVector{T}, tau0::Real;
     # Placeholder EDF and CI (computed on demand via compute_ci())
     edf_placeholder = fill(NaN, length(hdev_vals))
     ci_placeholder = fill(NaN, length(hdev_vals), 2)
-    alpha_placeholder = fill(0, length(hdev_vals))  # Default to White FM
     
     # Create result structure
-    result = DeviationResult(
-        tau, hdev_vals, edf_placeholder, ci_placeholder, alpha_placeholder, neff,
+    result = DeviationResult{float(T)}(
+        tau, hdev_vals, edf_placeholder, ci_placeholder, alpha, neff,
         tau0, N, "hdev", confidence
     )
     
+    if return_state
+        return result, resume_state(OnlineHDEV(tau0, mlist), x, sums)
+    end
     return result
 end
 
@@ -560,7 +601,7 @@ function hdev(phase_data::AbstractVector, tau0::Real, ::Val{5}; kwargs...)
 end
 
 """
-    mtotdev(phase_data, tau0; mlist=nothing, confidence=0.683)
+    mtotdev(phase_data, tau0; mlist=nothing, confidence=0.683, noise=:skip, threaded=false)
 
 Compute Modified total deviation from phase data.
 Modified total deviation uses half-average detrending method and uninverted even reflection.
@@ -570,6 +611,8 @@ Modified total deviation uses half-average detrending method and uninverted even
 - `tau0`: Sampling interval (seconds)
 - `mlist`: Averaging factors (optional, defaults to octave spacing with ≥3m points)
 - `confidence`: Confidence level for intervals (default: 0.683)
+- `noise`: `:skip` (default, assume White FM), `:auto` (run `noise_id` once), or precomputed α per m
+- `threaded`: Spread τ over threads, largest m first, one workspace per thread
 
 # Returns
 Modified total deviation (dimensionless frequency stability measure)
@@ -579,7 +622,9 @@ NIST SP1065 Section 5.2.12
 """
 function mtotdev(phase_data::AbstractVector{T}, tau0::Real;
                  mlist::Union{Nothing,AbstractVector{Int}}=nothing,
-                 confidence::Real=0.683) where T<:Real
+                 confidence::Real=0.683,
+                 noise::Union{Symbol,AbstractVector{<:Real}}=:skip,
+                 threaded::Bool=false) where T<:Real
     
     # Validate inputs
     x = validate_phase_data(phase_data)
@@ -598,8 +643,15 @@ function mtotdev(phase_data::AbstractVector{T}, tau0::Real;
     edf_vals = fill(NaN, length(mlist))
     neff = fill(0, length(mlist))
     
-    # Noise identification (placeholder)
-    alpha = noise_id(x, mlist, "phase")
+    # Noise identification (only when requested via the noise keyword)
+    alpha = resolve_noise(x, mlist, noise)
+    
+    # Half-average detrend, uninverted even reflection and second differences
+    # of m-point averages for every 3m-point subsequence; one workspace per
+    # worker, reused for all its τ
+    S = accumulation_type(T)
+    raw = tau_map((m, ws) -> mtotdev_sumsq!(ws, x, m), S, mlist, ReflectedWorkspace{S};
+                  threaded=threaded)
     
     # Compute MTOTVAR for each m
     valid_indices = Int[]
@@ -612,42 +664,7 @@ function mtotdev(phase_data::AbstractVector{T}, tau0::Real;
         end
         
         push!(valid_indices, k)
-        outer_sum = zero(T)
-        
-        for n in 1:nsubs
-            # Extract 3m phase points
-            seq = x[n:n+3*m-1]
-            half_n = 3*m / 2
-            
-            # Detrend using half-average method
-            if m == 1
-                first_half = seq[1]
-                last_half = seq[3]
-                slope = (last_half - first_half) / (2 * tau0)
-            else
-                first_half = mean(seq[1:floor(Int, half_n)])
-                last_half = mean(seq[floor(Int, half_n)+1:end])
-                slope = (last_half - first_half) / (half_n * tau0)
-            end
-            
-            # Remove linear trend
-            seq_detrended = seq - slope * tau0 * T.(0:3*m-1)
-            
-            # Extend by uninverted even reflection
-            ext = [seq_detrended[end:-1:1]; seq_detrended; seq_detrended[end:-1:1]]
-            
-            # Calculate second differences using cumsum
-            cs = cumsum([zero(T); ext])
-            avg1 = (cs[1+m:6*m+m] - cs[1:6*m]) ./ m
-            avg2 = (cs[1+2*m:6*m+2*m] - cs[1+m:6*m+m]) ./ m
-            avg3 = (cs[1+3*m:6*m+3*m] - cs[1+2*m:6*m+2*m]) ./ m
-            
-            # Second differences
-            d2 = avg3 - 2*avg2 + avg1
-            
-            # Accumulate variance
-            outer_sum += sum(d2.^2) / (6 * m)
-        end
+        outer_sum = raw[k] / m^2 / (6*m)
         
         # Normalize for Modified Total variance
         Mvar[k] = outer_sum / (2 * (m * tau0)^2 * nsubs)
@@ -656,7 +673,7 @@ function mtotdev(phase_data::AbstractVector{T}, tau0::Real;
     # Trim to valid results only
     if isempty(valid_indices)
         # Return empty results if no valid calculations
-        result = DeviationResult(
+        result = DeviationResult{float(T)}(
             T[], T[], T[], Matrix{T}(undef, 0, 2), T[], Int[],
             tau0, N, "mtotdev", confidence
         )
@@ -682,11 +699,10 @@ function mtotdev(phase_data::AbstractVector{T}, tau0::Real;
     # Placeholder EDF and CI (computed on demand via compute_ci())
     edf_placeholder = fill(NaN, length(mtotdev_vals))
     ci_placeholder = fill(NaN, length(mtotdev_vals), 2)
-    alpha_placeholder = fill(0, length(mtotdev_vals))  # Default to White FM
     
     # Create result structure
-    result = DeviationResult(
-        tau, mtotdev_vals, edf_placeholder, ci_placeholder, alpha_placeholder, neff,
+    result = DeviationResult{float(T)}(
+        tau, mtotdev_vals, edf_placeholder, ci_placeholder, alpha, neff,
         tau0, N, "mtotdev", confidence
     )
     
@@ -715,7 +731,7 @@ function mtotdev(phase_data::AbstractVector, tau0::Real, ::Val{5}; kwargs...)
 end
 
 """
-    htotdev(phase_data, tau0; mlist=nothing, confidence=0.683)
+    htotdev(phase_data, tau0; mlist=nothing, confidence=0.683, noise=:skip, threaded=false)
 
 Compute Hadamard total deviation from phase data.
 Hadamard total deviation uses SP1065 detrending method and matches allantools/Stable32 results.
@@ -725,6 +741,8 @@ Hadamard total deviation uses SP1065 detrending method and matches allantools/St
 - `tau0`: Sampling interval (seconds)
 - `mlist`: Averaging factors (optional, defaults to octave spacing with ≥3m points)
 - `confidence`: Confidence level for intervals (default: 0.683)
+- `noise`: `:skip` (default, assume White FM), `:auto` (run `noise_id` once), or precomputed α per m
+- `threaded`: Spread τ over threads, largest m first, one workspace per thread
 
 # Returns
 Hadamard total deviation (dimensionless frequency stability measure)
@@ -734,7 +752,9 @@ NIST SP1065 Section 5.2.14
 """
 function htotdev(phase_data::AbstractVector{T}, tau0::Real;
                  mlist::Union{Nothing,AbstractVector{Int}}=nothing,
-                 confidence::Real=0.683) where T<:Real
+                 confidence::Real=0.683,
+                 noise::Union{Symbol,AbstractVector{<:Real}}=:skip,
+                 threaded::Bool=false) where T<:Real
     
     # Validate inputs
     x = validate_phase_data(phase_data)
@@ -756,19 +776,24 @@ function htotdev(phase_data::AbstractVector{T}, tau0::Real;
     edf_vals = fill(NaN, length(mlist))
     neff = fill(0, length(mlist))
     
-    # Noise identification (placeholder)
-    alpha = noise_id(x, mlist, "phase")
+    # Noise identification (only when requested via the noise keyword)
+    alpha = resolve_noise(x, mlist, noise)
+    
+    # Half-average detrend (middle point skipped when 3m is odd), uninverted
+    # even reflection and Hadamard differences of m-point frequency means;
+    # one workspace per worker, reused for all its τ
+    S = accumulation_type(T)
+    raw = tau_map((m, ws) -> htotdev_sumsq!(ws, y, m), S, mlist, ReflectedWorkspace{S};
+                  threaded=threaded)
     
     # Compute HTOTVAR for each m
     valid_indices = Int[]
     for (idx, m) in enumerate(mlist)
         # Special case: m=1 uses overlapping HDEV
         if m == 1
-            hdev_result = hdev(x, tau0, mlist=[1])
-            if !isempty(hdev_result.deviation)
-                htotdev_vals[idx] = hdev_result.deviation[1]
-                push!(valid_indices, idx)
-            end
+            L = N - 3
+            htotdev_vals[idx] = L > 0 ? sqrt(hdev_sumsq(x, 1) / L / (6 * tau0^2)) : NaN
+            push!(valid_indices, idx)
             continue
         end
         
@@ -780,60 +805,7 @@ function htotdev(phase_data::AbstractVector{T}, tau0::Real;
         
         push!(valid_indices, idx)
         neff[idx] = n_iterations
-        
-        # Accumulator for variance
-        dev_sum = zero(T)
-        
-        # Loop over subsequences
-        for i in 0:(n_iterations-1)
-            # Extract 3m points
-            xs = y[i+1:i+3*m]
-            
-            # Remove linear trend using half-average method
-            half1_idx = floor(Int, 3*m/2)
-            half2_idx = ceil(Int, 3*m/2)
-            
-            # Calculate means of first and second halves
-            mean1 = mean(xs[1:half1_idx])
-            mean2 = mean(xs[half2_idx+1:end])  # Fixed: added +1
-            
-            # Calculate slope based on odd/even
-            if mod(3*m, 2) == 1  # 3m is odd
-                slope = (mean2 - mean1) / (0.5*(3*m-1) + 1)
-            else  # 3m is even
-                slope = (mean2 - mean1) / (0.5*3*m)
-            end
-            
-            # Detrend the sequence
-            x0 = zeros(T, length(xs))
-            for j in 0:(length(xs)-1)
-                x0[j+1] = xs[j+1] - slope * (j - floor(3*m/2))
-            end
-            
-            # Extend by uninverted even reflection
-            xstar = [x0[end:-1:1]; x0; x0[end:-1:1]]
-            
-            # Calculate Hadamard differences using cumsum for efficiency
-            cs = cumsum([zero(T); xstar])
-            j_indices = 0:(6*m-1)
-            
-            # Calculate three m-point window sums
-            sum1 = cs[j_indices.+m.+1] - cs[j_indices.+1]
-            sum2 = cs[j_indices.+2*m.+1] - cs[j_indices.+m.+1]
-            sum3 = cs[j_indices.+3*m.+1] - cs[j_indices.+2*m.+1]
-            
-            # Convert to means
-            xmean1 = sum1 ./ m
-            xmean2 = sum2 ./ m
-            xmean3 = sum3 ./ m
-            
-            # Hadamard differences
-            H = xmean3 - 2*xmean2 + xmean1
-            
-            # Sum of squares normalized by 6m
-            squaresum = sum(H.^2) / (6*m)
-            dev_sum += squaresum
-        end
+        dev_sum = raw[idx] / m^2 / (6*m)
         
         # Final normalization per equation (29): divide by 6*(N-3m+1)
         htotvar = dev_sum / (6 * n_iterations)
@@ -843,7 +815,7 @@ function htotdev(phase_data::AbstractVector{T}, tau0::Real;
     # Trim to valid results only
     if isempty(valid_indices)
         # Return empty results if no valid calculations
-        result = DeviationResult(
+        result = DeviationResult{float(T)}(
             T[], T[], T[], Matrix{T}(undef, 0, 2), T[], Int[],
             tau0, N, "htotdev", confidence
         )
@@ -875,11 +847,10 @@ function htotdev(phase_data::AbstractVector{T}, tau0::Real;
     # Placeholder EDF and CI (computed on demand via compute_ci())
     edf_placeholder = fill(NaN, length(htotdev_vals))
     ci_placeholder = fill(NaN, length(htotdev_vals), 2)
-    alpha_placeholder = fill(0, length(htotdev_vals))  # Default to White FM
     
     # Create result structure
-    result = DeviationResult(
-        tau, htotdev_vals, edf_placeholder, ci_placeholder, alpha_placeholder, neff,
+    result = DeviationResult{float(T)}(
+        tau, htotdev_vals, edf_placeholder, ci_placeholder, alpha, neff,
         tau0, N, "htotdev", confidence
     )
     
@@ -908,7 +879,7 @@ function htotdev(phase_data::AbstractVector, tau0::Real, ::Val{5}; kwargs...)
 end
 
 """
-    mhtotdev(phase_data, tau0; mlist=nothing, confidence=0.683)
+    mhtotdev(phase_data, tau0; mlist=nothing, confidence=0.683, noise=:skip, threaded=false)
 
 Compute Modified Hadamard total deviation from phase data.
 Modified Hadamard total deviation uses linear detrending and symmetric reflection.
@@ -918,6 +889,8 @@ Modified Hadamard total deviation uses linear detrending and symmetric reflectio
 - `tau0`: Sampling interval (seconds)
 - `mlist`: Averaging factors (optional, defaults to octave spacing with ≥4m points)
 - `confidence`: Confidence level for intervals (default: 0.683)
+- `noise`: `:skip` (default, assume White FM), `:auto` (run `noise_id` once), or precomputed α per m
+- `threaded`: Spread τ over threads, largest m first, one workspace per thread
 
 # Returns
 Modified Hadamard total deviation (dimensionless frequency stability measure)
@@ -927,7 +900,9 @@ NIST SP1065 Sections 5.2.12 & 5.2.14
 """
 function mhtotdev(phase_data::AbstractVector{T}, tau0::Real;
                   mlist::Union{Nothing,AbstractVector{Int}}=nothing,
-                  confidence::Real=0.683) where T<:Real
+                  confidence::Real=0.683,
+                  noise::Union{Symbol,AbstractVector{<:Real}}=:skip,
+                  threaded::Bool=false) where T<:Real
     
     # Validate inputs
     x = validate_phase_data(phase_data)
@@ -946,8 +921,16 @@ function mhtotdev(phase_data::AbstractVector{T}, tau0::Real;
     edf_vals = fill(NaN, length(mlist))  # No published EDF model
     neff = N .- 4*mlist .+ 1
     
-    # Noise identification (placeholder)
-    alpha = noise_id(x, mlist, "phase")
+    # Noise identification (only when requested via the noise keyword)
+    alpha = resolve_noise(x, mlist, noise)
+    
+    # Least-squares detrend of each (3m+1)-point phase segment, symmetric
+    # reflection, third differences and m-point moving sums. The moving sum of
+    # third differences is the fourth difference of the running sum S at
+    # step m, taken at 5m+4 positions. One workspace per worker.
+    S = accumulation_type(T)
+    raw = tau_map((m, ws) -> mhtotdev_sumsq!(ws, x, m), S, mlist, ReflectedWorkspace{S};
+                  threaded=threaded)
     
     # Compute MHTOTDEV for each m
     valid_indices = Int[]
@@ -958,35 +941,9 @@ function mhtotdev(phase_data::AbstractVector{T}, tau0::Real;
         end
         
         push!(valid_indices, k)
-        total_sum = zero(T)
-        
-        for n in 1:nsubs
-            # Extract phase segment (3m+1 points for 3m frequency samples)
-            phase_seg = x[n:n+3*m]
-            
-            # Linear detrending of phase data using our detrend_linear function
-            phase_detrended = detrend_linear(phase_seg)
-            
-            # Symmetric reflection of phase data
-            ext = [phase_detrended[end:-1:1]; phase_detrended; phase_detrended[end:-1:1]]
-            
-            # Third difference on phase data
-            L = length(ext) - 3*m
-            d3 = ext[1:L] - 3*ext[1+m:L+m] + 3*ext[1+2*m:L+2*m] - ext[1+3*m:L+3*m]
-            
-            # Moving average
-            S = cumsum([zero(T); d3])
-            if length(S) > m
-                avg = S[m+1:end] - S[1:end-m]
-                block_var = mean(avg.^2) / (6 * m^2)
-            else
-                block_var = zero(T)
-            end
-            total_sum += block_var
-        end
         
         # Store average variance
-        MHvar[k] = total_sum / nsubs
+        MHvar[k] = raw[k] / (5*m + 4) / (6 * m^2) / nsubs
         
         # Convert to deviation and normalize by tau
         mhtotdev_vals[k] = sqrt(MHvar[k]) / tau[k]
@@ -995,7 +952,7 @@ function mhtotdev(phase_data::AbstractVector{T}, tau0::Real;
     # Trim to valid results only
     if isempty(valid_indices)
         # Return empty results if no valid calculations
-        result = DeviationResult(
+        result = DeviationResult{float(T)}(
             T[], T[], T[], Matrix{T}(undef, 0, 2), T[], Int[],
             tau0, N, "mhtotdev", confidence
         )
@@ -1013,11 +970,10 @@ function mhtotdev(phase_data::AbstractVector{T}, tau0::Real;
     # Placeholder EDF and CI (computed on demand via compute_ci())
     edf_placeholder = fill(NaN, length(mhtotdev_vals))
     ci_placeholder = fill(NaN, length(mhtotdev_vals), 2)
-    alpha_placeholder = fill(0, length(mhtotdev_vals))  # Default to White FM
     
     # Create result structure
-    result = DeviationResult(
-        tau, mhtotdev_vals, edf_placeholder, ci_placeholder, alpha_placeholder, neff,
+    result = DeviationResult{float(T)}(
+        tau, mhtotdev_vals, edf_placeholder, ci_placeholder, alpha, neff,
         tau0, N, "mhtotdev", confidence
     )
     
@@ -0,0 +1,117 @@
+# Memoized EDF and chi-squared quantiles for compute_ci
+#
+# The SP1065 EDF needs up to (d+1)·m evaluations of the sz series and every
+# interval two chi-squared inversions, while the inputs repeat across clocks,
+# methods and calls on records of one length. Both are kept in bounded
+# least-recently-used caches guarded by a lock, so concurrent compute_ci
+# calls share them safely.
+
+# Entries per cache before the least recently used are evicted
+const CI_CACHE_SIZE = 4096
+
+"""
+    LRUCache{K,V}(capacity)
+
+Thread-safe memo table that keeps at most `capacity` entries. Every hit or
+insert stamps the entry; when full, the least recently used quarter is
+dropped at once, so eviction costs O(1) amortized per insert.
+"""
+mutable struct LRUCache{K,V}
+    capacity::Int
+    entries::Dict{K,Tuple{V,Int}}
+    tick::Int
+    lock::ReentrantLock
+end
+
+LRUCache{K,V}(capacity::Int) where {K,V} =
+    LRUCache{K,V}(capacity, Dict{K,Tuple{V,Int}}(), 0, ReentrantLock())
+
+Base.length(cache::LRUCache) = length(cache.entries)
+
+Base.haskey(cache::LRUCache, key) = lock(() -> haskey(cache.entries, key), cache.lock)
+
+function Base.empty!(cache::LRUCache)
+    lock(cache.lock) do
+        empty!(cache.entries)
+        cache.tick = 0
+    end
+    return cache
+end
+
+"""
+    cached!(f, cache, key)
+
+Value stored under `key`, or `f()` stored and returned on a miss. `f` runs
+outside the lock; two tasks missing the same key both compute it and store
+the same value.
+"""
+function cached!(f, cache::LRUCache{K,V}, key::K) where {K,V}
+    hit = lock(cache.lock) do
+        entry = get(cache.entries, key, nothing)
+        entry === nothing && return nothing
+        cache.tick += 1
+        cache.entries[key] = (entry[1], cache.tick)
+        return Some(entry[1])
+    end
+    hit === nothing || return something(hit)
+
+    value = convert(V, f())
+    lock(cache.lock) do
+        cache.tick += 1
+        cache.entries[key] = (value, cache.tick)
+        if length(cache.entries) > cache.capacity
+            stamps = sort!([stamp for (_, stamp) in values(cache.entries)])
+            cutoff = stamps[max(length(stamps) ÷ 4, 1)]
+            filter!(entry -> last(entry)[2] > cutoff, cache.entries)
+        end
+    end
+    return value
+end
+
+# calculate_edf(alpha, d, m, F, S, N) results
+const EDF_CACHE = LRUCache{NTuple{6,Int},Float64}(CI_CACHE_SIZE)
+
+# (edf, confidence) => (lower, upper) chi-squared quantiles
+const CHI2_CACHE = LRUCache{NTuple{2,Float64},NTuple{2,Float64}}(CI_CACHE_SIZE)
+
+"""
+    chi2_bounds(edf, confidence)
+
+Chi-squared quantiles at (1 - confidence)/2 and 1 - (1 - confidence)/2 for
+`edf` degrees of freedom, memoized.
+"""
+function chi2_bounds(edf::Real, confidence::Real)
+    return cached!(CHI2_CACHE, (Float64(edf), Float64(confidence))) do
+        alpha_chi = 1 - confidence
+        (quantile(Chisq(edf), alpha_chi/2), quantile(Chisq(edf), 1 - alpha_chi/2))
+    end
+end
+
+"""
+    precompute_ci_tables(N; tau0=1.0, methods=SUITE_METHODS, alphas=-2:2, confidence=0.683)
+
+Fill the EDF and chi-squared caches for records of `N` points on each
+method's default octave τ grid and every α in `alphas`, so that later
+`compute_ci` calls on such results only read the tables. Returns the number
+of (method, α, τ) points tabulated.
+
+# Example
+```julia
+precompute_ci_tables(86400)            # once at start-up
+compute_ci(adev(x, 1.0, noise=:auto))  # table lookups only
+```
+"""
+function precompute_ci_tables(N::Int; tau0::Real=1.0,
+                              methods::AbstractVector{<:AbstractString}=SUITE_METHODS,
+                              alphas::AbstractVector{Int}=collect(-2:2),
+                              confidence::Real=0.683)
+    count = 0
+    for method in methods, alpha in alphas, m in suite_default_mlist(method, N)
+        edf = calculate_edf_for_method(String(method), alpha, m * tau0, tau0, N)
+        if !isnan(edf) && edf > 0
+            chi2_bounds(edf, confidence)
+        end
+        count += 1
+    end
+    return count
+end
@@ -0,0 +1,718 @@
+# Allocation-free inner loops shared by the deviation functions
+#
+# Each kernel returns the raw sum of squared differences for a single
+# averaging factor m. Normalization is left to the caller so that the same
+# kernel can serve batch, streaming and incremental code paths.
+#
+# Precision policy: samples are read in their storage type but every
+# difference and sum is formed in `accumulation_type(T)`, i.e. Float64 for
+# Float32 (or Float16) input. Float32 samples convert exactly, so the
+# differences of a record with a large phase offset are exact and Float32
+# storage halves memory traffic without changing the result.
+
+"""
+    accumulation_type(T)
+
+Arithmetic type used by the kernels for samples stored as `T`: at least
+Float64, or `float(T)` when that is wider (e.g. BigFloat).
+"""
+accumulation_type(::Type{T}) where T<:Real = promote_type(float(T), Float64)
+
+"""
+    adev_sumsq(x, m[, positions])
+
+Sum of squared second differences Σ(x[i+2m] - 2x[i+m] + x[i])² for i = 1..N-2m,
+or for the i in `positions` only.
+"""
+adev_sumsq(x::AbstractVector{<:Real}, m::Int) = adev_sumsq(x, m, 1:length(x)-2*m)
+
+function adev_sumsq(x::AbstractVector{T}, m::Int, positions::UnitRange{Int}) where T<:Real
+    S = accumulation_type(T)
+    s = zero(S)
+    @inbounds @simd for i in positions
+        d2 = S(x[i+2*m]) - 2*S(x[i+m]) + S(x[i])
+        s += d2 * d2
+    end
+    return s
+end
+
+"""
+    hdev_sumsq(x, m[, positions])
+
+Sum of squared third differences Σ(x[i+3m] - 3x[i+2m] + 3x[i+m] - x[i])² for
+i = 1..N-3m, or for the i in `positions` only.
+"""
+hdev_sumsq(x::AbstractVector{<:Real}, m::Int) = hdev_sumsq(x, m, 1:length(x)-3*m)
+
+function hdev_sumsq(x::AbstractVector{T}, m::Int, positions::UnitRange{Int}) where T<:Real
+    S = accumulation_type(T)
+    s = zero(S)
+    @inbounds @simd for i in positions
+        d3 = S(x[i+3*m]) - 3*S(x[i+2*m]) + 3*S(x[i+m]) - S(x[i])
+        s += d3 * d3
+    end
+    return s
+end
+
+"""
+    totdev_sumsq(x, m)
+
+Sum of squared second differences used by TOTVAR, for i = 1..N-m, over the
+series extended past its end by the odd reflection x*[j] = 2x[N] - x[2N-j].
+The reflected samples are read through that index map instead of being
+materialized. Terms with i ≤ N-2m are the `adev_sumsq` terms.
+"""
+totdev_sumsq(x::AbstractVector{<:Real}, m::Int) = adev_sumsq(x, m) + totdev_tail_sumsq(x, m)
+
+"""
+    totdev_tail_sumsq(x, m)
+
+The terms of [`totdev_sumsq`](@ref) that reach into the reflection,
+i = max(1, N-2m+1)..N-m.
+"""
+function totdev_tail_sumsq(x::AbstractVector{T}, m::Int) where T<:Real
+    S = accumulation_type(T)
+    N = length(x)
+    s = zero(S)
+    xN2 = 2*S(x[N])
+    @inbounds @simd for i in max(1, N-2*m+1):N-m
+        d2 = (xN2 - S(x[2*N-i-2*m])) - 2*S(x[i+m]) + S(x[i])
+        s += d2 * d2
+    end
+    return s
+end
+
+"""
+    mdev_sumsq(x, m)
+
+Sum of squared m-sample window-sum second differences used by MDEV,
+
+    D_i = Σ_{j=0}^{m-1} (x[i+2m+j] - 2x[i+m+j] + x[i+j]),   i = 1..N-3m+1
+
+The window sum is carried forward with the recurrence
+D_{i+1} = D_i + x[i+3m] - 3x[i+2m] + 3x[i+m] - x[i], so each τ costs one pass
+over the data and no temporary arrays. Returns Σ D_i² (not divided by m²).
+With `positions`, only those i are summed; the window is formed directly at
+the first of them.
+"""
+mdev_sumsq(x::AbstractVector{<:Real}, m::Int) = mdev_sumsq(x, m, 1:length(x)-3*m+1)
+
+function mdev_sumsq(x::AbstractVector{T}, m::Int, positions::UnitRange{Int}) where T<:Real
+    S = accumulation_type(T)
+    s = zero(S)
+    isempty(positions) && return s
+
+    a = first(positions)
+    D = zero(S)
+    @inbounds for j in 0:m-1
+        D += S(x[a+2*m+j]) - 2*S(x[a+m+j]) + S(x[a+j])
+    end
+    s += D * D
+
+    @inbounds for i in a:last(positions)-1
+        D += S(x[i+3*m]) - 3*S(x[i+2*m]) + 3*S(x[i+m]) - S(x[i])
+        s += D * D
+    end
+    return s
+end
+
+"""
+    mhdev_sumsq(x, m)
+
+Sum of squared m-point moving sums of third differences used by MHDEV.
+
+With d4_i = x[i] - 3x[i+m] + 3x[i+2m] - x[i+3m] for i = 1..N-4m+1 (the
+MATLAB indexing), the moving sums A_i = Σ_{j=i}^{i+m-1} d4_j are updated in
+place as the window slides. Returns `(Σ A_i², count)`; `count` is zero when
+fewer than m third differences are available.
+"""
+function mhdev_sumsq(x::AbstractVector{T}, m::Int) where T<:Real
+    count = length(x) - 5*m + 2
+    count <= 0 && return zero(accumulation_type(T)), 0
+    return mhdev_window_sumsq(x, m, 1:count), count
+end
+
+"""
+    mhdev_window_sumsq(x, m, positions)
+
+Σ A_i² of [`mhdev_sumsq`](@ref) over the window positions i in `positions`,
+with the first window formed directly.
+"""
+function mhdev_window_sumsq(x::AbstractVector{T}, m::Int, positions::UnitRange{Int}) where T<:Real
+    S = accumulation_type(T)
+    s = zero(S)
+    isempty(positions) && return s
+
+    a = first(positions)
+    A = zero(S)
+    @inbounds for j in a:a+m-1
+        A += S(x[j]) - 3*S(x[j+m]) + 3*S(x[j+2*m]) - S(x[j+3*m])
+    end
+    s += A * A
+
+    @inbounds for i in a:last(positions)-1
+        d_in = S(x[i+m]) - 3*S(x[i+2*m]) + 3*S(x[i+3*m]) - S(x[i+4*m])
+        d_out = S(x[i]) - 3*S(x[i+m]) + 3*S(x[i+2*m]) - S(x[i+3*m])
+        A += d_in - d_out
+        s += A * A
+    end
+    return s
+end
+
+"""
+    allan_family_sumsq(x, m)
+
+The sums behind ADEV, HDEV, MDEV and MHDEV from a single pass over x:
+
+- ADEV:  Σ d2ᵢ²,  d2ᵢ = x[i+2m] - 2x[i+m] + x[i], i = 1..N-2m
+- HDEV:  Σ d3ᵢ²,  d3ᵢ = d2ᵢ₊ₘ - d2ᵢ,              i = 1..N-3m
+- MDEV:  Σ Dᵢ²,   Dᵢ = Σ_{j=0}^{m-1} d2ᵢ₊ⱼ,       i = 1..N-3m+1
+- MHDEV: Σ Eᵢ²,   Eᵢ = Dᵢ₊ₘ - Dᵢ,                 i = 1..N-5m+2
+
+The window sums advance with D += d3ᵢ and E += d3ᵢ₊ₘ - d3ᵢ, so each sample is
+loaded once per τ for all four statistics. The sums equal those of
+`adev_sumsq`, `hdev_sumsq`, `mdev_sumsq` and `mhdev_sumsq` up to rounding.
+"""
+function allan_family_sumsq(x::AbstractVector{T}, m::Int) where T<:Real
+    S = accumulation_type(T)
+    N = length(x)
+    sa = sh = sm = smh = zero(S)
+    n_a = N - 2*m        # second differences
+    n_h = N - 3*m        # third differences
+    n_m = N - 3*m + 1    # MDEV windows
+    n_mh = N - 5*m + 2   # MHDEV windows
+
+    D = zero(S)
+    if n_m >= 1
+        @inbounds for j in 0:m-1
+            D += S(x[1+2*m+j]) - 2*S(x[1+m+j]) + S(x[1+j])
+        end
+    end
+    E = zero(S)
+    if n_mh >= 1
+        @inbounds for k in 1:m
+            E += S(x[k+3*m]) - 3*S(x[k+2*m]) + 3*S(x[k+m]) - S(x[k])
+        end
+    end
+
+    @inbounds for i in 1:n_a
+        d2 = S(x[i+2*m]) - 2*S(x[i+m]) + S(x[i])
+        sa += d2 * d2
+        if i <= n_m
+            sm += D * D
+            if i <= n_h
+                d3 = S(x[i+3*m]) - 2*S(x[i+2*m]) + S(x[i+m]) - d2
+                sh += d3 * d3
+                D += d3
+                if i <= n_mh
+                    smh += E * E
+                    if i < n_mh
+                        E += (S(x[i+4*m]) - 3*S(x[i+3*m]) + 3*S(x[i+2*m]) - S(x[i+m])) - d3
+                    end
+                end
+            end
+        end
+    end
+    return (adev=sa, hdev=sh, mdev=sm, mhdev=smh)
+end
+
+# ---------------------------------------------------------------------------
+# Reflected-subsequence engine shared by the total deviations
+# ---------------------------------------------------------------------------
+
+"""
+    ReflectedWorkspace{T}()
+
+Scratch buffers for [`reflected_sumsq!`](@ref). The buffers grow on demand and
+are reused for every τ of a sweep.
+"""
+struct ReflectedWorkspace{T<:AbstractFloat}
+    U::Vector{T}               # running sums of the re-centred block
+    UU::Vector{T}              # running sums of U
+    c::Vector{T}               # detrend slope of each subsequence in the block
+    F::Vector{T}               # filter terms indexed by n + p
+    R::Vector{T}               # filter terms indexed by n - p
+    PR::Vector{T}              # running sums of R over every other index
+    GF::NTuple{3,Vector{T}}    # running moment sums of F
+    GR::NTuple{3,Vector{T}}    # running moment sums of R
+end
+
+ReflectedWorkspace{T}() where T<:AbstractFloat =
+    ReflectedWorkspace{T}(T[], T[], T[], T[], T[], T[], (T[], T[], T[]), (T[], T[], T[]))
+
+grow!(v::Vector, n::Int) = length(v) < n ? resize!(v, n) : v
+
+"""
+    reflected_pieces(L, m, coefs, P)
+
+Split the output positions p = 0..P-1 of the filter Σ_b coefs[b+1]·S(p + b·m),
+with S the running sum of the reflection [rev(z); z; rev(z)] of a length-L
+sequence z, into ranges on which every tap stays inside one copy of z. On such
+a range S(p + b·m) = κ_b·Z(L) + coef_b·Z(offset_b + sign_b·p), where Z is the
+running sum of z. Returns tuples `(pa, pb, κ, coef, sign, offset)`.
+"""
+function reflected_pieces(L::Int, m::Int, coefs, P::Int)
+    bps = [0, P]
+    for b in 0:length(coefs)-1, q in (L - b*m, 2*L - b*m)
+        0 < q < P && push!(bps, q)
+    end
+    sort!(unique!(bps))
+
+    pieces = Tuple{Int,Int,Int,Vector{Int},Vector{Int},Vector{Int}}[]
+    for k in 1:length(bps)-1
+        pa, pb = bps[k], bps[k+1] - 1
+        κ = 0
+        tc, ts, ta = Int[], Int[], Int[]
+        for (b, cb) in enumerate(coefs)
+            cb == 0 && continue
+            shift = (b - 1) * m
+            if pb + shift <= L
+                # Reversed copy: S(q) = Z(L) - Z(L - q)
+                κ += cb; push!(tc, -cb); push!(ts, -1); push!(ta, L - shift)
+            elseif pb + shift <= 2*L
+                # Forward copy: S(q) = Z(L) + Z(q - L)
+                κ += cb; push!(tc, cb); push!(ts, 1); push!(ta, shift - L)
+            else
+                # Second reversed copy: S(q) = 3Z(L) - Z(3L - q)
+                κ += 3*cb; push!(tc, -cb); push!(ts, -1); push!(ta, 3*L - shift)
+            end
+        end
+        push!(pieces, (pa, pb, κ, tc, ts, ta))
+    end
+    return pieces
+end
+
+"""
+    reflected_sumsq!(ws, u, L, m, coefs, P, nsubs, slope)
+
+Sum over subsequences n = 1..nsubs and positions p = 0..P-1 of
+
+    (Σ_b coefs[b+1]·S_n(p + b·m))²
+
+where S_n is the running sum of the uninverted even reflection
+[rev(z); z; rev(z)] of the detrended subsequence z_r = u[n+r-1] - c_n·r,
+r = 1..L. This is the inner double sum of MTOTVAR, HTOTVAR and MHTOTVAR.
+
+`slope(U, UU, k)` returns c_n from the running sums `U` of the block data and
+their running sums `UU`, the subsequence occupying `U[k+1:k+L+1]`.
+
+On each range from [`reflected_pieces`](@ref) a filter output splits into
+terms that depend only on n + p, only on n - p, and on n times a quadratic in
+p. Squaring and summing then needs only sliding window and running sums, so a
+τ costs O(nsubs + P) instead of O(nsubs·P), and nothing is reflected or
+copied per subsequence. Subsequences are processed in blocks of 2L whose data
+are first re-centred on a local line. Neither the filter nor the detrend sees
+constants or lines, so the result is unchanged, while the expanded terms stay
+on the scale of the filter output and do not cancel catastrophically.
+"""
+function reflected_sumsq!(ws::ReflectedWorkspace{S}, u::AbstractVector, L::Int, m::Int,
+                          coefs, P::Int, nsubs::Int, slope) where S
+    total = zero(S)
+    nsubs < 1 && return total
+
+    pieces = reflected_pieces(L, m, coefs, P)
+    B = min(max(2*L, 32), nsubs)
+    grow!(ws.U, B + L)
+    grow!(ws.UU, B + L)
+    grow!(ws.c, B)
+    for v in (ws.F, ws.R, ws.GF..., ws.GR...)
+        grow!(v, B + P + 1)
+    end
+    grow!(ws.PR, B + P + 2)
+    U, UU, c = ws.U, ws.UU, ws.c
+
+    for n0 in 1:B:nsubs
+        Bn = min(B, nsubs - n0 + 1)
+        o = n0 - 1
+        K = Bn - 1 + L
+
+        # Re-centre the block on its mean and end-point slope
+        μ = zero(S)
+        @inbounds for k in 1:K
+            μ += u[o+k]
+        end
+        μ /= K
+        β = K > 1 ? S(u[o+K] - u[o+1]) / (K - 1) : zero(S)
+        mid = S(K + 1) / 2
+        U[1] = zero(S)
+        UU[1] = zero(S)
+        @inbounds for k in 1:K
+            U[k+1] = U[k] + ((u[o+k] - μ) - β * (k - mid))
+            UU[k+1] = UU[k] + U[k]
+        end
+
+        @inbounds for ν in 1:Bn
+            c[ν] = slope(U, UU, ν - 1)
+        end
+
+        for (pa, pb, κ, tc, ts, ta) in pieces
+            total += reflected_piece_sumsq!(ws, Bn, L, pa, pb, κ, tc, ts, ta)
+        end
+    end
+    return total
+end
+
+# One block and one range of positions p = pa..pb of `reflected_sumsq!`.
+# With q = p - pc and i = ν + p, v = ν - p the filter output is
+#     F(i) + R(v) + e0(ν) + e1(ν)·q + e2(ν)·q²
+# and each product of the expanded square is summed with window counts,
+# running sums over every other v, or running moment sums.
+function reflected_piece_sumsq!(ws::ReflectedWorkspace{S}, Bn::Int, L::Int,
+                                pa::Int, pb::Int, κ::Int,
+                                tc::Vector{Int}, ts::Vector{Int}, ta::Vector{Int}) where S
+    U, c, F, R, PR = ws.U, ws.c, ws.F, ws.R, ws.PR
+    GF0, GF1, GF2 = ws.GF
+    GR0, GR1, GR2 = ws.GR
+
+    pc = (pa + pb) ÷ 2
+    w = pb - pa + 1
+
+    # Response of the filter to the detrend ramp: π0 + π1·q + π2·q²
+    sc = sum(tc)
+    π0 = S(κ * (L * (L + 1) ÷ 2))
+    π1 = zero(S)
+    π2 = S(sc) / 2
+    for t in eachindex(tc)
+        a = ta[t] + ts[t] * pc
+        π0 += tc[t] * (a * (a + 1) ÷ 2)
+        π1 += S(tc[t] * ts[t] * (2*a + 1)) / 2
+    end
+
+    # Power sums of q over the range
+    M0 = M1 = M2 = M3 = M4 = zero(S)
+    for q in pa-pc:pb-pc
+        fq = S(q)
+        M0 += 1; M1 += fq; M2 += fq^2; M3 += fq^3; M4 += fq^4
+    end
+
+    # Terms depending on i = ν + p (F) and v = ν - p (R)
+    ilo, vlo = 1 + pa, 1 - pb
+    nI = Bn + pb - pa
+    ic = S(1 + pa + Bn + pb) / 2   # centre of the i range
+    vc = S(Bn - pa - pb + 1) / 2     # centre of the v range
+    @inbounds for t in 1:nI
+        i = ilo + t - 1
+        v = vlo + t - 1
+        f = zero(S); r = zero(S)
+        for k in eachindex(tc)
+            if ts[k] > 0
+                f += tc[k] * U[i + ta[k]]
+            else
+                r += tc[k] * U[v + ta[k]]
+            end
+        end
+        F[t] = f
+        R[t] = r
+    end
+
+    sFF = zero(S); sRR = zero(S); sFR = zero(S)
+    PR[1] = PR[2] = zero(S)
+    GF0[1] = GF1[1] = GF2[1] = zero(S)
+    GR0[1] = GR1[1] = GR2[1] = zero(S)
+    @inbounds for t in 1:nI
+        i = ilo + t - 1
+        v = vlo + t - 1
+        # Number of (ν, p) pairs sharing this i, respectively v
+        wF = min(Bn, i - pa) - max(1, i - pb) + 1
+        wR = min(Bn, v + pb) - max(1, v + pa) + 1
+        sFF += wF * F[t]^2
+        sRR += wR * R[t]^2
+
+        PR[t+2] = R[t] + PR[t]
+
+        di = i - ic
+        GF0[t+1] = GF0[t] + F[t]
+        GF1[t+1] = GF1[t] + di * F[t]
+        GF2[t+1] = GF2[t] + di^2 * F[t]
+        dv = v - vc
+        GR0[t+1] = GR0[t] + R[t]
+        GR1[t+1] = GR1[t] + dv * R[t]
+        GR2[t+1] = GR2[t] + dv^2 * R[t]
+    end
+
+    # Σ F(ν+p)·R(ν-p): for fixed i the v = 2ν - i step by two
+    @inbounds for t in 1:nI
+        i = ilo + t - 1
+        n1 = max(1, i - pb)
+        n2 = min(Bn, i - pa)
+        sFR += F[t] * (PR[2*n2 - i - vlo + 3] - PR[2*n1 - i - vlo + 1])
+    end
+
+    # Terms carrying the ν-only part e0 + e1·q + e2·q²
+    sEE = zero(S); sFE = zero(S); sRE = zero(S)
+    @inbounds for ν in 1:Bn
+        cn = c[ν]
+        e0 = κ * (U[ν+L] - U[ν]) - sc * U[ν] - cn * π0
+        e1 = -cn * π1
+        e2 = -cn * π2
+        sEE += e0*e0*M0 + 2*e0*e1*M1 + (e1*e1 + 2*e0*e2)*M2 + 2*e1*e2*M3 + e2*e2*M4
+
+        # Σ_q q^j F(ν + pc + q) and Σ_q q^j R(ν - pc - q), j = 0, 1, 2
+        g0 = GF0[ν+w] - GF0[ν]; g1 = GF1[ν+w] - GF1[ν]; g2 = GF2[ν+w] - GF2[ν]
+        d = ν + pc - ic
+        sFE += e0*g0 + e1*(g1 - d*g0) + e2*(g2 - 2*d*g1 + d^2*g0)
+
+        h0 = GR0[ν+w] - GR0[ν]; h1 = GR1[ν+w] - GR1[ν]; h2 = GR2[ν+w] - GR2[ν]
+        d = ν - pc - vc
+        sRE += e0*h0 + e1*(d*h0 - h1) + e2*(d^2*h0 - 2*d*h1 + h2)
+    end
+
+    return sFF + sRR + sEE + 2*(sFR + sFE + sRE)
+end
+
+"""
+    half_average_slope(L; skip_middle=false)
+
+Slope rule for [`reflected_sumsq!`](@ref): difference of the first- and
+second-half means of an L-point subsequence over the distance between their
+centres. With `skip_middle` the centre sample of an odd-length subsequence is
+left out, as in HTOTVAR.
+"""
+function half_average_slope(L::Int; skip_middle::Bool=false)
+    h1 = L ÷ 2
+    h2 = skip_middle ? cld(L, 2) : h1
+    den = (L + h2 - h1) / 2   # distance between the half centres
+    return (U, UU, k) -> ((U[k+L+1] - U[k+h2+1]) / (L - h2) - (U[k+h1+1] - U[k+1]) / h1) / den
+end
+
+"""
+    least_squares_slope(L)
+
+Slope rule for [`reflected_sumsq!`](@ref): least-squares line through an
+L-point subsequence, as fitted by `detrend_linear`. The sums Σx and Σr·x come
+from the running sums in O(1) via Σ_{r=1}^{L} r·x_r = L·U_L - Σ_{j=0}^{L-1} U_j.
+The intercept is not needed because the reflected filters cancel constants.
+"""
+function least_squares_slope(L::Int)
+    r̄ = (L + 1) / 2
+    Srr = L * (L^2 - 1) / 12
+    return function (U, UU, k)
+        sx = U[k+L+1] - U[k+1]
+        srx = L * U[k+L+1] - (UU[k+L+1] - UU[k+1])
+        return (srx - r̄ * sx) / Srr
+    end
+end
+
+"""
+    mtotdev_sumsq!(ws, x, m)
+
+Inner double sum of MTOTVAR over every 3m-point subsequence of x: half-average
+detrend, uninverted even reflection and second differences of m-point
+averages (not divided by m² or 6m). Zero when x is shorter than 3m.
+"""
+function mtotdev_sumsq!(ws::ReflectedWorkspace{S}, x::AbstractVector, m::Int) where S
+    nsubs = length(x) - 3*m + 1
+    nsubs < 1 && return zero(S)
+    L = 3*m
+    slope = m == 1 ? ((U, UU, i) -> (U[i+4] - U[i+3] - U[i+2] + U[i+1]) / 2) :
+                     half_average_slope(L)
+    return reflected_sumsq!(ws, x, L, m, (-1, 3, -3, 1), 6*m, nsubs, slope)
+end
+
+"""
+    htotdev_sumsq!(ws, y, m)
+
+Inner double sum of HTOTVAR over every 3m-point subsequence of the frequency
+series y: half-average detrend with the middle point skipped, uninverted even
+reflection and Hadamard differences of m-point means. Zero for m = 1, where
+HTOTDEV uses the overlapping HDEV instead, and when y is shorter than 3m.
+"""
+function htotdev_sumsq!(ws::ReflectedWorkspace{S}, y::AbstractVector, m::Int) where S
+    nsubs = length(y) - 3*m + 1
+    (m == 1 || nsubs < 1) && return zero(S)
+    slope = half_average_slope(3*m; skip_middle=true)
+    return reflected_sumsq!(ws, y, 3*m, m, (-1, 3, -3, 1), 6*m, nsubs, slope)
+end
+
+"""
+    mhtotdev_sumsq!(ws, x, m)
+
+Inner double sum of MHTOTVAR over every (3m+1)-point phase subsequence of x:
+least-squares detrend, symmetric reflection and m-point moving sums of third
+differences, taken at 5m+4 positions. Zero when x is shorter than 4m.
+"""
+function mhtotdev_sumsq!(ws::ReflectedWorkspace{S}, x::AbstractVector, m::Int) where S
+    nsubs = length(x) - 4*m + 1
+    nsubs < 1 && return zero(S)
+    L = 3*m + 1
+    return reflected_sumsq!(ws, x, L, m, (-1, 4, -6, 4, -1), 5*m + 4, nsubs,
+                            least_squares_slope(L))
+end
+
+# ---------------------------------------------------------------------------
+# Parabolic deviation
+# ---------------------------------------------------------------------------
+
+# Positions per independent partial sum of pdev_sumsq. Fixed so that the
+# threaded and serial paths add the same partials in the same order.
+const PDEV_CHUNK = 16384
+
+# Smallest m for which pdev hands the chunks to threads
+const PDEV_THREAD_MIN_M = 64
+
+"""
+    pdev_sumsq!(P0, P1, x, m, positions)
+
+Sum over the 0-based `positions` i of [A(i+1) - A(i+m+1)]², where
+A(a) = Σₖ((m-1)/2 - k)·x[a+k] for k = 0..m-1 is the parabolic weighting of
+PVAR. Because the weights are linear in k, A(a) = (c + s)·ΣZ - Σt·Z over a
+window of running sums Z of x, so each position is O(1) whatever m.
+
+The running sums are restarted every max(4m, 256) positions on a local line
+through the block. A line shifts every A(a) by the same constant, so the
+differences are unchanged while the running sums stay small. `P0` and `P1`
+are scratch buffers that grow on demand.
+"""
+function pdev_sumsq!(P0::Vector{S}, P1::Vector{S}, x::AbstractVector, m::Int,
+                     positions::UnitRange{Int}) where S<:AbstractFloat
+    B = max(4*m, 256)
+    grow!(P0, B + 2*m)
+    grow!(P1, B + 2*m)
+    c = S(m - 1) / 2
+    total = zero(S)
+    b = first(positions)
+    @inbounds while b <= last(positions)
+        Bn = min(B, last(positions) - b + 1)
+        K = Bn + 2*m - 1                     # samples x[b+1..b+K] feed the block
+        offset = S(x[b+1])
+        slope = (S(x[b+K]) - offset) / max(K - 1, 1)
+        P0[1] = zero(S)
+        P1[1] = zero(S)
+        for t in 1:K
+            z = x[b+t] - offset - slope * (t - 1)
+            P0[t+1] = P0[t] + z
+            P1[t+1] = P1[t] + t * z
+        end
+        for s1 in 1:Bn
+            s2 = s1 + m
+            a1 = (c + s1) * (P0[s1+m] - P0[s1]) - (P1[s1+m] - P1[s1])
+            a2 = (c + s2) * (P0[s2+m] - P0[s2]) - (P1[s2+m] - P1[s2])
+            total += (a1 - a2)^2
+        end
+        b += Bn
+    end
+    return total
+end
+
+"""
+    pdev_sumsq(x, m; threaded=false)
+
+Sum of squared parabolic sums for all N-2m positions, evaluated in chunks of
+`PDEV_CHUNK` positions. With `threaded` the chunks run as tasks; the partials
+are added in chunk order either way, so the result does not depend on the
+thread count.
+"""
+function pdev_sumsq(x::AbstractVector{T}, m::Int; threaded::Bool=false) where T<:Real
+    S = accumulation_type(T)
+    M = length(x) - 2*m
+    M < 1 && return zero(S)
+    starts = 0:PDEV_CHUNK:M-1
+    chunk(lo) = lo:min(lo + PDEV_CHUNK - 1, M - 1)
+    if threaded && length(starts) > 1
+        tasks = [Threads.@spawn pdev_sumsq!(S[], S[], x, m, chunk(lo)) for lo in starts]
+        partials = fetch.(tasks)
+    else
+        P0, P1 = S[], S[]
+        partials = [pdev_sumsq!(P0, P1, x, m, chunk(lo)) for lo in starts]
+    end
+    return sum(partials)
+end
+
+# ---------------------------------------------------------------------------
+# THEO1
+# ---------------------------------------------------------------------------
+
+# Lags j handled by one task of the threaded THEO1 sum
+const THEO1_CHUNK = 32
+
+# Smallest m for which the strided THEO1 estimate is used
+const THEO1_FAST_MIN_M = 128
+
+"""
+    theo1_term(x, m, j, stride)
+
+Σ(x[i] - x[i+j] - x[i+m-j] + x[i+m])² over i = 1..N-m. With `stride > 1` only
+every stride-th i is visited and the partial sum is scaled by the ratio of
+positions to visited positions, so it estimates the same total.
+"""
+function theo1_term(x::AbstractVector{T}, m::Int, j::Int, stride::Int) where T<:Real
+    S = accumulation_type(T)
+    L = length(x) - m
+    s = zero(S)
+    if stride == 1
+        @inbounds @simd for i in 1:L
+            d = S(x[i]) - S(x[i+j]) - S(x[i+m-j]) + S(x[i+m])
+            s += d * d
+        end
+        return s
+    end
+    @inbounds for i in 1:stride:L
+        d = S(x[i]) - S(x[i+j]) - S(x[i+m-j]) + S(x[i+m])
+        s += d * d
+    end
+    return s * L / cld(L, stride)
+end
+
+"""
+    theo1_sumsq(x, m; threaded=false)
+
+Weighted THEO1 sum Σ_δ 1/(m/2-δ) Σᵢ[(xᵢ - xᵢ₋δ₊ₘ/₂) + (xᵢ₊ₘ - xᵢ₊δ₊ₘ/₂)]² for
+even m. Substituting j = m/2 - δ turns every δ into one contiguous pass
+Σᵢ(xᵢ - xᵢ₊ⱼ - xᵢ₊ₘ₋ⱼ + xᵢ₊ₘ)² with the single weight 1/j, so there is no
+division or branching inside the loop over i. With `threaded` the lags are
+split into chunks of `THEO1_CHUNK` that run as tasks and are added in order.
+
+The cost is O(N·m) per τ. That is a choice, not a limit: every product in the
+expanded square is a windowed autocorrelation, e.g. Σᵢ xᵢ₊ⱼ·xᵢ₊ₘ₋ⱼ at lag
+m-2j, so the sum could be assembled from the FFT correlations and head/tail
+sums of `src/dense.jl`. That expansion cancels like the dense sums do
+(rounding error scaling with Σx² rather than with the result) and would need
+the same error-bound fallback; it is not implemented.
+"""
+function theo1_sumsq(x::AbstractVector{T}, m::Int; threaded::Bool=false) where T<:Real
+    h = m ÷ 2
+    lag_sum(js) = sum(j -> theo1_term(x, m, j, 1) / j, js; init=zero(accumulation_type(T)))
+    chunks = [lo:min(lo + THEO1_CHUNK - 1, h) for lo in 1:THEO1_CHUNK:h]
+    if threaded && length(chunks) > 1
+        partials = fetch.([Threads.@spawn lag_sum(js) for js in chunks])
+    else
+        partials = [lag_sum(js) for js in chunks]
+    end
+    return sum(partials; init=zero(accumulation_type(T)))
+end
+
+"""
+    theo1_sumsq_strided(x, m)
+
+Approximation of [`theo1_sumsq`](@ref) in O(N log m) instead of O(N·m).
+
+- lags j ≤ √(m/2) are evaluated at every j-th position only and scaled up to
+  all positions; consecutive terms of these short lags are strongly
+  correlated, so little is lost;
+- the remaining lags are taken in groups of √(m/2); each group is
+  replaced by the lag at its harmonic centroid, weighted by the group's
+  Σ1/j and sampled every √(m/2) positions;
+- the lag m/2, whose two inner samples coincide, is kept on its own.
+
+Both the subsampling and the centroid lags change the result, so this is an
+approximation, not an estimate of the exact sum with known error. The tests
+hold it within 5% of the exact sum for simulated power-law noise from White
+PM to Random Walk FM at m = 128..1024; there is no bound for other data.
+"""
+function theo1_sumsq_strided(x::AbstractVector{T}, m::Int) where T<:Real
+    h = m ÷ 2
+    g = isqrt(h)
+    s = zero(accumulation_type(T))
+    for j in 1:min(g, h - 1)
+        s += theo1_term(x, m, j, j) / j
+    end
+    j0 = g + 1
+    while j0 <= h - 1
+        j1 = min(j0 + g - 1, h - 1)
+        W = sum(1 / j for j in j0:j1)
+        jr = round(Int, (j1 - j0 + 1) / W)
+        s += W * theo1_term(x, m, jr, g)
+        j0 = j1 + 1
+    end
+    return s + theo1_term(x, m, h, g) / h
+end
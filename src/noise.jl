@@ -54,6 +54,33 @@ function noise_id(x::Vector{T}, m_list::Vector{Int}, data_type::String="phase",
     return alpha_list
 end
 
+"""
+    resolve_noise(x, mlist, noise)
+
+Noise exponents α for a deviation call, selected by its `noise` keyword:
+- `:skip`: no identification, White FM (α = 0) is assumed at every τ
+- `:auto`: run `noise_id` once on the phase data
+- vector: precomputed α values (e.g. from an earlier `noise_id` call), one per m
+
+Entries that could not be identified (NaN) fall back to White FM.
+"""
+function resolve_noise(x::AbstractVector{<:Real}, mlist::AbstractVector{Int}, noise)
+    if noise === :skip
+        return fill(0, length(mlist))
+    elseif noise === :auto
+        alpha = noise_id(collect(x), collect(Int, mlist), "phase")
+    elseif noise isa AbstractVector{<:Real}
+        if length(noise) != length(mlist)
+            throw(ArgumentError("noise must have one α per averaging factor " *
+                                "($(length(mlist))), got $(length(noise))"))
+        end
+        alpha = noise
+    else
+        throw(ArgumentError("noise must be :skip, :auto or a vector of α values"))
+    end
+    return [isnan(a) ? 0 : round(Int, a) for a in alpha]
+end
+
 """
     preprocess_x(x)
 
@@ -66,10 +93,10 @@ function preprocess_x(x::Vector{T}) where T<:Real
     x_mean = mean(x)
     x_std = std(x)
     z_scores = abs.((x .- x_mean) ./ x_std)
-    x_clean = x[z_scores .< 5.0]
+    x_clean = float(x[z_scores .< 5.0])
     
-    # Remove linear trend (frequency drift)
-    return detrend_linear(x_clean)
+    # Remove linear trend (frequency drift) in place
+    return detrend!(x_clean, 1)
 end
 
 """
@@ -77,49 +104,104 @@ end
 
 Lag-1 autocorrelation function method for noise identification.
 
+Phase data are decimated as a strided view x[1:m:end], frequency data
+averaged in blocks of m. The detrend and the lag-1 ACF of every differencing
+order come from [`lag1_acf_orders`](@ref) in two passes, without copying the
+decimated series or building a design matrix.
+
 Returns (alpha, alpha_int, d, rho) where:
 - alpha: Estimated noise exponent
 - alpha_int: Rounded integer estimate  
 - d: Final differencing order used
 - rho: Fractional integration index
 """
-function noise_id_lag1acf(x::Vector{T}, m::Int, data_type::String, 
+function noise_id_lag1acf(x::AbstractVector{T}, m::Int, data_type::String, 
                          dmin::Int=0, dmax::Int=2) where T<:Real
-    # Step 1: Preprocess by data type
+    # Step 1: Preprocess by data type and lag-1 ACF of each differencing order
     if lowercase(data_type) == "phase"
-        if m > 1
-            x = x[1:m:end]  # Decimate
-        end
-        x = detrend_quadratic(x)  # Remove quadratic drift
+        r1 = lag1_acf_orders(view(x, 1:m:length(x)), dmax, 2)  # Quadratic drift removed
     elseif lowercase(data_type) == "freq"
         N = floor(Int, length(x) / m) * m
-        x = x[1:N]
-        x = reshape(x, m, :)
-        x = vec(mean(x, dims=1))  # Average in blocks
-        x = detrend_linear(x)
+        y = vec(mean(reshape(view(x, 1:N), m, :), dims=1))   # Average in blocks
+        r1 = lag1_acf_orders(y, dmax, 1)
     else
         error("data_type must be 'phase' or 'freq'")
     end
     
-    # Step 2: Differencing loop
-    d = 0
-    while true
-        r1 = compute_lag1_acf(x)  # Lag-1 autocorrelation
-        rho = r1 / (1 + r1)       # Fractional integration index
-        
+    # Step 2: Pick the differencing order
+    return acf_alpha(r1, lowercase(data_type) == "phase", dmin, dmax)
+end
+
+"""
+    acf_alpha(r1, phase, dmin, dmax)
+
+Differencing decision of the lag-1 ACF method: the first order d ≥ dmin with
+ρ = r1/(1 + r1) < 0.25, or dmax, gives α = -2(ρ + d) (+2 for phase data).
+`r1[d+1]` holds the lag-1 ACF after d differences. Returns (alpha,
+alpha_int, d, rho).
+"""
+function acf_alpha(r1::AbstractVector, phase::Bool, dmin::Int, dmax::Int)
+    for d in 0:dmax
+        isnan(r1[d+1]) && error("Data too short after differencing")
+        rho = r1[d+1] / (1 + r1[d+1])   # Fractional integration index
         if d >= dmin && (rho < 0.25 || d >= dmax)
-            p = -2 * (rho + d)    # Spectral slope
-            alpha = p + 2 * (lowercase(data_type) == "phase" ? 1 : 0)
-            alpha_int = round(Int, alpha)
-            return (alpha, alpha_int, d, rho)
-        else
-            x = diff(x)
-            d = d + 1
-            if length(x) < 5
-                error("Data too short after differencing")
+            p = -2 * (rho + d)          # Spectral slope
+            alpha = p + 2 * (phase ? 1 : 0)
+            return (alpha, round(Int, alpha), d, rho)
+        end
+    end
+    error("Data too short after differencing")
+end
+
+"""
+    lag1_acf_orders(x, dmax, degree)
+
+Lag-1 autocorrelations of x after removing its least-squares polynomial of
+`degree` (1 or 2), and of the first `dmax` differences of that residual:
+element d+1 is the `compute_lag1_acf` of the d-times differenced residual.
+
+The fit comes from [`trend_fit`](@ref); a second pass forms each residual
+on the fly and carries the differences of all orders along with it, so every
+order's Σa, Σa², Σaᵢaᵢ₊₁ and end values are accumulated at once and the means
+are removed in closed form. Orders left with fewer than 5 points (or a
+constant series) give NaN.
+"""
+function lag1_acf_orders(x::AbstractVector{T}, dmax::Int, degree::Int) where T<:Real
+    S = accumulation_type(T)
+    n = length(x)
+    fit = trend_fit(x, degree)
+
+    sa = zeros(S, dmax + 1)      # Σa
+    saa = zeros(S, dmax + 1)     # Σa²
+    slag = zeros(S, dmax + 1)    # Σ aᵢ aᵢ₊₁
+    head = zeros(S, dmax + 1)    # first value of each order
+    prev = zeros(S, dmax + 1)    # latest value of each order
+    @inbounds for i in 1:n
+        a = S(x[i]) - fit(i)
+        for d in 0:min(i - 1, dmax)
+            if i - 1 > d
+                slag[d+1] += prev[d+1] * a
+            else
+                head[d+1] = a
             end
+            sa[d+1] += a
+            saa[d+1] += a * a
+            next = a - prev[d+1]   # value of order d+1 (used only when i - 1 > d)
+            prev[d+1] = a
+            a = next
         end
     end
+
+    r1 = fill(NaN, dmax + 1)
+    for d in 0:dmax
+        cnt = n - d
+        cnt >= (d == 0 ? 2 : 5) || continue
+        mu = sa[d+1] / cnt
+        num = slag[d+1] - mu * (2 * sa[d+1] - head[d+1] - prev[d+1]) + (cnt - 1) * mu^2
+        den = saa[d+1] - cnt * mu^2
+        den > 0 && (r1[d+1] = num / den)
+    end
+    return r1
 end
 
 """
@@ -150,26 +232,19 @@ Returns (alpha_int, mu_best, B1_obs) where:
 - mu_best: Best-fit slope parameter
 - B1_obs: Observed B1 ratio
 """
-function noise_id_b1rn(x_full::Vector{T}, m::Int, data_type::String) where T<:Real
-    x_full = vec(x_full)
-    
+function noise_id_b1rn(x_full::AbstractVector{T}, m::Int, data_type::String) where T<:Real
     if lowercase(data_type) == "phase"
-        # Decimate and detrend phase data
-        x_dec = x_full[1:m:end]
-        x_dec = detrend_quadratic(x_dec)
-        tau = m
-        avar_val = simple_avar(x_dec, tau)
-        N_avar = floor(Int, length(x_dec) - 2)
+        # Non-overlapping AVAR at τ = m from the decimated, detrended phase
+        x_dec = view(x_full, 1:m:length(x_full))
+        avar_val = simple_avar(detrended(x_dec, 2), 1) / m^2
+        N_avar = length(x_dec) - 2
         
-        # Classical variance of averaged differences
-        dx = diff(x_full)
-        N = floor(Int, length(dx) / m) * m
-        if N < m
+        # Classical variance of the block means of the first differences;
+        # the mean of block j is (x[j·m+1] - x[(j-1)·m+1]) / m
+        if length(x_dec) < 2
             return (NaN, NaN, NaN)
         end
-        dx = dx[1:N]
-        y_blocks = reshape(dx, m, :)
-        y_avg = vec(mean(y_blocks, dims=1))
+        y_avg = diff(x_dec) ./ m
         var_classical = var(y_avg; corrected=false)
         
     elseif lowercase(data_type) == "freq"
@@ -177,9 +252,7 @@ function noise_id_b1rn(x_full::Vector{T}, m::Int, data_type::String) where T<:Re
         if N < 2*m
             return (NaN, NaN, NaN)
         end
-        x = reshape(x_full[1:N], m, :)
-        y_avg = vec(mean(x, dims=1))
-        y_avg = detrend_linear(y_avg)
+        y_avg = detrend!(vec(mean(reshape(view(x_full, 1:N), m, :), dims=1)), 1)
         dy = diff(y_avg)
         var_classical = var(y_avg; corrected=false)
         avar_val = sum(dy .^ 2) / (2 * (length(y_avg) - 1))
@@ -214,9 +287,7 @@ function noise_id_b1rn(x_full::Vector{T}, m::Int, data_type::String) where T<:Re
     
     # Refine α = 2 vs 1 using R(n) when needed (FLPM vs WHPM)
     if mu_best == -2 && lowercase(data_type) == "phase"
-        adev_val = sqrt(avar_val)
-        mdev_val = simple_mdev(x_full, tau, 1.0)
-        Rn_obs = (mdev_val / adev_val)^2
+        Rn_obs = simple_mvar(x_full, m) / avar_val
         R_hi = rn_theory(m, 0)   # α = 2 (WHPM)
         R_lo = rn_theory(m, -1)  # α = 1 (FLPM)
         if Rn_obs > sqrt(R_hi * R_lo)
@@ -272,16 +343,14 @@ end
 
 Simple Allan variance calculation without noise identification.
 """
-function simple_avar(x::Vector{T}, m::Int) where T<:Real
-    N = length(x)
-    L = N - 2*m + 1
+function simple_avar(x::AbstractVector{T}, m::Int) where T<:Real
+    L = length(x) - 2*m
     if L <= 0
         return NaN
     end
     
     # Second differences: x(n+2m) - 2x(n+m) + x(n)
-    d2 = x[1+2*m:N] - 2*x[1+m:N-m] + x[1:L]
-    return mean(d2.^2) / (2 * m^2)
+    return adev_sumsq(x, m) / L / (2 * m^2)
 end
 
 """
@@ -289,42 +358,29 @@ end
 
 Simple Modified Allan deviation without calling full mdev function.
 """
-function simple_mdev(x::Vector{T}, m::Int, tau0::Real) where T<:Real
-    N = length(x)
-    L = N - 3*m + 1
+function simple_mdev(x::AbstractVector{T}, m::Int, tau0::Real) where T<:Real
+    L = length(x) - 3*m + 1
     if L <= 0
         return NaN
     end
     
-    # Moving averages via cumulative sum
-    S = cumsum([0; x])  # Prefix sum
-    s1 = S[1+m:L+m]     - S[1:L]
-    s2 = S[1+2*m:L+2*m] - S[1+m:L+m] 
-    s3 = S[1+3*m:L+3*m] - S[1+2*m:L+2*m]
-    d = s3 - 2*s2 + s1
-    
-    mvar = mean(d.^2) / (2 * m^2 * tau0^2)
+    # Second differences of m-point window sums, carried forward in one pass
+    mvar = mdev_sumsq(x, m) / L / (2 * m^2 * tau0^2)
     return sqrt(mvar)
 end
 
 """
-    detrend_quadratic(x)
+    simple_mvar(x, m)
 
-Remove quadratic trend from data (for phase data).
+Modified Allan variance at τ = m (τ₀ = 1), on the scale of
+`simple_avar(x, m)`. Unlike [`simple_mdev`](@ref), the window sums are
+normalized to window means, so the ratio to AVAR is the R(n) of SP1065.
 """
-function detrend_quadratic(x::Vector{T}) where T<:Real
-    N = length(x)
-    if N < 3
-        return x
+function simple_mvar(x::AbstractVector{T}, m::Int) where T<:Real
+    L = length(x) - 3*m + 1
+    if L <= 0
+        return NaN
     end
     
-    # Design matrix for quadratic fit: [1, t, t²]
-    t = collect(1:N)
-    A = hcat(ones(N), t, t.^2)
-    
-    # Least squares fit and removal
-    coeffs = A \ x
-    trend = A * coeffs
-    
-    return x - trend
-end
\ No newline at end of file
+    return mdev_sumsq(x, m) / L / (2 * m^4)
+end
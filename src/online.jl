@@ -0,0 +1,288 @@
+# Online (streaming) accumulators for live clock monitoring
+#
+# Each accumulator keeps the last few max(m) phase samples in a ring buffer
+# and, per averaging factor, the running sum of squared differences. A new
+# sample costs O(length(mlist)) and memory stays O(max(mlist)) no matter how
+# long the stream runs. `DeviationResult(acc)` gives the same values as the
+# batch function on all samples pushed so far.
+
+"""
+    PhaseRing(capacity)
+
+Fixed-size ring buffer of the most recent phase samples, indexed by absolute
+sample number (1 = first sample ever pushed).
+"""
+mutable struct PhaseRing
+    data::Vector{Float64}
+    count::Int
+end
+
+PhaseRing(capacity::Int) = PhaseRing(zeros(capacity), 0)
+
+@inline Base.getindex(r::PhaseRing, n::Int) = @inbounds r.data[mod1(n, length(r.data))]
+
+function Base.push!(r::PhaseRing, x::Real)
+    if !isfinite(x)
+        throw(ArgumentError("Phase data must be finite"))
+    end
+    r.count += 1
+    @inbounds r.data[mod1(r.count, length(r.data))] = x
+    return r
+end
+
+function validate_online_mlist(mlist::AbstractVector{Int})
+    if isempty(mlist) || any(<(1), mlist)
+        throw(ArgumentError("mlist must contain positive averaging factors"))
+    end
+    return collect(mlist)
+end
+
+"""
+    OnlineADEV(tau0, mlist)
+
+Streaming overlapping Allan deviation. Feed phase samples with `push!` or
+`append!`; `DeviationResult(acc)` returns the current ADEV in O(length(mlist)).
+
+Keeps the last 2·max(m)+1 samples and one running Σ(x[n] - 2x[n-m] + x[n-2m])²
+per m.
+
+# Example
+```julia
+acc = OnlineADEV(1.0, [1, 2, 4, 8, 16])
+for x in phase_stream
+    push!(acc, x)
+end
+result = DeviationResult(acc)
+```
+"""
+mutable struct OnlineADEV
+    tau0::Float64
+    mlist::Vector{Int}
+    ring::PhaseRing
+    sumsq::Vector{Float64}
+end
+
+function OnlineADEV(tau0::Real, mlist::AbstractVector{Int})
+    mlist = validate_online_mlist(mlist)
+    return OnlineADEV(validate_tau0(tau0), mlist, PhaseRing(2*maximum(mlist) + 1),
+                      zeros(length(mlist)))
+end
+
+function Base.push!(acc::OnlineADEV, x::Real)
+    r = push!(acc.ring, x)
+    n = r.count
+    for (k, m) in enumerate(acc.mlist)
+        if n > 2*m
+            d2 = r[n] - 2*r[n-m] + r[n-2*m]
+            acc.sumsq[k] += d2 * d2
+        end
+    end
+    return acc
+end
+
+function DeviationResult(acc::OnlineADEV)
+    N = acc.ring.count
+    neff = [max(N - 2*m, 0) for m in acc.mlist]
+    tau = acc.mlist .* acc.tau0
+    dev = [L > 0 ? sqrt(s / L / (2 * m^2 * acc.tau0^2)) : NaN
+           for (s, L, m) in zip(acc.sumsq, neff, acc.mlist)]
+    return online_result(acc, tau, dev, neff, "adev")
+end
+
+"""
+    OnlineMDEV(tau0, mlist)
+
+Streaming modified Allan deviation. Besides the squared sums it keeps, per m,
+the window sum D of the last m second differences, which slides by one term
+per sample. D is rebuilt from the ring buffer once every m samples so that
+rounding cannot build up over an unbounded stream (O(1) amortized per m).
+Keeps the last 3·max(m)+1 samples.
+"""
+mutable struct OnlineMDEV
+    tau0::Float64
+    mlist::Vector{Int}
+    ring::PhaseRing
+    window::Vector{Float64}
+    sumsq::Vector{Float64}
+end
+
+function OnlineMDEV(tau0::Real, mlist::AbstractVector{Int})
+    mlist = validate_online_mlist(mlist)
+    return OnlineMDEV(validate_tau0(tau0), mlist, PhaseRing(3*maximum(mlist) + 1),
+                      zeros(length(mlist)), zeros(length(mlist)))
+end
+
+function Base.push!(acc::OnlineMDEV, x::Real)
+    r = push!(acc.ring, x)
+    n = r.count
+    for (k, m) in enumerate(acc.mlist)
+        n > 2*m || continue
+        # Newest second difference starts at n-2m; the window covers the
+        # last m of them, i.e. starts n-3m+1 .. n-2m
+        if n >= 3*m && (n - 3*m) % m == 0
+            D = 0.0
+            for i in n-3*m+1:n-2*m
+                D += r[i+2*m] - 2*r[i+m] + r[i]
+            end
+            acc.window[k] = D
+        else
+            acc.window[k] += r[n] - 2*r[n-m] + r[n-2*m]
+            if n > 3*m
+                acc.window[k] -= r[n-m] - 2*r[n-2*m] + r[n-3*m]
+            end
+        end
+        if n >= 3*m
+            acc.sumsq[k] += acc.window[k]^2
+        end
+    end
+    return acc
+end
+
+function DeviationResult(acc::OnlineMDEV)
+    N = acc.ring.count
+    neff = [max(N - 3*m + 1, 0) for m in acc.mlist]
+    tau = acc.mlist .* acc.tau0
+    dev = [n > 0 ? sqrt(s / m^2 / n / (2 * m^2 * acc.tau0^2)) : NaN
+           for (s, n, m) in zip(acc.sumsq, neff, acc.mlist)]
+    return online_result(acc, tau, dev, neff, "mdev")
+end
+
+"""
+    OnlineHDEV(tau0, mlist)
+
+Streaming overlapping Hadamard deviation: one running
+Σ(x[n] - 3x[n-m] + 3x[n-2m] - x[n-3m])² per m over the last 3·max(m)+1 samples.
+"""
+mutable struct OnlineHDEV
+    tau0::Float64
+    mlist::Vector{Int}
+    ring::PhaseRing
+    sumsq::Vector{Float64}
+end
+
+function OnlineHDEV(tau0::Real, mlist::AbstractVector{Int})
+    mlist = validate_online_mlist(mlist)
+    return OnlineHDEV(validate_tau0(tau0), mlist, PhaseRing(3*maximum(mlist) + 1),
+                      zeros(length(mlist)))
+end
+
+function Base.push!(acc::OnlineHDEV, x::Real)
+    r = push!(acc.ring, x)
+    n = r.count
+    for (k, m) in enumerate(acc.mlist)
+        if n > 3*m
+            d3 = r[n] - 3*r[n-m] + 3*r[n-2*m] - r[n-3*m]
+            acc.sumsq[k] += d3 * d3
+        end
+    end
+    return acc
+end
+
+function DeviationResult(acc::OnlineHDEV)
+    N = acc.ring.count
+    neff = [max(N - 3*m, 0) for m in acc.mlist]
+    tau = acc.mlist .* acc.tau0
+    dev = [L > 0 ? sqrt(s / L / (6 * t^2)) : NaN
+           for (s, L, t) in zip(acc.sumsq, neff, tau)]
+    return online_result(acc, tau, dev, neff, "hdev")
+end
+
+"""
+    OnlineTDEV(tau0, mlist)
+
+Streaming time deviation, TDEV = τ·MDEV/√3, on top of an [`OnlineMDEV`](@ref).
+"""
+struct OnlineTDEV
+    mdev::OnlineMDEV
+end
+
+OnlineTDEV(tau0::Real, mlist::AbstractVector{Int}) = OnlineTDEV(OnlineMDEV(tau0, mlist))
+
+Base.push!(acc::OnlineTDEV, x::Real) = (push!(acc.mdev, x); acc)
+
+function DeviationResult(acc::OnlineTDEV)
+    r = DeviationResult(acc.mdev)
+    return DeviationResult(r.tau, r.tau .* r.deviation ./ sqrt(3), r.edf, r.ci, r.alpha,
+                           r.neff, r.tau0, r.N, "tdev", r.confidence)
+end
+
+const OnlineAccumulator = Union{OnlineADEV,OnlineMDEV,OnlineHDEV,OnlineTDEV}
+
+function Base.append!(acc::OnlineAccumulator, xs::AbstractVector{<:Real})
+    for x in xs
+        push!(acc, x)
+    end
+    return acc
+end
+
+# White FM is assumed (as with noise=:skip); EDF and CI via compute_ci()
+function online_result(acc, tau, dev, neff, method)
+    n = length(tau)
+    return DeviationResult(collect(Float64, tau), dev, fill(NaN, n), fill(NaN, n, 2),
+                           fill(0, n), neff, acc.tau0, acc.ring.count, method, 0.683)
+end
+
+# -------------------- Resumable batch results --------------------
+
+"""
+    resume_state(acc, x, sums)
+
+Load an empty accumulator with the state it would hold after `append!(acc, x)`:
+the trailing samples of `x` and the batch kernel sums `sums` (one per m, as
+computed by `adev_sumsq`, `mdev_sumsq` or `hdev_sumsq`). The MDEV window sums
+are rebuilt from the last m second differences, O(max m) in total.
+"""
+function resume_state(acc::Union{OnlineADEV,OnlineMDEV,OnlineHDEV}, x::AbstractVector, sums::AbstractVector)
+    r = acc.ring
+    N = length(x)
+    for n in max(1, N - length(r.data) + 1):N
+        r.data[mod1(n, length(r.data))] = x[n]
+    end
+    r.count = N
+    acc.sumsq .= sums
+    if acc isa OnlineMDEV
+        for (k, m) in enumerate(acc.mlist)
+            D = 0.0
+            for i in max(1, N - 3*m + 1):N - 2*m
+                D += x[i+2*m] - 2*x[i+m] + x[i]
+            end
+            acc.window[k] = D
+        end
+    end
+    return acc
+end
+
+online_method(::OnlineADEV) = "adev"
+online_method(::OnlineMDEV) = "mdev"
+online_method(::OnlineHDEV) = "hdev"
+
+"""
+    update(result, state, new_samples)
+
+Extend a result computed with `return_state=true` by phase samples appended to
+the end of the record. Costs O(length(new_samples) × length(mlist)) instead of
+a full recompute; `state` is advanced in place and the new result keeps the
+noise exponents (`alpha`) and confidence level of `result`.
+
+# Returns
+`(result, state)` for the extended record, equal to the full recompute up to
+floating-point summation order.
+
+# Example
+```julia
+result, state = adev(phase_data, 1.0, return_state=true)
+result, state = update(result, state, new_phase)
+```
+"""
+function update(result::DeviationResult, state::Union{OnlineADEV,OnlineMDEV,OnlineHDEV},
+                new_samples::AbstractVector{<:Real})
+    if result.method != online_method(state) || result.N != state.ring.count ||
+       result.tau != eltype(result.tau).(state.mlist .* state.tau0)
+        throw(ArgumentError("state does not belong to this $(result.method) result"))
+    end
+    append!(state, new_samples)
+    r = DeviationResult(state)
+    updated = typeof(result)(r.tau, r.deviation, r.edf, r.ci, result.alpha, r.neff,
+                             r.tau0, r.N, r.method, result.confidence)
+    return updated, state
+end
@@ -0,0 +1,103 @@
+# Opt-in multithreading for a single series (`threaded=true`)
+#
+# Two levels of parallelism, both reproducible whatever the thread count:
+# - τ values are handed to one worker task per thread from a shared counter,
+#   largest m first, so the costly large-m total deviations start early and
+#   the short ones fill in behind them; each worker owns its scratch space;
+# - within a τ, the index range is cut into blocks whose layout depends only
+#   on the series length and m. Block partial sums are stored per block and
+#   added in block order, so threading changes the schedule but not a single
+#   floating-point operation.
+
+# Positions per partial sum of a threaded reduction (at least 4m, so that
+# forming the MDEV/MHDEV window at each block start stays cheap)
+const REDUCE_BLOCK = 1 << 16
+
+"""
+    blocked_sumsq(kernel, x, m, n; threaded=true)
+
+`kernel(x, m, positions)` summed over positions 1..n in blocks of
+max(`REDUCE_BLOCK`, 4m). With `threaded` the blocks run as tasks; the partial
+sums are added in block order either way. A series short enough for a single
+block gives exactly the serial kernel result.
+"""
+function blocked_sumsq(kernel, x::AbstractVector{T}, m::Int, n::Int;
+                       threaded::Bool=true) where T<:Real
+    S = accumulation_type(T)
+    n < 1 && return zero(S)
+    B = max(REDUCE_BLOCK, 4*m)
+    blocks = [lo:min(lo + B - 1, n) for lo in 1:B:n]
+    partials = zeros(S, length(blocks))
+    if threaded && length(blocks) > 1
+        @sync for b in eachindex(blocks)
+            Threads.@spawn partials[b] = kernel(x, m, blocks[b])
+        end
+    else
+        for b in eachindex(blocks)
+            partials[b] = kernel(x, m, blocks[b])
+        end
+    end
+    return sum(partials)
+end
+
+"""
+    work_queue(f, items, make_workspace; threaded=true)
+
+Call `f(item, ws)` for every item. With `threaded`, one worker per thread takes
+the next item, in the given order, from a shared counter and owns its scratch
+space `ws = make_workspace()`; otherwise a single workspace serves every item.
+f must write its output by item and not depend on the workspace contents, so
+the outcome does not depend on which worker ran an item.
+"""
+function work_queue(f, items::AbstractVector, make_workspace; threaded::Bool=true)
+    if !threaded || Threads.nthreads() == 1 || length(items) < 2
+        ws = make_workspace()
+        for item in items
+            f(item, ws)
+        end
+        return nothing
+    end
+    next = Threads.Atomic{Int}(1)
+    @sync for _ in 1:min(Threads.nthreads(), length(items))
+        Threads.@spawn begin
+            ws = make_workspace()
+            while true
+                i = Threads.atomic_add!(next, 1)
+                i > length(items) && break
+                f(items[i], ws)
+            end
+        end
+    end
+    return nothing
+end
+
+"""
+    tau_map(f, S, mlist, make_workspace; threaded=true)
+
+`[f(m, ws) for m in mlist]` as a `Vector{S}`. With `threaded`, the τ values go
+through a [`work_queue`](@ref), largest m first, each worker calling f with
+its own `ws = make_workspace()`. Each τ is computed by exactly one worker and
+f must not depend on the workspace contents, so the output is the same as the
+serial loop.
+"""
+function tau_map(f, ::Type{S}, mlist::AbstractVector{Int}, make_workspace;
+                 threaded::Bool=true) where S
+    out = zeros(S, length(mlist))
+    order = threaded ? sortperm(mlist, rev=true) : collect(eachindex(mlist))
+    work_queue(order, make_workspace; threaded=threaded) do k, ws
+        out[k] = f(mlist[k], ws)
+    end
+    return out
+end
+
+"""
+    threaded_sumsq(kernel, x, mlist, count)
+
+Raw kernel sums for every m of `mlist` over positions 1..count(m), with τ
+spread over threads and each τ reduced in fixed blocks ([`blocked_sumsq`](@ref)).
+"""
+function threaded_sumsq(kernel, x::AbstractVector{T}, mlist::AbstractVector{Int}, count) where T<:Real
+    return tau_map(accumulation_type(T), mlist, () -> nothing) do m, _
+        blocked_sumsq(kernel, x, m, count(m))
+    end
+end
@@ -0,0 +1,247 @@
+# Memory-mapped binary phase files and chunked out-of-core deviations
+#
+# Layout (little-endian), a 64-byte header followed by the raw samples:
+#
+#   bytes  1-8   magic "STABPHS1"
+#          9-12  format version (UInt32)
+#         13-16  bytes per sample: 4 = Float32, 8 = Float64 (UInt32)
+#         17-24  number of samples N (Int64)
+#         25-32  tau0 in seconds (Float64)
+#         33-40  scale: stored value × scale = phase in seconds (Float64)
+#         41-48  start time, e.g. MJD of the first sample (Float64)
+#         49-64  reserved (zero)
+
+const PHASEFILE_MAGIC = b"STABPHS1"
+const PHASEFILE_VERSION = UInt32(1)
+const PHASEFILE_HEADER = 64
+
+# Samples per chunk handed to the kernels (512 KiB of Float64, fits in L2)
+const PHASEFILE_CHUNK = 65536
+
+"""
+    PhaseFile{T}
+
+An open binary phase file. `data` is the memory-mapped sample vector as stored
+(no copy); multiply by `scale` to get seconds. Create with
+[`write_phase_file`](@ref), open with [`open_phase_file`](@ref).
+
+# Fields
+- `path::String`: File path
+- `tau0::Float64`: Sampling interval (seconds)
+- `scale::Float64`: Factor converting stored values to seconds
+- `start_time::Float64`: Time stamp of the first sample
+- `data::Vector{T}`: Memory-mapped samples (`Float32` or `Float64`)
+"""
+struct PhaseFile{T<:Union{Float32,Float64}}
+    path::String
+    tau0::Float64
+    scale::Float64
+    start_time::Float64
+    data::Vector{T}
+end
+
+Base.length(pf::PhaseFile) = length(pf.data)
+
+"""
+    write_phase_file(path, phase_data; tau0=1.0, scale=1.0, start_time=0.0, dtype=Float64)
+
+Write phase samples to the binary format read by [`open_phase_file`](@ref).
+Values are stored as given (converted to `dtype`) together with `scale`, so
+`write_phase_file("clk.phs", phase_ns, scale=1e-9)` keeps nanosecond data
+without rescaling it.
+"""
+function write_phase_file(path::AbstractString, phase_data::AbstractVector{<:Real};
+                          tau0::Real=1.0, scale::Real=1.0, start_time::Real=0.0,
+                          dtype::Type{T}=Float64) where T<:Union{Float32,Float64}
+    validate_tau0(tau0)
+    if !(scale > 0 && isfinite(scale))
+        throw(ArgumentError("scale must be positive and finite"))
+    end
+    open(path, "w") do io
+        write(io, PHASEFILE_MAGIC)
+        write(io, htol(PHASEFILE_VERSION), htol(UInt32(sizeof(T))))
+        write(io, htol(Int64(length(phase_data))))
+        write(io, htol(Float64(tau0)), htol(Float64(scale)), htol(Float64(start_time)))
+        write(io, zeros(UInt8, PHASEFILE_HEADER - position(io)))
+        buf = Vector{T}(undef, min(PHASEFILE_CHUNK, length(phase_data)))
+        for a in 1:PHASEFILE_CHUNK:length(phase_data)
+            b = min(a + PHASEFILE_CHUNK - 1, length(phase_data))
+            chunk = resize!(buf, b - a + 1)
+            chunk .= htol.(T.(view(phase_data, a:b)))
+            write(io, chunk)
+        end
+    end
+    return path
+end
+
+"""
+    open_phase_file(path)
+
+Open a binary phase file written by [`write_phase_file`](@ref). The samples are
+memory-mapped read-only, so opening is O(1) whatever the record length.
+"""
+function open_phase_file(path::AbstractString)
+    open(path, "r") do io
+        if filesize(io) < PHASEFILE_HEADER || read(io, 8) != PHASEFILE_MAGIC
+            throw(ArgumentError("$path is not a StabLab phase file"))
+        end
+        version = ltoh(read(io, UInt32))
+        width = ltoh(read(io, UInt32))
+        if version != PHASEFILE_VERSION
+            throw(ArgumentError("Unsupported phase file version $version"))
+        end
+        T = width == 4 ? Float32 : width == 8 ? Float64 :
+            throw(ArgumentError("Unsupported sample width $width bytes"))
+        N = ltoh(read(io, Int64))
+        tau0, scale, start_time = (ltoh(read(io, Float64)) for _ in 1:3)
+        if filesize(io) < PHASEFILE_HEADER + N * sizeof(T)
+            throw(ArgumentError("$path is truncated: header declares $N samples"))
+        end
+        ENDIAN_BOM == 0x04030201 ||
+            throw(ArgumentError("Memory-mapped phase files need a little-endian host"))
+        data = Mmap.mmap(io, Vector{T}, N, PHASEFILE_HEADER)
+        return PhaseFile{T}(String(path), tau0, scale, start_time, data)
+    end
+end
+
+"""
+    load_chunk!(buf, pf, a, len)
+
+Copy samples a .. a+len-1 of `pf` into `buf` (resized to `len`) in seconds,
+rejecting non-finite values like `validate_phase_data`.
+"""
+function load_chunk!(buf::Vector{Float64}, pf::PhaseFile, a::Int, len::Int)
+    resize!(buf, len)
+    @inbounds for i in 1:len
+        buf[i] = pf.data[a+i-1] * pf.scale
+    end
+    if !all(isfinite, buf)
+        throw(ArgumentError("Phase data must be finite"))
+    end
+    return buf
+end
+
+"""
+    chunked_sumsq(kernel, pf, m, nterms; chunk=PHASEFILE_CHUNK)
+
+Add up `kernel(pf.data, m, positions)` over the starting positions 1..nterms in
+blocks of max(chunk, m), and convert the result to seconds² with `pf.scale^2`.
+The kernels read the memory-mapped samples in place, each tap (offsets 0, m,
+2m, ...) streaming through its own block-sized window of `pf.data`, so no copy
+of the record or of a halo is made and heap use does not grow with m.
+Blocks are at least m long so that the windowed MDEV/MHDEV kernels, which form
+their first moving sum directly, do at most twice the work of a single pass.
+"""
+function chunked_sumsq(kernel, pf::PhaseFile, m::Int, nterms::Int; chunk::Int=PHASEFILE_CHUNK)
+    block = max(chunk, m)
+    total = 0.0
+    for a in 1:block:nterms
+        total += kernel(pf.data, m, a:min(a + block - 1, nterms))
+    end
+    return total * pf.scale^2
+end
+
+"""
+    trend_fit(pf::PhaseFile, degree; chunk=PHASEFILE_CHUNK)
+
+Least-squares polynomial of `degree` (1 or 2) through the phase in seconds,
+from one pass over the memory-mapped samples in chunks of `chunk`. Chunks
+read later are detrended with `detrend!(buf, fit; offset=a-1)` for a chunk
+starting at sample a.
+"""
+function trend_fit(pf::PhaseFile, degree::Int; chunk::Int=PHASEFILE_CHUNK)
+    if chunk < 1
+        throw(ArgumentError("chunk must be positive"))
+    end
+    N = length(pf)
+    sums = TrendSums{Float64}(N)
+    buf = Vector{Float64}(undef, chunk)
+    for a in 1:chunk:N
+        append!(sums, load_chunk!(buf, pf, a, min(chunk, N - a + 1)))
+    end
+    return trend_fit(sums, degree)
+end
+
+# Kernel and reach (samples past the last starting position) of each deviation
+# supported on phase files
+function phase_file_term(method::AbstractString, x, m::Int, positions::UnitRange{Int})
+    method == "mhdev" ? mhdev_window_sumsq(x, m, positions) :
+    method == "adev" ? adev_sumsq(x, m, positions) :
+    method == "hdev" ? hdev_sumsq(x, m, positions) : mdev_sumsq(x, m, positions)
+end
+
+function phase_file_halo(method::AbstractString, m::Int)
+    method == "adev" ? 2*m :
+    method == "hdev" ? 3*m :
+    method == "mhdev" ? 5*m - 2 : 3*m - 1  # mdev, tdev
+end
+
+"""
+    phase_file_deviation(pf, method; mlist=nothing, confidence=0.683, noise=:skip, chunk=PHASEFILE_CHUNK)
+
+Compute "adev", "mdev", "hdev", "mhdev" or "tdev" from a [`PhaseFile`](@ref)
+without loading the record. The fused kernels run on the memory-mapped
+samples directly, in blocks of max(`chunk`, m) starting positions (see
+[`chunked_sumsq`](@ref)); nothing is copied, so heap use is O(1) and the
+resident pages are the block windows at each tap. The deviation methods
+`adev(pf)`, `mdev(pf)`, ... call this. `noise` accepts `:skip` or precomputed α
+values; `:auto` would need the whole record in memory.
+"""
+function phase_file_deviation(pf::PhaseFile, method::AbstractString;
+                              mlist::Union{Nothing,AbstractVector{Int}}=nothing,
+                              confidence::Real=0.683,
+                              noise::Union{Symbol,AbstractVector{<:Real}}=:skip,
+                              chunk::Int=PHASEFILE_CHUNK)
+    if !(method in ("adev", "mdev", "hdev", "mhdev", "tdev"))
+        throw(ArgumentError("Unsupported method \"$method\" for phase files"))
+    end
+    if noise === :auto
+        throw(ArgumentError("noise=:auto needs the record in memory; pass :skip or α values"))
+    end
+    if chunk < 1
+        throw(ArgumentError("chunk must be positive"))
+    end
+    if !all(isfinite, pf.data)
+        throw(ArgumentError("Phase data must be finite"))
+    end
+    N = length(pf)
+    tau0 = pf.tau0
+    mlist = mlist === nothing ? suite_default_mlist(method, N) : mlist
+    alpha = resolve_noise(Float64[], mlist, noise)
+
+    tau = mlist .* tau0
+    dev = fill(NaN, length(mlist))
+    neff = fill(0, length(mlist))
+    for (k, m) in enumerate(mlist)
+        # As in-memory mhdev, neff counts the third differences, which exist
+        # at m where no m-point average of them fits (the deviation is NaN)
+        method == "mhdev" && (neff[k] = max(N - 4*m + 1, 0))
+        nterms = N - phase_file_halo(method, m)
+        nterms > 0 || continue
+        sumsq = chunked_sumsq((x, m, pos) -> phase_file_term(method, x, m, pos), pf, m, nterms;
+                              chunk=chunk)
+        if method == "adev"
+            neff[k] = N - 2*m
+            dev[k] = sqrt(sumsq / neff[k] / (2 * m^2 * tau0^2))
+        elseif method == "hdev"
+            neff[k] = N - 3*m
+            dev[k] = sqrt(sumsq / neff[k] / (6 * tau[k]^2))
+        elseif method == "mhdev"
+            dev[k] = sqrt(sumsq / nterms / (6 * m^2)) / tau[k]
+        else
+            neff[k] = N - 3*m + 1
+            dev[k] = sqrt(sumsq / m^2 / neff[k] / (2 * m^2 * tau0^2))
+            method == "tdev" && (dev[k] *= tau[k] / sqrt(3))
+        end
+    end
+
+    n = length(mlist)
+    return DeviationResult(collect(Float64, tau), dev, fill(NaN, n), fill(NaN, n, 2), alpha,
+                           neff, tau0, N, String(method), Float64(confidence))
+end
+
+adev(pf::PhaseFile; kwargs...) = phase_file_deviation(pf, "adev"; kwargs...)
+mdev(pf::PhaseFile; kwargs...) = phase_file_deviation(pf, "mdev"; kwargs...)
+hdev(pf::PhaseFile; kwargs...) = phase_file_deviation(pf, "hdev"; kwargs...)
+mhdev(pf::PhaseFile; kwargs...) = phase_file_deviation(pf, "mhdev"; kwargs...)
+tdev(pf::PhaseFile; kwargs...) = phase_file_deviation(pf, "tdev"; kwargs...)
@@ -0,0 +1,226 @@
+# Reusable analysis plans: everything that depends only on N, τ₀ and the τ grid
+#
+# A plan fixes the τ grid, neff, normalization constants and (optionally) the
+# EDF and confidence-interval factors of each method, and owns the result
+# vectors. `execute!` then runs one fused kernel pass per distinct m and writes
+# the deviations into those vectors without allocating, so many series of the
+# same length can be analysed without GC pressure.
+
+# Deviation types a plan can execute without allocating
+const PLAN_METHODS = ["adev", "mdev", "hdev", "mhdev", "tdev", "ldev", "totdev"]
+
+# Which kernel sum each method reads (row of StabilityPlan.sums)
+const PLAN_SOURCE = Dict("adev" => 1, "hdev" => 2, "mdev" => 3, "tdev" => 3,
+                         "mhdev" => 4, "ldev" => 4, "totdev" => 5)
+
+"""
+    PlanEntry
+
+One method of a [`StabilityPlan`](@ref): deviation[k] = √(sums[source, mindex[k]] · scale[k]),
+with the confidence interval taken as deviation[k] times the columns of `ci_factor`.
+"""
+struct PlanEntry
+    method::String
+    source::Int
+    mindex::Vector{Int}
+    scale::Vector{Float64}
+    ci_factor::Matrix{Float64}
+    result::DeviationResult{Float64}
+end
+
+"""
+    StabilityPlan
+
+Precomputed τ grids, normalization constants and result buffers for
+[`execute!`](@ref); build with [`stability_plan`](@ref).
+
+# Fields
+- `N::Int`: Series length the plan accepts
+- `tau0::Float64`: Sampling interval (seconds)
+- `m::Vector{Int}`: Distinct averaging factors over all methods
+- `sums::Matrix{Float64}`: Kernel sums per m (ADEV, HDEV, MDEV, MHDEV, TOTDEV)
+- `need_tail::Bool`: Whether the TOTDEV end reflection is required
+- `entries::Vector{PlanEntry}`: Per-method constants and result
+- `results::Dict{String,DeviationResult{Float64}}`: Results filled by `execute!`
+"""
+struct StabilityPlan
+    N::Int
+    tau0::Float64
+    m::Vector{Int}
+    sums::Matrix{Float64}
+    need_tail::Bool
+    entries::Vector{PlanEntry}
+    results::Dict{String,DeviationResult{Float64}}
+end
+
+"""
+    plan_scale(method, m, N, tau0)
+
+Normalization constant and neff of `method` at averaging factor m, such that
+the deviation is √(kernel sum · scale). Returns `(NaN, 0)` when τ does not fit.
+"""
+function plan_scale(method::AbstractString, m::Int, N::Int, tau0::Float64)
+    tau = m * tau0
+    if method == "adev"
+        L = N - 2*m
+        L > 0 && return 1 / (L * 2 * m^2 * tau0^2), L
+    elseif method in ("mdev", "tdev")
+        n = N - 3*m + 1
+        if n > 0
+            scale = 1 / m^2 / n / (2 * m^2 * tau0^2)
+            return method == "tdev" ? scale * tau^2 / 3 : scale, n
+        end
+    elseif method == "hdev"
+        L = N - 3*m
+        L > 0 && return 1 / (L * 6 * tau^2), L
+    elseif method in ("mhdev", "ldev")
+        n = N - 4*m + 1
+        if n > 0
+            n_avg = N - 5*m + 2
+            scale = n_avg > 0 ? 1 / (n_avg * 6 * m^2 * tau^2) : NaN
+            return method == "ldev" ? scale * tau^2 * 3 / 10 : scale, n
+        end
+    elseif method == "totdev"
+        n_d2 = min(3*N - 2*m - 4, N - m)
+        n_d2 >= 1 && return 1 / (2 * (N - 2) * tau^2), n_d2
+    end
+    return NaN, 0
+end
+
+"""
+    stability_plan(N, tau0, methods=["adev", "mdev", "hdev", "mhdev"];
+                   mlist=nothing, confidence=0.683, noise=:skip, ci=false)
+
+Precompute everything `execute!` needs to analyse series of length `N`.
+
+τ grids, neff and normalization constants depend only on N, τ₀ and the
+averaging factors, so they are derived once here. With `ci=true` the EDF and
+the confidence-interval factors are tabulated as well; they depend on the
+noise exponents, which must therefore be fixed in advance (`noise=:skip` or a
+vector of α per m; `:auto` would need the data). The result vectors are
+allocated here and overwritten by every `execute!`.
+
+# Arguments
+- `N`: Length of every series the plan will be executed on
+- `tau0`: Sampling interval (seconds)
+- `methods`: Any of "adev", "mdev", "hdev", "mhdev", "tdev", "ldev", "totdev"
+- `mlist`: Averaging factors for every method (default: each method's own default)
+- `confidence`: Confidence level for the tabulated intervals (default: 0.683)
+- `noise`: `:skip` (White FM) or α per m of `mlist` (or of the sorted union of the defaults)
+- `ci`: Tabulate EDF and fill confidence intervals in `execute!` (default: false)
+
+# Example
+```julia
+plan = stability_plan(86400, 1.0, ["adev", "mdev"], ci=true)
+for x in series
+    results = execute!(plan, x)   # no allocations
+    process(results["adev"])
+end
+```
+"""
+function stability_plan(N::Int, tau0::Real,
+                        methods::AbstractVector{<:AbstractString}=["adev", "mdev", "hdev", "mhdev"];
+                        mlist::Union{Nothing,AbstractVector{Int}}=nothing,
+                        confidence::Real=0.683,
+                        noise::Union{Symbol,AbstractVector{<:Real}}=:skip,
+                        ci::Bool=false)
+    if N < 2
+        throw(ArgumentError("Phase data must have at least 2 points"))
+    end
+    tau0 = Float64(validate_tau0(tau0))
+    for method in methods
+        if !(method in PLAN_METHODS)
+            throw(ArgumentError("Unknown plan method \"$method\"; expected one of $(join(PLAN_METHODS, ", "))"))
+        end
+    end
+    if !allunique(methods)
+        throw(ArgumentError("Each method may appear only once in a plan"))
+    end
+    if noise === :auto
+        throw(ArgumentError("noise=:auto depends on the data; pass :skip or precomputed α values"))
+    end
+
+    mlists = Dict(method => (mlist === nothing ? suite_default_mlist(method, N) : collect(mlist))
+                  for method in methods)
+    # TOTDEV drops τ that do not fit, as the individual call does
+    if haskey(mlists, "totdev")
+        mlists["totdev"] = filter(m -> last(plan_scale("totdev", m, N, tau0)) >= 1, mlists["totdev"])
+    end
+    all_m = sort!(unique(reduce(vcat, values(mlists); init=Int[])))
+    if any(<(1), all_m)
+        throw(ArgumentError("Averaging factors must be positive"))
+    end
+
+    noise_m = mlist === nothing ? all_m : collect(mlist)
+    alpha_of = Dict(zip(noise_m, resolve_noise(Float64[], noise_m, noise)))
+    column = Dict(m => j for (j, m) in enumerate(all_m))
+
+    entries = PlanEntry[]
+    results = Dict{String,DeviationResult{Float64}}()
+    for method in methods
+        ms = mlists[method]
+        n = length(ms)
+        scales = [plan_scale(method, m, N, tau0) for m in ms]
+        result = DeviationResult{Float64}(
+            ms .* tau0, fill(NaN, n), fill(NaN, n), fill(NaN, n, 2),
+            [alpha_of[m] for m in ms], [last(s) for s in scales],
+            tau0, N, method, confidence
+        )
+        ci_factor = zeros(0, 2)
+        if ci
+            # Every interval of compute_ci is proportional to the deviation
+            unit = compute_ci(DeviationResult{Float64}(
+                result.tau, ones(n), fill(NaN, n), fill(NaN, n, 2),
+                result.alpha, result.neff, tau0, N, method, confidence), confidence)
+            result.edf .= unit.edf
+            ci_factor = unit.ci
+        end
+        push!(entries, PlanEntry(method, PLAN_SOURCE[method], [column[m] for m in ms],
+                                 [first(s) for s in scales], ci_factor, result))
+        results[method] = result
+    end
+
+    return StabilityPlan(N, tau0, all_m, zeros(5, length(all_m)),
+                         haskey(mlists, "totdev"), entries, results)
+end
+
+"""
+    execute!(plan, x)
+
+Compute every deviation of `plan` for the phase series `x` (length `plan.N`)
+and return `plan.results`. The kernel sums are formed once per distinct m and
+the results are written in place, so the call does not allocate; the returned
+`DeviationResult`s are overwritten by the next `execute!` on the same plan
+(copy them to keep them).
+"""
+function execute!(plan::StabilityPlan, x::AbstractVector{<:Real})
+    if length(x) != plan.N
+        throw(ArgumentError("Plan expects $(plan.N) samples, got $(length(x))"))
+    end
+    validate_phase_data(x)
+
+    sums = plan.sums
+    for (j, m) in enumerate(plan.m)
+        s = allan_family_sumsq(x, m)
+        sums[1, j] = s.adev
+        sums[2, j] = s.hdev
+        sums[3, j] = s.mdev
+        sums[4, j] = s.mhdev
+        sums[5, j] = plan.need_tail && m < plan.N ? s.adev + totdev_tail_sumsq(x, m) : 0.0
+    end
+
+    for entry in plan.entries
+        dev = entry.result.deviation
+        ci = entry.result.ci
+        @inbounds for k in eachindex(dev)
+            dev[k] = sqrt(sums[entry.source, entry.mindex[k]] * entry.scale[k])
+        end
+        if !isempty(entry.ci_factor)
+            @inbounds for k in eachindex(dev)
+                ci[k, 1] = dev[k] * entry.ci_factor[k, 1]
+                ci[k, 2] = dev[k] * entry.ci_factor[k, 2]
+            end
+        end
+    end
+    return plan.results
+end
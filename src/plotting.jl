@@ -49,7 +49,9 @@ function stabplot(result::DeviationResult;
     if ylabel == ""
         method_map = Dict(
             "adev" => "Allan Deviation σ_y(τ)",
+            "adev_decimated" => "Allan Deviation σ_y(τ)",
             "mdev" => "Modified Allan Deviation σ_y(τ)",
+            "mdev_strided" => "Modified Allan Deviation σ_y(τ)",
             "hdev" => "Hadamard Deviation σ_y(τ)", 
             "mhdev" => "Modified Hadamard Deviation σ_y(τ)",
             "tdev" => "Time Deviation σ_x(τ) (s)",
@@ -162,37 +164,28 @@ function print_results_table(result::DeviationResult)
 end
 
 """
-    load_phase_data(filename::String; tau0::Float64=1.0, scale::Float64=1e-9)
+    load_phase_data(filename::String; tau0::Float64=1.0, scale::Float64=1e-9, verbose::Bool=false)
 
 Load phase data from a text file.
 
 # Arguments
-- `filename`: Path to data file
+- `filename`: Path to data file (1 or 2 columns, ".gz" files are decompressed)
 - `tau0`: Sampling interval in seconds (default: 1.0)
 - `scale`: Scale factor to convert data units (default: 1e-9 for ns to s)
+- `verbose`: Print the sample count and data range (default: false)
 
 # Returns
 Vector of phase data in seconds
 """
-function load_phase_data(filename::String; tau0::Float64=1.0, scale::Float64=1e-9)
+function load_phase_data(filename::String; tau0::Float64=1.0, scale::Float64=1e-9,
+                         verbose::Bool=false)
     try
-        # Try to read as two-column format (timestamp, phase)
-        data = readdlm(filename, Float64)
-        if size(data, 2) == 2
-            # Use second column (phase data)
-            phase_data = data[:, 2] .* scale
+        phase_data = read_phase_data(filename, scale=scale)
+        if verbose
             println("Loaded $(length(phase_data)) phase samples from $filename")
             println("Data range: $(round(minimum(phase_data)*1e9, digits=1)) to $(round(maximum(phase_data)*1e9, digits=1)) ns")
-            return phase_data
-        elseif size(data, 2) == 1
-            # Single column of phase data
-            phase_data = data[:, 1] .* scale  
-            println("Loaded $(length(phase_data)) phase samples from $filename")
-            println("Data range: $(round(minimum(phase_data)*1e9, digits=1)) to $(round(maximum(phase_data)*1e9, digits=1)) ns")
-            return phase_data
-        else
-            error("Unsupported data format: expected 1 or 2 columns, got $(size(data, 2))")
         end
+        return phase_data
     catch e
         error("Failed to load data from $filename: $e")
     end
@@ -227,22 +220,16 @@ function stability_report(phase_data, tau0; methods=["adev"], save_path=nothing)
     results = Dict()
     plots_array = []
     
+    # All supported deviations come from one shared pass per τ
+    supported = [method for method in methods if method in SUITE_METHODS]
+    computed = stability_suite(phase_data, tau0, methods=supported)
+    
     for method in methods
         println("\nAnalyzing $method...")
         
         # Compute deviation
-        if method == "adev"
-            result = adev(phase_data, tau0)
-        elseif method == "mdev"
-            result = mdev(phase_data, tau0)
-        elseif method == "hdev"
-            result = hdev(phase_data, tau0)
-        elseif method == "mhdev"
-            result = mhdev(phase_data, tau0)
-        elseif method == "tdev"
-            result = tdev(phase_data, tau0)
-        elseif method == "ldev"
-            result = ldev(phase_data, tau0)
+        if haskey(computed, method)
+            result = computed[method]
         else
             println("Warning: Method $method not implemented, skipping")
             continue
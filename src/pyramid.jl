@@ -0,0 +1,401 @@
+# Multi-resolution decimation pyramid for large-τ queries
+#
+# Level k summarizes the record in blocks of g = 2^k samples: the first
+# sample of every block (x[1:g:end]), and the sum, maximum and minimum of
+# every complete block. Each level is built from the one below, so the whole
+# pyramid costs O(N) time and about 4N values of memory. A query at m uses
+# the coarsest level whose block size g divides m and touches O(N/g) values,
+# i.e. O(N/m) for the usual octave grid.
+#
+# File layout (little-endian) of a stored pyramid, a 32-byte header followed
+# by the levels k = 1..K in order:
+#
+#   bytes  1-8   magic "STABPYR1"
+#          9-12  format version (UInt32)
+#         13-16  bytes per sample of the data: 4 = Float32, 8 = Float64 (UInt32)
+#         17-24  number of samples N (Int64)
+#         25-32  number of levels K (Int64)
+#   level k: heads (cld(N, 2^k) samples), maxima, minima (N ÷ 2^k samples
+#            each) and block sums (N ÷ 2^k Float64)
+
+const PYRAMID_MAGIC = b"STABPYR1"
+const PYRAMID_VERSION = UInt32(1)
+
+"""
+    PhasePyramid{T}
+
+Decimation pyramid over a phase record, built by [`phase_pyramid`](@ref).
+Values are kept in the storage units of `data`; multiply by `scale` for seconds.
+
+# Fields
+- `data::Vector{T}`: The phase samples (level 0), possibly memory-mapped
+- `scale::Float64`: Factor converting stored values to seconds
+- `heads::Vector{Vector{T}}`: `heads[k] == data[1:2^k:end]`
+- `sums::Vector{Vector{Float64}}`: Sums of the complete blocks of 2^k samples
+- `maxs::Vector{Vector{T}}`: Block maxima
+- `mins::Vector{Vector{T}}`: Block minima
+
+`adev(pyr, tau0)` (non-overlapping, method `"adev_decimated"`), `mdev(pyr, tau0)`
+(windows every 2^k samples, method `"mdev_strided"`), `mtie(pyr, tau0)` and
+`noise_id(pyr, m_list)` answer queries from the levels.
+"""
+struct PhasePyramid{T<:Union{Float32,Float64}}
+    data::Vector{T}
+    scale::Float64
+    heads::Vector{Vector{T}}
+    sums::Vector{Vector{Float64}}
+    maxs::Vector{Vector{T}}
+    mins::Vector{Vector{T}}
+end
+
+Base.length(pyr::PhasePyramid) = length(pyr.data)
+
+pyramid_levels(pyr::PhasePyramid) = length(pyr.heads)
+
+"""
+    phase_pyramid(phase_data; scale=1.0)
+    phase_pyramid(pf::PhaseFile; cache=true)
+
+Build the decimation pyramid of a phase record in O(N). For a
+[`PhaseFile`](@ref) the pyramid is stored next to the data as `pf.path * ".pyr"`
+and loaded from there when it is newer than the phase file (`cache=false`
+always rebuilds and writes nothing).
+
+# Example
+```julia
+pyr = phase_pyramid(phase_data)
+mdev(pyr, 1e-3, mlist=[2^k for k in 10:20])   # O(N/m) per τ
+```
+"""
+function phase_pyramid(phase_data::AbstractVector{<:Real}; scale::Real=1.0)
+    data = phase_data isa Union{Vector{Float32},Vector{Float64}} ? phase_data :
+           Vector{Float64}(phase_data)
+    validate_phase_data(data)
+    if !(scale > 0 && isfinite(scale))
+        throw(ArgumentError("scale must be positive and finite"))
+    end
+    return build_pyramid(data, Float64(scale))
+end
+
+function build_pyramid(data::Vector{T}, scale::Float64) where T
+    N = length(data)
+    if N < 2
+        throw(ArgumentError("Phase data must have at least 2 points"))
+    end
+    K = floor(Int, log2(N))
+    heads = Vector{Vector{T}}(undef, K)
+    sums = Vector{Vector{Float64}}(undef, K)
+    maxs = Vector{Vector{T}}(undef, K)
+    mins = Vector{Vector{T}}(undef, K)
+    prev_heads, prev_sums, prev_maxs, prev_mins = data, data, data, data
+    for k in 1:K
+        nb = N >> k
+        h = Vector{T}(undef, cld(N, 1 << k))
+        s = Vector{Float64}(undef, nb)
+        hi = Vector{T}(undef, nb)
+        lo = Vector{T}(undef, nb)
+        @inbounds for j in eachindex(h)
+            h[j] = prev_heads[2j-1]
+        end
+        @inbounds for j in 1:nb
+            s[j] = Float64(prev_sums[2j-1]) + Float64(prev_sums[2j])
+            hi[j] = max(prev_maxs[2j-1], prev_maxs[2j])
+            lo[j] = min(prev_mins[2j-1], prev_mins[2j])
+        end
+        heads[k], sums[k], maxs[k], mins[k] = h, s, hi, lo
+        prev_heads, prev_sums, prev_maxs, prev_mins = h, s, hi, lo
+    end
+    return PhasePyramid{T}(data, scale, heads, sums, maxs, mins)
+end
+
+function phase_pyramid(pf::PhaseFile; cache::Bool=true)
+    path = pf.path * ".pyr"
+    if cache && isfile(path) && mtime(path) >= mtime(pf.path)
+        try
+            return read_pyramid(path, pf.data; scale=pf.scale)
+        catch err
+            err isa ArgumentError || rethrow()  # stale or foreign file: rebuild
+        end
+    end
+    validate_phase_data(pf.data)
+    pyr = build_pyramid(pf.data, pf.scale)
+    cache && write_pyramid(path, pyr)
+    return pyr
+end
+
+"""
+    write_pyramid(path, pyr)
+
+Store the levels of `pyr` (not the data itself) in the format read by
+[`read_pyramid`](@ref).
+"""
+function write_pyramid(path::AbstractString, pyr::PhasePyramid{T}) where T
+    open(path, "w") do io
+        write(io, PYRAMID_MAGIC)
+        write(io, htol(PYRAMID_VERSION), htol(UInt32(sizeof(T))))
+        write(io, htol(Int64(length(pyr))), htol(Int64(pyramid_levels(pyr))))
+        for k in 1:pyramid_levels(pyr)
+            write(io, htol.(pyr.heads[k]), htol.(pyr.maxs[k]), htol.(pyr.mins[k]), htol.(pyr.sums[k]))
+        end
+    end
+    return path
+end
+
+"""
+    read_pyramid(path, data; scale=1.0)
+
+Load a pyramid written by [`write_pyramid`](@ref) for the samples `data` it was
+built from. The header must match the length and sample type of `data`.
+"""
+function read_pyramid(path::AbstractString, data::Vector{T}; scale::Real=1.0) where T<:Union{Float32,Float64}
+    open(path, "r") do io
+        if filesize(io) < 32 || read(io, 8) != PYRAMID_MAGIC
+            throw(ArgumentError("$path is not a StabLab pyramid file"))
+        end
+        version = ltoh(read(io, UInt32))
+        width = ltoh(read(io, UInt32))
+        N = ltoh(read(io, Int64))
+        K = ltoh(read(io, Int64))
+        if version != PYRAMID_VERSION
+            throw(ArgumentError("Unsupported pyramid file version $version"))
+        end
+        if width != sizeof(T) || N != length(data) || K != floor(Int, log2(max(N, 1)))
+            throw(ArgumentError("$path does not belong to this record ($N samples of $width bytes)"))
+        end
+        expected = 32 + sum(cld(N, 1 << k) * sizeof(T) + (N >> k) * (2 * sizeof(T) + 8) for k in 1:K; init=0)
+        if filesize(io) != expected
+            throw(ArgumentError("$path is truncated or corrupt"))
+        end
+        heads = Vector{Vector{T}}(undef, K)
+        maxs = Vector{Vector{T}}(undef, K)
+        mins = Vector{Vector{T}}(undef, K)
+        sums = Vector{Vector{Float64}}(undef, K)
+        for k in 1:K
+            heads[k] = ltoh.(read!(io, Vector{T}(undef, cld(N, 1 << k))))
+            maxs[k] = ltoh.(read!(io, Vector{T}(undef, N >> k)))
+            mins[k] = ltoh.(read!(io, Vector{T}(undef, N >> k)))
+            sums[k] = ltoh.(read!(io, Vector{Float64}(undef, N >> k)))
+        end
+        return PhasePyramid{T}(data, Float64(scale), heads, sums, maxs, mins)
+    end
+end
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+# Coarsest level whose block size 2^k divides m
+pyramid_level(pyr::PhasePyramid, m::Int) = min(trailing_zeros(m), pyramid_levels(pyr))
+
+level_heads(pyr::PhasePyramid, k::Int) = k == 0 ? pyr.data : pyr.heads[k]
+level_sums(pyr::PhasePyramid, k::Int) = k == 0 ? pyr.data : pyr.sums[k]
+
+"""
+    decimated(pyr, m)
+
+The decimated phase x[1:m:end] in seconds, read from the coarsest level whose
+block size divides m in O(N/m) for powers of two.
+"""
+function decimated(pyr::PhasePyramid, m::Int)
+    k = pyramid_level(pyr, m)
+    return level_heads(pyr, k)[1:(m >> k):end] .* pyr.scale
+end
+
+# noise=:auto runs noise_id on the pyramid itself
+function pyramid_noise(pyr::PhasePyramid, mlist::AbstractVector{Int}, noise)
+    if noise === :auto
+        return [isnan(a) ? 0 : round(Int, a) for a in noise_id(pyr, collect(Int, mlist))]
+    end
+    return resolve_noise(Float64[], mlist, noise)
+end
+
+"""
+    adev(pyr::PhasePyramid, tau0; mlist=nothing, confidence=0.683, noise=:skip)
+
+Non-overlapping Allan deviation from the second differences of the decimated
+phase x[1:m:end], in O(N/m) per τ for powers of two. The result is tagged
+`"adev_decimated"` so that [`compute_ci`](@ref) uses the EDF of this
+estimator (stride m) rather than that of the overlapping `adev`.
+"""
+function adev(pyr::PhasePyramid, tau0::Real;
+              mlist::Union{Nothing,AbstractVector{Int}}=nothing,
+              confidence::Real=0.683,
+              noise::Union{Symbol,AbstractVector{<:Real}}=:skip)
+    tau0 = validate_tau0(tau0)
+    N = length(pyr)
+    mlist = mlist === nothing ? default_m_list(N) : mlist
+    alpha = pyramid_noise(pyr, mlist, noise)
+
+    tau = mlist .* tau0
+    dev = fill(NaN, length(mlist))
+    neff = fill(0, length(mlist))
+    for (k, m) in enumerate(mlist)
+        lvl = pyramid_level(pyr, m)
+        x_dec = view(level_heads(pyr, lvl), 1:(m >> lvl):length(level_heads(pyr, lvl)))
+        L = length(x_dec) - 2
+        L > 0 || continue
+        neff[k] = L
+        dev[k] = sqrt(adev_sumsq(x_dec, 1) / L / (2 * tau[k]^2)) * pyr.scale
+    end
+
+    n = length(mlist)
+    return DeviationResult(collect(Float64, tau), dev, fill(NaN, n), fill(NaN, n, 2), alpha,
+                           neff, Float64(tau0), N, "adev_decimated", Float64(confidence))
+end
+
+"""
+    mdev(pyr::PhasePyramid, tau0; mlist=nothing, confidence=0.683, noise=:skip)
+
+Modified Allan deviation from the block sums of the pyramid. With g the
+largest power of two dividing m, the MDEV windows are taken every g samples
+instead of at every sample: each window sum is c = m/g consecutive block sums,
+so a τ costs O(N/g), O(N/m) for the octave grid. This is the same estimator
+with fewer (for m = 2^k, non-overlapping) terms; `neff` is the number used.
+The result is tagged `"mdev_strided"`, whose EDF [`compute_ci`](@ref) takes
+for windows every g samples instead of the fully overlapping MDEV.
+"""
+function mdev(pyr::PhasePyramid, tau0::Real;
+              mlist::Union{Nothing,AbstractVector{Int}}=nothing,
+              confidence::Real=0.683,
+              noise::Union{Symbol,AbstractVector{<:Real}}=:skip)
+    tau0 = validate_tau0(tau0)
+    N = length(pyr)
+    mlist = mlist === nothing ? suite_default_mlist("mdev", N) : mlist
+    alpha = pyramid_noise(pyr, mlist, noise)
+
+    tau = mlist .* tau0
+    dev = fill(NaN, length(mlist))
+    neff = fill(0, length(mlist))
+    for (k, m) in enumerate(mlist)
+        lvl = pyramid_level(pyr, m)
+        B = level_sums(pyr, lvl)
+        c = m >> lvl
+        n = length(B) - 3*c + 1
+        n > 0 || continue
+        neff[k] = n
+        # The window second differences of the block sums are the MDEV D terms
+        sumsq = mdev_sumsq(B, c) * pyr.scale^2
+        dev[k] = sqrt(sumsq / m^2 / n / (2 * m^2 * tau0^2))
+    end
+
+    n = length(mlist)
+    return DeviationResult(collect(Float64, tau), dev, fill(NaN, n), fill(NaN, n, 2), alpha,
+                           neff, Float64(tau0), N, "mdev_strided", Float64(confidence))
+end
+
+"""
+    pyramid_window_range(pyr, w, qmax, qmin)
+
+Largest max - min over all windows of `w` consecutive samples (stored units),
+exactly, from the block extremes of the level with block size g ≤ w/2.
+
+Any ⌊w/g⌋ consecutive blocks lie inside some window, which gives a lower
+bound; the blocks reached by the windows starting in block j give an upper
+bound for those windows. Only blocks whose upper bound beats the lower bound
+are scanned sample by sample, O(g + w) each; if that would cost more than a
+full pass the whole record is scanned instead.
+"""
+function pyramid_window_range(pyr::PhasePyramid{T}, w::Int,
+                              qmax::Vector{Int}, qmin::Vector{Int}) where T
+    N = length(pyr)
+    k = w >= 4 ? min(floor(Int, log2(w ÷ 2)), pyramid_levels(pyr)) : 0
+    k == 0 && return window_range_max!(qmax, qmin, pyr.data, w)
+    g = 1 << k
+
+    # Block extremes, including the incomplete block at the end
+    tail = (N >> k) * g + 1 : N
+    bmax = isempty(tail) ? pyr.maxs[k] : [pyr.maxs[k]; maximum(view(pyr.data, tail))]
+    bmin = isempty(tail) ? pyr.mins[k] : [pyr.mins[k]; minimum(view(pyr.data, tail))]
+    nb = length(bmax)
+    block_range(a, b) = maximum(view(bmax, a:b)) - minimum(view(bmin, a:b))
+
+    inside = w ÷ g            # whole blocks always covered by one window
+    reach = (w - 2) ÷ g + 1   # further blocks reached from a start in block j
+    lower = zero(T)
+    for j in 1:nb-inside+1
+        lower = max(lower, block_range(j, j + inside - 1))
+    end
+
+    candidates = Int[]
+    for j in 1:nb
+        (j - 1) * g + 1 > N - w + 1 && break
+        block_range(j, min(j + reach, nb)) > lower && push!(candidates, j)
+    end
+    if length(candidates) * (g + w) > N
+        return window_range_max!(qmax, qmin, pyr.data, w)
+    end
+
+    best = lower
+    for j in candidates
+        segment = (j - 1) * g + 1 : min(N, j * g + w - 1)
+        best = max(best, window_range_max!(qmax, qmin, view(pyr.data, segment), w))
+    end
+    return best
+end
+
+"""
+    mtie(pyr::PhasePyramid, tau0=1.0; m_list=nothing, confidence=0.683)
+
+Maximum time interval error from the pyramid's block extremes. The result is
+exact (identical to `mtie` on the data); bounds from the level with blocks of
+about τ/4 to τ/2 leave only the few regions that can hold the worst window to
+be scanned sample by sample, so a large τ typically costs O(N/m + m).
+"""
+function mtie(pyr::PhasePyramid, tau0::Real=1.0;
+              m_list::Union{Nothing,Vector{Int}}=nothing,
+              confidence::Real=0.683)
+    N = length(pyr)
+    m_list = m_list === nothing ? default_m_list(N) : m_list
+    n_taus = length(m_list)
+    tau = m_list .* Float64(tau0)
+    deviation = fill(NaN, n_taus)
+    neff = zeros(Int, n_taus)
+    qmax = Vector{Int}(undef, N)
+    qmin = Vector{Int}(undef, N)
+
+    for (idx, m) in enumerate(m_list)
+        # Windows of m+1 samples, N - m positions (as in mtie)
+        window_size = m + 1
+        if N - m < 1 || window_size > N
+            continue
+        end
+        deviation[idx] = pyramid_window_range(pyr, window_size, qmax, qmin) * pyr.scale
+        neff[idx] = N - m
+    end
+
+    return DeviationResult(tau, deviation, fill(NaN, n_taus), fill(NaN, n_taus, 2),
+                           fill(-2, n_taus), neff, Float64(tau0), N, "mtie", Float64(confidence))
+end
+
+"""
+    noise_id(pyr::PhasePyramid, m_list, dmin=0, dmax=2)
+
+`noise_id` for phase data with the decimation x[1:m:end] read from the
+pyramid. Where the lag-1 ACF method applies (N/m ≥ 30) only the decimated
+series is touched: the outlier screen and linear detrend of `preprocess_x`
+run on it instead of the full record, which gives the same α for records
+without 5σ outliers. Larger m fall back to the B1/R(n) test on the full
+preprocessed record, as `noise_id` does.
+"""
+function noise_id(pyr::PhasePyramid, m_list::Vector{Int}, dmin::Int=0, dmax::Int=2)
+    alpha_list = fill(NaN, length(m_list))
+    x_clean = nothing
+
+    for (k, m) in enumerate(m_list)
+        try
+            if length(pyr) ÷ m >= 30
+                x_dec = preprocess_x(decimated(pyr, m))
+                alpha, _, _, _ = noise_id_lag1acf(x_dec, 1, "phase", dmin, dmax)
+            else
+                x_clean = x_clean === nothing ? preprocess_x(pyr.data .* pyr.scale) : x_clean
+                alpha, _, _ = noise_id_b1rn(x_clean, m, "phase")
+            end
+            alpha_list[k] = round(Int, alpha)
+        catch err
+            @warn "Noise ID failed for m = $m: $(err)"
+            alpha_list[k] = NaN
+        end
+    end
+
+    return alpha_list
+end
@@ -0,0 +1,220 @@
+# Fast text/CSV/gzip phase-file reader
+#
+# Accepts one value per line or two columns (timestamp, phase) separated by
+# spaces, tabs or commas. Blank lines and lines starting with '#' or '%' are
+# skipped, like validation/generate_real_data_reference.py. Files ending in
+# ".gz" are decompressed on the fly. Large inputs are split at line breaks and
+# parsed on all threads; `phase_chunks` parses block by block in a background
+# task so a deviation engine can consume samples while the rest is being read.
+
+# Bytes read per block by phase_chunks
+const READER_BLOCK = 1 << 22
+
+# Below this many bytes a text block is parsed on the calling thread
+const READER_THREAD_MIN_BYTES = 1 << 20
+
+isfieldsep(c::UInt8) = c == UInt8(' ') || c == UInt8('\t') || c == UInt8(',') || c == UInt8('\r')
+iscomment(c::UInt8) = c == UInt8('#') || c == UInt8('%')
+
+"""
+    open_text_stream(filename)
+
+Open a phase text file for reading, wrapping ".gz" files in a gzip decoder.
+"""
+function open_text_stream(filename::AbstractString)
+    io = open(filename, "r")
+    return endswith(filename, ".gz") ? GzipDecompressorStream(io) : io
+end
+
+"""
+    count_fields(s, lo, hi)
+
+Number of fields on the line occupying bytes lo..hi of `s`; 0 for blank and
+comment lines.
+"""
+function count_fields(s::String, lo::Int, hi::Int)
+    cu = codeunits(s)
+    n = 0
+    i = lo
+    @inbounds while i <= hi
+        while i <= hi && isfieldsep(cu[i])
+            i += 1
+        end
+        i > hi && break
+        n == 0 && iscomment(cu[i]) && return 0
+        n += 1
+        while i <= hi && !isfieldsep(cu[i])
+            i += 1
+        end
+    end
+    return n
+end
+
+"""
+    detect_columns(s)
+
+Column count (1 or 2) of the first data line in `s`, or 0 if `s` holds no data.
+"""
+function detect_columns(s::String)
+    cu = codeunits(s)
+    i = 1
+    while i <= length(cu)
+        j = something(findnext(==(UInt8('\n')), cu, i), length(cu) + 1)
+        n = count_fields(s, i, j - 1)
+        if n > 0
+            if n > 2
+                throw(ArgumentError("Unsupported data format: expected 1 or 2 columns, got $n"))
+            end
+            return n
+        end
+        i = j + 1
+    end
+    return 0
+end
+
+"""
+    parse_phase_lines!(out, s, lo, hi, ncols)
+
+Append the last of `ncols` fields of every data line in bytes lo..hi of `s`
+to `out`. Lines with a different number of fields raise an ArgumentError.
+"""
+function parse_phase_lines!(out::Vector{Float64}, s::String, lo::Int, hi::Int, ncols::Int)
+    cu = codeunits(s)
+    i = lo
+    @inbounds while i <= hi
+        eol = min(something(findnext(==(UInt8('\n')), cu, i), hi + 1), hi + 1)
+        n = 0
+        value = NaN
+        k = i
+        while k < eol
+            while k < eol && isfieldsep(cu[k])
+                k += 1
+            end
+            k == eol && break
+            n == 0 && iscomment(cu[k]) && break
+            start = k
+            while k < eol && !isfieldsep(cu[k])
+                k += 1
+            end
+            n += 1
+            if n == ncols
+                parsed = tryparse(Float64, SubString(s, start, k - 1))
+                parsed === nothing &&
+                    throw(ArgumentError("Cannot parse \"$(SubString(s, start, k - 1))\" as a number"))
+                value = parsed
+            end
+        end
+        if n > 0
+            n == ncols || throw(ArgumentError("Expected $ncols columns on every line, got $n"))
+            push!(out, value)
+        end
+        i = eol + 1
+    end
+    return out
+end
+
+"""
+    parse_phase_text(s, ncols; threaded=Threads.nthreads() > 1)
+
+Parse all data lines of `s`. With `threaded`, the text is cut at line breaks
+into one piece per thread, the pieces are parsed concurrently and the results
+concatenated in file order.
+"""
+function parse_phase_text(s::String, ncols::Int; threaded::Bool=Threads.nthreads() > 1)
+    len = ncodeunits(s)
+    if !threaded || len < READER_THREAD_MIN_BYTES
+        return parse_phase_lines!(Float64[], s, 1, len, ncols)
+    end
+    cu = codeunits(s)
+    nt = Threads.nthreads()
+    starts = [1]
+    for t in 1:nt-1
+        nl = findnext(==(UInt8('\n')), cu, max(t * len ÷ nt, last(starts)))
+        nl === nothing && break
+        nl + 1 > last(starts) && push!(starts, nl + 1)
+    end
+    push!(starts, len + 1)
+    tasks = [Threads.@spawn parse_phase_lines!(Float64[], s, starts[p], starts[p+1] - 1, ncols)
+             for p in 1:length(starts)-1]
+    return reduce(vcat, fetch.(tasks))
+end
+
+"""
+    read_phase_data(filename; scale=1.0, threaded=Threads.nthreads() > 1)
+
+Read phase samples from a 1-column or 2-column (timestamp, phase) text or CSV
+file, optionally gzip-compressed (".gz"). Comment lines starting with '#' or
+'%' are skipped. The text is parsed in parallel chunks across threads.
+
+# Returns
+`Vector{Float64}` of the phase column multiplied by `scale`.
+
+# Example
+```julia
+x = read_phase_data("clock.txt.gz", scale=1e-9)  # ns → s
+```
+"""
+function read_phase_data(filename::AbstractString; scale::Real=1.0,
+                         threaded::Bool=Threads.nthreads() > 1)
+    io = open_text_stream(filename)
+    s = try
+        String(read(io))
+    finally
+        close(io)
+    end
+    ncols = detect_columns(s)
+    if ncols == 0
+        throw(ArgumentError("No phase data found in $filename"))
+    end
+    x = parse_phase_text(s, ncols; threaded=threaded)
+    x .*= scale
+    return x
+end
+
+"""
+    phase_chunks(filename; scale=1.0, block_bytes=READER_BLOCK)
+
+Iterate over the phase samples of a text, CSV or ".gz" file in blocks of
+about `block_bytes` of text. A background task reads and parses the next
+blocks while the caller works on the current one, so parsing overlaps with
+computation and only a few blocks are held in memory.
+
+# Example
+```julia
+acc = OnlineADEV(1.0, [1, 10, 100, 1000])
+for chunk in phase_chunks("clock.txt.gz", scale=1e-9)
+    append!(acc, chunk)
+end
+result = DeviationResult(acc)
+```
+"""
+function phase_chunks(filename::AbstractString; scale::Real=1.0, block_bytes::Int=READER_BLOCK)
+    if block_bytes < 1
+        throw(ArgumentError("block_bytes must be positive"))
+    end
+    return Channel{Vector{Float64}}(2; spawn=true) do ch
+        io = open_text_stream(filename)
+        try
+            carry = UInt8[]
+            ncols = 0
+            while true
+                append!(carry, read(io, block_bytes))
+                done = eof(io)
+                cut = done ? length(carry) : something(findlast(==(UInt8('\n')), carry), 0)
+                if cut > 0
+                    s = String(carry[1:cut])
+                    carry = carry[cut+1:end]
+                    ncols == 0 && (ncols = detect_columns(s))
+                    if ncols > 0
+                        x = parse_phase_text(s, ncols)
+                        x .*= scale
+                        isempty(x) || put!(ch, x)
+                    end
+                end
+                done && break
+            end
+        finally
+            close(io)
+        end
+    end
+end
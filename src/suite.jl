@@ -0,0 +1,174 @@
+# Multi-statistic engine: several deviations from one pass per averaging factor
+
+# Deviation types understood by stability_suite
+const SUITE_METHODS = ["adev", "mdev", "hdev", "mhdev", "tdev", "ldev",
+                       "totdev", "mtotdev", "htotdev", "mhtotdev"]
+
+"""
+    suite_default_mlist(method, N)
+
+Default averaging factors of each deviation function, so that
+`stability_suite` reports the same τ grid as the individual calls.
+"""
+function suite_default_mlist(method::AbstractString, N::Int)
+    if method in ("adev", "totdev")
+        return default_m_list(N)
+    elseif method in ("mdev", "tdev", "mtotdev")
+        return [2^k for k in 0:floor(Int, log2(N/3))]
+    elseif method == "htotdev"
+        return [2^k for k in 0:floor(Int, log2((N-1)/3))]
+    else  # hdev, mhdev, ldev, mhtotdev
+        return [2^k for k in 0:floor(Int, log2(N/4))]
+    end
+end
+
+"""
+    stability_suite(phase_data, tau0; methods=["adev", "mdev", "hdev", "mhdev"],
+                    mlist=nothing, confidence=0.683, noise=:skip)
+
+Compute several deviations in one traversal of the data per averaging factor.
+
+The data are validated once, noise identification runs at most once, and for
+each m the second and third differences and the MDEV/MHDEV window sums are
+produced by a single fused pass (`allan_family_sumsq`) shared by ADEV, MDEV,
+HDEV, MHDEV, TDEV, LDEV and TOTDEV. TDEV and LDEV are scaled from the shared
+MDEV/MHDEV sums instead of recomputing them, the total deviations reuse one
+reflected-subsequence workspace, and HTOTDEV's frequency series is formed once.
+
+# Arguments
+- `phase_data`: Phase data vector (seconds)
+- `tau0`: Sampling interval (seconds)
+- `methods`: Any of "adev", "mdev", "hdev", "mhdev", "tdev", "ldev", "totdev",
+  "mtotdev", "htotdev", "mhtotdev"
+- `mlist`: Averaging factors for every method (default: each method's own default)
+- `confidence`: Confidence level stored in the results (default: 0.683)
+- `noise`: `:skip` (default), `:auto` (one `noise_id` call for all methods), or
+  precomputed α per m of `mlist` (or of the sorted union of the defaults)
+
+# Returns
+`Dict` mapping each method name to the `DeviationResult` the individual
+function would return, up to floating-point rounding.
+
+# Example
+```julia
+results = stability_suite(phase_data, 1.0, methods=["adev", "mdev", "tdev", "totdev"])
+results["tdev"].deviation
+```
+"""
+function stability_suite(phase_data::AbstractVector{T}, tau0::Real;
+                         methods::AbstractVector{<:AbstractString}=["adev", "mdev", "hdev", "mhdev"],
+                         mlist::Union{Nothing,AbstractVector{Int}}=nothing,
+                         confidence::Real=0.683,
+                         noise::Union{Symbol,AbstractVector{<:Real}}=:skip) where T<:Real
+
+    # Validate inputs once for all methods
+    x = validate_phase_data(phase_data)
+    tau0 = validate_tau0(tau0)
+    N = length(x)
+    for method in methods
+        if !(method in SUITE_METHODS)
+            throw(ArgumentError("Unknown method \"$method\"; expected one of $(join(SUITE_METHODS, ", "))"))
+        end
+    end
+
+    mlists = Dict(method => (mlist === nothing ? suite_default_mlist(method, N) : collect(mlist))
+                  for method in methods)
+    all_m = sort!(unique(reduce(vcat, values(mlists); init=Int[])))
+
+    # Noise identification once, looked up per method
+    noise_m = mlist === nothing ? all_m : collect(mlist)
+    alpha_of = Dict(zip(noise_m, resolve_noise(x, noise_m, noise)))
+
+    # Per-method outputs, filled τ by τ
+    vals = Dict(method => fill(NaN, length(mlists[method])) for method in methods)
+    neffs = Dict(method => fill(0, length(mlists[method])) for method in methods)
+    valid = Dict(method => falses(length(mlists[method])) for method in methods)
+
+    family = ("adev", "mdev", "hdev", "mhdev", "tdev", "ldev", "totdev")
+    need_family = any(in(family), methods) || "htotdev" in methods
+    y = "htotdev" in methods ? diff(x) ./ tau0 : x
+    Ny = length(y)
+    ws = ReflectedWorkspace{accumulation_type(T)}()
+
+    for m in all_m
+        tau = m * tau0
+        sums = need_family ? allan_family_sumsq(x, m) : nothing
+
+        for method in methods, k in findall(==(m), mlists[method])
+            dev, neff, ok = NaN, 0, false
+            if method == "adev"
+                L = N - 2*m
+                if L > 0
+                    dev, neff, ok = sqrt(sums.adev / L / (2 * m^2 * tau0^2)), L, true
+                end
+            elseif method in ("mdev", "tdev")
+                n = N - 3*m + 1
+                if n > 0
+                    dev, neff, ok = sqrt(sums.mdev / m^2 / n / (2 * m^2 * tau0^2)), n, true
+                    method == "tdev" && (dev *= tau / sqrt(3))
+                end
+            elseif method == "hdev"
+                L = N - 3*m
+                if L > 0
+                    dev, neff, ok = sqrt(sums.hdev / L / (6 * tau^2)), L, true
+                end
+            elseif method in ("mhdev", "ldev")
+                n = N - 4*m + 1
+                if n > 0
+                    n_avg = N - 5*m + 2
+                    dev = n_avg > 0 ? sqrt(sums.mhdev / n_avg / (6 * m^2)) / tau : NaN
+                    neff, ok = n, true
+                    method == "ldev" && (dev *= tau / sqrt(10/3))
+                end
+            elseif method == "totdev"
+                n_d2 = min(3*N - 2*m - 4, N - m)
+                if n_d2 >= 1
+                    D = sums.adev + totdev_tail_sumsq(x, m)
+                    dev, neff, ok = sqrt(D / (2 * (N - 2) * tau^2)), n_d2, true
+                end
+            elseif method == "mtotdev"
+                nsubs = N - 3*m + 1
+                if nsubs >= 1
+                    sumsq = mtotdev_sumsq!(ws, x, m)
+                    dev, neff, ok = sqrt(sumsq / m^2 / (6*m) / (2 * tau^2 * nsubs)), nsubs, true
+                end
+            elseif method == "htotdev"
+                if m == 1
+                    L = N - 3
+                    dev, ok = L > 0 ? sqrt(sums.hdev / L / (6 * tau0^2)) : NaN, true
+                else
+                    n_iterations = Ny - 3*m + 1
+                    if n_iterations >= 1
+                        sumsq = htotdev_sumsq!(ws, y, m)
+                        dev = sqrt(sumsq / m^2 / (6*m) / (6 * n_iterations))
+                        neff, ok = n_iterations, true
+                    end
+                end
+            elseif method == "mhtotdev"
+                nsubs = N - 4*m + 1
+                if nsubs >= 1
+                    sumsq = mhtotdev_sumsq!(ws, x, m)
+                    dev = sqrt(sumsq / (5*m + 4) / (6 * m^2) / nsubs) / tau
+                    neff, ok = nsubs, true
+                end
+            end
+            vals[method][k] = dev
+            neffs[method][k] = neff
+            valid[method][k] = ok
+        end
+    end
+
+    # Assemble one result per method; the total deviations drop invalid τ
+    results = Dict{String,DeviationResult}()
+    for method in methods
+        ms = mlists[method]
+        keep = method in ("totdev", "mtotdev", "htotdev", "mhtotdev") ? valid[method] : trues(length(ms))
+        n = count(keep)
+        results[method] = DeviationResult{float(T)}(
+            ms[keep] .* tau0, vals[method][keep], fill(NaN, n), fill(NaN, n, 2),
+            [alpha_of[m] for m in ms[keep]], neffs[method][keep],
+            tau0, N, method, confidence
+        )
+    end
+    return results
+end
@@ -72,6 +72,117 @@ function tie(data::Vector{T}, tau0::Real=1.0;
                           T(tau0), N, "tie", confidence)
 end
 
+"""
+    window_range_max!(qmax, qmin, data, w)
+
+Largest max - min over all windows of `w` consecutive samples, using
+monotonic deques of indices. Every index enters and leaves each deque once,
+so the pass is O(N) for any input. `qmax` and `qmin` need `length(data)`
+slots and are overwritten.
+"""
+function window_range_max!(qmax::Vector{Int}, qmin::Vector{Int},
+                           data::AbstractVector{T}, w::Int) where T<:Real
+    N = length(data)
+    hmax = hmin = 1
+    tmax = tmin = 0
+    best = zero(T)
+    @inbounds for j in 1:N
+        xj = data[j]
+        while tmax >= hmax && data[qmax[tmax]] <= xj
+            tmax -= 1
+        end
+        tmax += 1; qmax[tmax] = j
+        while tmin >= hmin && data[qmin[tmin]] >= xj
+            tmin -= 1
+        end
+        tmin += 1; qmin[tmin] = j
+
+        if j >= w
+            start = j - w + 1
+            while qmax[hmax] < start
+                hmax += 1
+            end
+            while qmin[hmin] < start
+                hmin += 1
+            end
+            best = max(best, data[qmax[hmax]] - data[qmin[hmin]])
+        end
+    end
+    return best
+end
+
+"""
+    MTIEIndex(data; max_window=length(data))
+
+Sparse-table min/max index of a phase record for [`mtie`](@ref).
+
+Level k holds the maximum and minimum of every block of 2^k samples, so the
+range of any window of w samples is read from two overlapping blocks of size
+2^⌊log₂ w⌋. Building costs O(N log W) time and memory for windows up to
+`max_window` samples; afterwards each τ is a single branch-free O(N) pass,
+which suits dense τ grids.
+
+# Examples
+```julia
+idx = MTIEIndex(phase_data)
+result = mtie(phase_data, 1.0; m_list=collect(1:1000), index=idx)
+```
+"""
+struct MTIEIndex{T<:Real}
+    N::Int
+    maxs::Vector{Vector{T}}
+    mins::Vector{Vector{T}}
+end
+
+function MTIEIndex(data::AbstractVector{T}; max_window::Int=length(data)) where T<:Real
+    N = length(data)
+    N >= 1 || throw(ArgumentError("data must not be empty"))
+    max_window >= 1 || throw(ArgumentError("max_window must be positive"))
+    levels = floor(Int, log2(min(max_window, N)))
+
+    maxs = Vector{Vector{T}}(undef, levels + 1)
+    mins = Vector{Vector{T}}(undef, levels + 1)
+    maxs[1] = collect(data)
+    mins[1] = collect(data)
+    for k in 1:levels
+        half = 1 << (k - 1)
+        n = N - (1 << k) + 1
+        prev_max, prev_min = maxs[k], mins[k]
+        cur_max = Vector{T}(undef, n)
+        cur_min = Vector{T}(undef, n)
+        @inbounds for i in 1:n
+            cur_max[i] = max(prev_max[i], prev_max[i+half])
+            cur_min[i] = min(prev_min[i], prev_min[i+half])
+        end
+        maxs[k+1] = cur_max
+        mins[k+1] = cur_min
+    end
+    return MTIEIndex{T}(N, maxs, mins)
+end
+
+"""
+    window_range_max(index::MTIEIndex, w)
+
+Largest max - min over all windows of `w` consecutive samples, from the
+sparse table.
+"""
+function window_range_max(index::MTIEIndex{T}, w::Int) where T<:Real
+    k = floor(Int, log2(w))
+    if k + 1 > length(index.maxs)
+        throw(ArgumentError("window of $w samples exceeds the MTIEIndex; rebuild with a larger max_window"))
+    end
+    span = 1 << k
+    mx, mn = index.maxs[k+1], index.mins[k+1]
+    shift = w - span
+    best = zero(T)
+    @inbounds for i in 1:index.N-w+1
+        hi = max(mx[i], mx[i+shift])
+        lo = min(mn[i], mn[i+shift])
+        best = max(best, hi - lo)
+    end
+    return best
+end
+
 """
     mtie(data, tau0::Real=1.0; m_list=nothing, confidence=0.683)
 
@@ -85,15 +196,19 @@ windows of duration τ = m·τ₀. Critical for telecom timing requirements.
 - `tau0`: Sampling interval (seconds)
 - `m_list`: Averaging factors (default: octave-spaced from 1 to N/3)
 - `confidence`: Confidence level for intervals (default: 0.683)
+- `index`: Optional [`MTIEIndex`](@ref) built from `data`, for many or dense τ grids
 
 # Returns
 DeviationResult with MTIE values at each tau
 
 # Algorithm
-Uses efficient sliding window approach:
-1. For each tau, slide window across phase data
-2. Track min/max within each window position
-3. Return maximum peak-to-peak deviation observed
+Each window of m+1 samples is evaluated in O(1) amortized time, so a τ costs
+O(N) whatever the phase looks like (monotone ramps included):
+- without `index`, monotonic deques of candidate maxima and minima are slid
+  across the data (O(N) per τ, O(N) scratch reused for every τ);
+- with `index`, the window range is read from two overlapping power-of-two
+  blocks of a sparse table (O(N log N) once, then O(N) per τ with no
+  branching), which pays off for hundreds of τ values such as ITU mask checks.
 
 # References
 - ITU-T Recommendation G.810/G.811
@@ -101,11 +216,15 @@ Uses efficient sliding window approach:
 """
 function mtie(data::Vector{T}, tau0::Real=1.0; 
               m_list::Union{Nothing,Vector{Int}}=nothing,
-              confidence::T=T(0.683)) where T<:Real
+              confidence::T=T(0.683),
+              index::Union{Nothing,MTIEIndex}=nothing) where T<:Real
     
     # Validate inputs
     N = length(data)
     validate_phase_data(data)
+    if index !== nothing && index.N != N
+        throw(ArgumentError("MTIEIndex was built for $(index.N) points, data has $N"))
+    end
     
     # Generate tau values if not provided
     if m_list === nothing
@@ -121,6 +240,10 @@ function mtie(data::Vector{T}, tau0::Real=1.0;
     alpha = fill(-2, n_taus)  # Assume white PM noise
     neff = zeros(Int, n_taus)
     
+    # Deque storage shared by every tau
+    qmax = index === nothing ? Vector{Int}(undef, N) : Int[]
+    qmin = index === nothing ? Vector{Int}(undef, N) : Int[]
+    
     # Compute MTIE for each tau
     for (idx, m) in enumerate(m_list)
         tau[idx] = m * tau0
@@ -134,44 +257,10 @@ function mtie(data::Vector{T}, tau0::Real=1.0;
             continue
         end
         
-        # Efficient MTIE computation
-        if m < 100  # Small window - use simple approach
-            max_tie = zero(T)
-            for i in 1:n_windows
-                # Window from i to i+m (inclusive), size = m+1
-                window = @view data[i:i+m]
-                tie = maximum(window) - minimum(window)
-                max_tie = max(max_tie, tie)
-            end
-            deviation[idx] = max_tie
-        else  # Large window - use optimized algorithm
-            # Initialize with first window (size m+1)
-            curr_max = maximum(@view data[1:window_size])
-            curr_min = minimum(@view data[1:window_size])
-            max_tie = curr_max - curr_min
-            
-            # Slide window efficiently
-            for i in 2:n_windows
-                # Check if we need to recalculate max/min
-                leaving = data[i-1]  # Element leaving the window
-                entering = data[i+m]  # Element entering the window
-                
-                if leaving == curr_max
-                    curr_max = maximum(@view data[i:i+m])
-                elseif entering > curr_max
-                    curr_max = entering
-                end
-                
-                if leaving == curr_min
-                    curr_min = minimum(@view data[i:i+m])
-                elseif entering < curr_min
-                    curr_min = entering
-                end
-                
-                tie = curr_max - curr_min
-                max_tie = max(max_tie, tie)
-            end
-            deviation[idx] = max_tie
+        if index === nothing
+            deviation[idx] = window_range_max!(qmax, qmin, data, window_size)
+        else
+            deviation[idx] = window_range_max(index, window_size)
         end
         
         neff[idx] = n_windows
@@ -182,7 +271,7 @@ function mtie(data::Vector{T}, tau0::Real=1.0;
 end
 
 """
-    pdev(data, tau0::Real=1.0; m_list=nothing, confidence=0.683)
+    pdev(data, tau0::Real=1.0; m_list=nothing, confidence=0.683, threaded=false)
 
 Parabolic deviation - evaluates uncertainty of omega-averaged frequency.
 
@@ -195,11 +284,16 @@ For m > 1:
 
 For m = 1, PDEV equals ADEV.
 
+The inner sum is linear in k, so it is read from running sums of x and k·x:
+each τ costs O(N) regardless of m. With `threaded=true` the positions of
+each τ with m ≥ 64 are summed in parallel chunks.
+
 # Arguments
 - `data`: Phase data vector (seconds)
 - `tau0`: Sampling interval (seconds)
 - `m_list`: Averaging factors (default: octave-spaced from 1 to N/3)
 - `confidence`: Confidence level for intervals (default: 0.683)
+- `threaded`: Sum the positions of large τ on threads (default: false)
 
 # Returns
 DeviationResult with parabolic deviation values
@@ -210,7 +304,8 @@ DeviationResult with parabolic deviation values
 """
 function pdev(data::Vector{T}, tau0::Real=1.0; 
               m_list::Union{Nothing,Vector{Int}}=nothing,
-              confidence::T=T(0.683)) where T<:Real
+              confidence::T=T(0.683),
+              threaded::Bool=false) where T<:Real
     
     # Validate inputs
     N = length(data)
@@ -236,7 +331,6 @@ function pdev(data::Vector{T}, tau0::Real=1.0;
         
         if m == 1
             # For m=1, PDEV equals ADEV
-            # Use simple Allan variance formula
             n = N - 2
             if n < 1
                 deviation[idx] = NaN
@@ -244,14 +338,7 @@ function pdev(data::Vector{T}, tau0::Real=1.0;
                 continue
             end
             
-            # Second differences
-            sum_sq = zero(T)
-            for i in 1:n
-                diff = data[i+2] - 2*data[i+1] + data[i]
-                sum_sq += diff^2
-            end
-            
-            deviation[idx] = sqrt(sum_sq / (2 * n)) / tau[idx]
+            deviation[idx] = sqrt(adev_sumsq(data, 1) / (2 * n)) / tau[idx]
             neff[idx] = n
         else
             # Parabolic deviation for m > 1
@@ -262,17 +349,8 @@ function pdev(data::Vector{T}, tau0::Real=1.0;
                 continue
             end
             
-            # Compute parabolic weighted sums
-            sum_sq = zero(T)
-            for i in 0:M-1
-                # Inner sum with parabolic weights
-                inner_sum = zero(T)
-                for k in 0:m-1
-                    weight = (m-1)/2.0 - k
-                    inner_sum += weight * (data[i+k+1] - data[i+k+m+1])
-                end
-                sum_sq += inner_sum^2
-            end
+            # Large τ on long records is split across threads when asked for
+            sum_sq = pdev_sumsq(data, m; threaded=threaded && m >= PDEV_THREAD_MIN_M)
             
             # Scale by normalization factor
             variance = 72 * sum_sq / (M * m^4 * tau[idx]^2)
@@ -291,7 +369,7 @@ function pdev(data::Vector{T}, tau0::Real=1.0;
 end
 
 """
-    theo1(data, tau0::Real=1.0; m_list=nothing, confidence=0.683)
+    theo1(data, tau0::Real=1.0; m_list=nothing, confidence=0.683, fast=false, threaded=false)
 
 THEO1 deviation - two-sample variance with improved confidence and extended averaging range.
 
@@ -309,36 +387,34 @@ Where m must be even and 10 ≤ m ≤ N-1.
 - `tau0`: Sampling interval (seconds)
 - `m_list`: Averaging factors (must be even, default: even octave-spaced)
 - `confidence`: Confidence level for intervals (default: 0.683)
+- `fast`: Use the strided O(N log m) approximation for m ≥ 128 (default: false)
+- `threaded`: Spread the lags of each exact sum over threads (default: false)
 
 # Returns
 DeviationResult with THEO1 deviation values
 
+# Algorithm
+Each δ becomes one contiguous pass over the data with a single weight
+1/(m/2-δ), so the exact sum costs O(N·m) per τ without divisions or
+branches in the inner loop, and with `threaded=true` the lags are spread over
+threads. With `fast=true` long τ use a subsampled approximation of the
+same sum (see `theo1_sumsq_strided`), which brings a full octave grid down to
+O(N log² N); its error is only checked (within 5%) for power-law noise.
+
 # References
 - NIST SP1065 eq (30) page 29
 - Howe et al., "Theo1: Characterization of Very Long-Term Frequency Stability"
 """
 function theo1(data::Vector{T}, tau0::Real=1.0; 
                m_list::Union{Nothing,Vector{Int}}=nothing,
-               confidence::T=T(0.683)) where T<:Real
+               confidence::T=T(0.683),
+               fast::Bool=false,
+               threaded::Bool=false) where T<:Real
     
     # Validate inputs
     N = length(data)
     validate_phase_data(data)
-    
-    # Generate even tau values if not provided
-    if m_list === nothing
-        m_list = default_m_list(N)
-        # Ensure all m values are even and >= 10
-        m_list = [m for m in m_list if m >= 10 && m % 2 == 0]
-        if isempty(m_list)
-            m_list = [10]  # Minimum valid value
-        end
-    else
-        # Validate that all m values are even
-        if any(m % 2 != 0 for m in m_list)
-            error("THEO1 requires all m values to be even")
-        end
-    end
+    m_list = theo1_m_list(N, m_list)
     
     # Preallocate output arrays
     n_taus = length(m_list)
@@ -359,34 +435,206 @@ function theo1(data::Vector{T}, tau0::Real=1.0;
             continue
         end
         
-        # THEO1 computation
-        sum_total = zero(T)
-        n_terms = 0
-        m_half = div(m, 2)
-        
-        for i in 1:N-m
-            inner_sum = zero(T)
-            for delta in 0:m_half-1
-                weight = 1.0 / (m_half - delta)
-                term1 = data[i] - data[i - delta + m_half]
-                term2 = data[i + m] - data[i + delta + m_half]
-                inner_sum += weight * (term1 + term2)^2
-                n_terms += 1
-            end
-            sum_total += inner_sum
-        end
-        
-        # Apply normalization with bias correction factor
-        bias_factor = 0.75  # From NIST references
-        variance = sum_total / (bias_factor * (N - m) * tau[idx]^2)
-        deviation[idx] = sqrt(variance)
-        neff[idx] = n_terms
+        deviation[idx] = sqrt(theo1_variance(data, m, tau0, fast, threaded))
+        neff[idx] = (N - m) * div(m, 2)
     end
     
     return DeviationResult(tau, deviation, edf, ci, alpha, neff, 
                           T(tau0), N, "theo1", confidence)
 end
 
+"""
+    theo1_m_list(N, m_list)
+
+Even averaging factors for the THEO family: the octave defaults that are at
+least 10, or the caller's list after checking that every m is even.
+"""
+function theo1_m_list(N::Int, m_list::Union{Nothing,Vector{Int}})
+    if m_list === nothing
+        m_list = [m for m in default_m_list(N) if m >= 10 && m % 2 == 0]
+        return isempty(m_list) ? [10] : m_list  # Minimum valid value
+    end
+    if any(m % 2 != 0 for m in m_list)
+        throw(ArgumentError("THEO1 requires all m values to be even"))
+    end
+    return m_list
+end
+
+"""
+    theo1_variance(data, m, tau0, fast, threaded=false)
+
+THEO1 variance at averaging factor m, including the 0.75 bias factor from
+NIST SP1065. `threaded` is passed to [`theo1_sumsq`](@ref) for the exact sum.
+"""
+function theo1_variance(data::AbstractVector, m::Int, tau0::Real, fast::Bool,
+                        threaded::Bool=false)
+    N = length(data)
+    if fast && m >= THEO1_FAST_MIN_M
+        sum_total = theo1_sumsq_strided(data, m)
+    else
+        sum_total = theo1_sumsq(data, m; threaded=threaded)
+    end
+    bias_factor = 0.75  # From NIST references
+    return sum_total / (bias_factor * (N - m) * (m * tau0)^2)
+end
+
+# Evenly spaced AVAR/THEO1 pairs used for the fast TheoBR bias estimate
+const THEOBR_MAX_TERMS = 64
+
+"""
+    theobr_ratio(data, fast, threaded=false)
+
+Bias-removal factor of TheoBR (NIST SP1065 eq 31): the mean over
+i = 0..n, n = ⌊0.1N/3 - 3⌋, of AVAR(m=9+3i) / THEO1(m=12+4i), where both
+statistics describe the same effective τ = 0.75·m·τ₀. With `fast` at most
+`THEOBR_MAX_TERMS` evenly spaced i are used, with the strided THEO1
+approximation.
+"""
+function theobr_ratio(data::AbstractVector, fast::Bool, threaded::Bool=false)
+    N = length(data)
+    n = floor(Int, 0.1 * N / 3 - 3)
+    if n < 0
+        throw(ArgumentError("TheoBR needs at least 90 data points, got $N"))
+    end
+    terms = fast ? unique(round.(Int, range(0, n, length=min(n + 1, THEOBR_MAX_TERMS)))) : 0:n
+    ratio = 0.0
+    for i in terms
+        ma = 9 + 3i
+        avar = adev_sumsq(data, ma) / (2 * ma^2 * (N - 2ma))
+        ratio += avar / theo1_variance(data, 12 + 4i, 1.0, fast, threaded)
+    end
+    return ratio / length(terms)
+end
+
+"""
+    theobr(data, tau0::Real=1.0; m_list=nothing, confidence=0.683, fast=false, threaded=false)
+
+Bias-removed THEO1 (TheoBR): THEO1 scaled so that it agrees on average with
+the Allan variance over the range where both are well estimated, which
+removes THEO1's noise-type dependent bias without identifying the noise.
+
+    σ²_TheoBR(m) = [1/(n+1) Σᵢ₌₀ⁿ AVAR(9+3i) / THEO1(12+4i)] × σ²_THEO1(m),
+    n = ⌊0.1N/3 - 3⌋
+
+# Arguments
+- `data`: Phase data vector (seconds, at least 90 points)
+- `tau0`: Sampling interval (seconds)
+- `m_list`: Averaging factors (must be even, default: even octave-spaced)
+- `confidence`: Confidence level for intervals (default: 0.683)
+- `fast`: Approximate with the strided THEO1 for m ≥ 128 and at most 64 bias
+  terms (default: false). The exact bias term alone costs O(N³), so long
+  records need `fast=true`.
+- `threaded`: Spread the lags of each exact THEO1 sum over threads (default: false)
+
+# Returns
+DeviationResult with TheoBR deviation values at the effective averaging time
+τ = 0.75·m·τ₀, where TheoBR matches the Allan variance. This is the τ that
+[`theoh`](@ref) reports; [`theo1`](@ref) keeps τ = m·τ₀.
+
+# References
+- NIST SP1065 eq (31) page 30
+- Howe & Tasset, "Theo1: characterization of very long-term frequency stability", EFTF 2004
+"""
+function theobr(data::Vector{T}, tau0::Real=1.0;
+                m_list::Union{Nothing,Vector{Int}}=nothing,
+                confidence::T=T(0.683),
+                fast::Bool=false,
+                threaded::Bool=false) where T<:Real
+    
+    N = length(data)
+    validate_phase_data(data)
+    m_list = theo1_m_list(N, m_list)
+    ratio = theobr_ratio(data, fast, threaded)
+    
+    n_taus = length(m_list)
+    tau = zeros(T, n_taus)
+    deviation = zeros(T, n_taus)
+    edf = fill(NaN, n_taus)
+    ci = fill(NaN, n_taus, 2)
+    alpha = fill(-2, n_taus)  # Placeholder
+    neff = zeros(Int, n_taus)
+    
+    for (idx, m) in enumerate(m_list)
+        tau[idx] = 0.75 * m * tau0
+        if m > N - 1
+            deviation[idx] = NaN
+            continue
+        end
+        deviation[idx] = sqrt(ratio * theo1_variance(data, m, tau0, fast, threaded))
+        neff[idx] = (N - m) * div(m, 2)
+    end
+    
+    return DeviationResult(tau, deviation, edf, ci, alpha, neff,
+                          T(tau0), N, "theobr", confidence)
+end
+
+"""
+    theoh(data, tau0::Real=1.0; confidence=0.683, fast=false, threaded=false)
+
+Hybrid THEO (TheoH): Allan deviation at short τ stitched to TheoBR at long τ,
+giving one curve from τ₀ out to 75% of the record length.
+
+- ADEV at octave m up to k, the largest power of two with k ≤ 0.1N;
+- TheoBR at even m from k/0.75 doubling up to N-1, reported at its effective
+  averaging time τ = 0.75·m·τ₀ so that both parts share one τ axis.
+
+# Arguments
+- `data`: Phase data vector (seconds, at least 90 points)
+- `tau0`: Sampling interval (seconds)
+- `confidence`: Confidence level for intervals (default: 0.683)
+- `fast`: Passed to [`theobr`](@ref) (default: false)
+- `threaded`: Passed to [`theobr`](@ref) (default: false)
+
+# Returns
+DeviationResult with method "theoh"; `neff` is the number of terms of the
+ADEV or THEO1 sum behind each point
+
+# References
+- NIST SP1065 section 5.2.15
+- Howe & Tasset, "Theo1: characterization of very long-term frequency stability", EFTF 2004
+"""
+function theoh(data::Vector{T}, tau0::Real=1.0;
+               confidence::T=T(0.683),
+               fast::Bool=false,
+               threaded::Bool=false) where T<:Real
+    
+    N = length(data)
+    validate_phase_data(data)
+    ratio = theobr_ratio(data, fast, threaded)
+    
+    k = 2^floor(Int, log2(0.1 * N))
+    m_adev = [2^p for p in 0:round(Int, log2(k))]
+    m_theo = Int[]
+    m = 2 * cld(ceil(Int, k / 0.75), 2)
+    while m <= N - 1
+        push!(m_theo, m)
+        m *= 2
+    end
+    
+    n_taus = length(m_adev) + length(m_theo)
+    tau = zeros(T, n_taus)
+    deviation = zeros(T, n_taus)
+    edf = fill(NaN, n_taus)
+    ci = fill(NaN, n_taus, 2)
+    alpha = fill(-2, n_taus)  # Placeholder
+    neff = zeros(Int, n_taus)
+    
+    for (idx, m) in enumerate(m_adev)
+        tau[idx] = m * tau0
+        deviation[idx] = sqrt(adev_sumsq(data, m) / (2 * (N - 2m))) / tau[idx]
+        neff[idx] = N - 2m
+    end
+    for (offset, m) in enumerate(m_theo)
+        idx = length(m_adev) + offset
+        tau[idx] = 0.75 * m * tau0
+        deviation[idx] = sqrt(ratio * theo1_variance(data, m, tau0, fast, threaded))
+        neff[idx] = (N - m) * div(m, 2)
+    end
+    
+    return DeviationResult(tau, deviation, edf, ci, alpha, neff,
+                          T(tau0), N, "theoh", confidence)
+end
+
 # Helper function for generating masks (for future TIE/MTIE mask support)
 """
     generate_itu_mask(mask_type::String, tau_range::Vector{T}) where T<:Real
@@ -0,0 +1,230 @@
+# Simulated EDF and bias tables for the total variances
+#
+# The published coefficients behind totaldev_edf and bias_correction cover a
+# few α each and were fitted to other implementations. simulate_total_tables
+# runs the estimators of this package on simulated power-law noise over an
+# (α, T/τ) grid and records, per total variant, the chi-squared equivalent EDF
+# and the ratio E[total]/E[underlying variance]. The shipped table
+# (data/total_tables.bin) is read on first use and interpolated in O(1);
+# α that were not simulated, and EDF below the first T/τ column, fall back to
+# the published coefficients.
+
+const TOTAL_TABLE_MAGIC = b"STABEDF1"
+const TOTAL_TABLE_VERSION = UInt32(1)
+
+# Variants in table order, with the variance each one is compared with:
+# totvar/AVAR, mtot/MVAR, htot/HVAR, mhtot/MHVAR
+const TOTAL_VARIANTS = ("totvar", "mtot", "htot", "mhtot")
+
+const TOTAL_TABLE_PATH = joinpath(@__DIR__, "..", "data", "total_tables.bin")
+
+"""
+    TotalTables
+
+EDF and bias of the total variances on an octave grid of T/τ.
+
+# Fields
+- `alphas::Vector{Int}`: Noise exponents α of the rows
+- `ratios::Vector{Float64}`: T/τ = (N-1)/m of the columns, octave spaced
+- `m::Int`: Averaging factor of the simulations (N = ratio·m + 1)
+- `nsim::Int`: Replicates per grid point
+- `edf::Array{Float64,3}`: EDF, variant × α × T/τ (variants in `TOTAL_VARIANTS` order)
+- `bias::Array{Float64,3}`: E[total]/E[underlying variance], same layout
+"""
+struct TotalTables
+    alphas::Vector{Int}
+    ratios::Vector{Float64}
+    m::Int
+    nsim::Int
+    edf::Array{Float64,3}
+    bias::Array{Float64,3}
+end
+
+"""
+    total_variances(ws, m)
+
+The four total variances of the replicate in `ws` and the variances they are
+compared with, normalized as in `totdev`, `mtotdev`, `htotdev`, `mhtotdev`,
+`adev`, `mdev`, `hdev` and `mhdev` (τ₀ = 1).
+"""
+function total_variances(ws::BootstrapWorkspace, m::Int)
+    x = ws.x
+    N = length(x)
+    n_mod = N - 3*m + 1
+    n_mh = N - 4*m + 1
+    mh_sum, mh_count = mhdev_sumsq(x, m)
+    totals = (totdev_sumsq(x, m) / (2 * (N - 2) * m^2),
+              mtotdev_sumsq!(ws.reflected, x, m) / m^2 / (6*m) / (2 * m^2 * n_mod),
+              htotdev_sumsq!(ws.reflected, ws.y, m) / m^2 / (6*m) / (6 * (N - 3*m)),
+              mhtotdev_sumsq!(ws.reflected, x, m) / (5*m + 4) / (6 * m^2) / n_mh / m^2)
+    bases = (adev_sumsq(x, m) / (N - 2*m) / (2 * m^2),
+             mdev_sumsq(x, m) / m^2 / n_mod / (2 * m^2),
+             hdev_sumsq(x, m) / (N - 3*m) / (6 * m^2),
+             mh_count > 0 ? mh_sum / mh_count / (6 * m^2) / m^2 : NaN)
+    return totals, bases
+end
+
+"""
+    simulate_total_tables(; alphas=-2:2, ratios=[2^2, ..., 2^10], m=16, nsim=2000, seed=0,
+                          threaded=true)
+
+Estimate the EDF and bias of TOTVAR, MTOT, HTOT and MHTOT by simulation. For
+each α and T/τ, `nsim` records of N = T/τ·m + 1 points are drawn as in the
+bootstrap ([`powerlaw_noise!`](@ref)) and spread over threads with one
+workspace per worker. The EDF is 2/var(σ̂²/E[σ̂²]) and the bias
+E[total]/E[underlying variance]. Runs offline; write the result with
+[`write_total_tables`](@ref) (see `validation/generate_total_tables.jl`).
+"""
+function simulate_total_tables(; alphas::AbstractVector{Int}=collect(-2:2),
+                               ratios::AbstractVector{<:Real}=[2.0^k for k in 2:10],
+                               m::Int=16, nsim::Int=2000, seed::Int=0, threaded::Bool=true)
+    m >= 2 || throw(ArgumentError("m must be at least 2"))
+    nsim >= 2 || throw(ArgumentError("nsim must be at least 2"))
+    first(ratios) >= 4 || throw(ArgumentError("T/τ must be at least 4"))
+    all(log2(ratios[k+1] / ratios[k]) ≈ 1 for k in 1:length(ratios)-1) ||
+        throw(ArgumentError("T/τ grid must be octave spaced"))
+
+    nv = length(TOTAL_VARIANTS)
+    edf = fill(NaN, nv, length(alphas), length(ratios))
+    bias = fill(NaN, nv, length(alphas), length(ratios))
+    for (a, alpha) in enumerate(alphas), (r, ratio) in enumerate(ratios)
+        N = round(Int, ratio * m) + 1
+        totals = zeros(nsim, nv)
+        bases = zeros(nsim, nv)
+        work_queue(collect(1:nsim), () -> BootstrapWorkspace(N); threaded=threaded) do i, ws
+            Random.seed!(ws.rng, hash((seed, alpha, ratio, i)))
+            powerlaw_noise!(ws.x, alpha, ws.rng)
+            @inbounds for j in eachindex(ws.y)
+                ws.y[j] = ws.x[j+1] - ws.x[j]
+            end
+            tot, base = total_variances(ws, m)
+            totals[i, :] .= tot
+            bases[i, :] .= base
+        end
+        for v in 1:nv
+            mean_tot = mean(view(totals, :, v))
+            edf[v, a, r] = 2 / var(view(totals, :, v) ./ mean_tot)
+            bias[v, a, r] = mean_tot / mean(view(bases, :, v))
+        end
+    end
+    return TotalTables(collect(alphas), Float64.(ratios), m, nsim, edf, bias)
+end
+
+"""
+    write_total_tables(path, tables)
+
+Store `tables` as a 32-byte header (magic "STABEDF1", version, number of α and
+T/τ values, m, nsim) followed by the α and T/τ values and, per variant, the
+EDF and bias matrices (α fastest), all little-endian.
+"""
+function write_total_tables(path::AbstractString, tables::TotalTables)
+    open(path, "w") do io
+        write(io, TOTAL_TABLE_MAGIC)
+        write(io, htol(TOTAL_TABLE_VERSION), htol(UInt32(length(tables.alphas))),
+              htol(UInt32(length(tables.ratios))), htol(UInt32(tables.m)), htol(Int64(tables.nsim)))
+        write(io, htol.(Int64.(tables.alphas)), htol.(tables.ratios))
+        for v in eachindex(TOTAL_VARIANTS)
+            write(io, htol.(vec(tables.edf[v, :, :])), htol.(vec(tables.bias[v, :, :])))
+        end
+    end
+    return path
+end
+
+"""
+    read_total_tables(path)
+
+Load tables written by [`write_total_tables`](@ref).
+"""
+function read_total_tables(path::AbstractString)
+    open(path, "r") do io
+        if filesize(io) < 32 || read(io, 8) != TOTAL_TABLE_MAGIC
+            throw(ArgumentError("$path is not a StabLab EDF table"))
+        end
+        version = ltoh(read(io, UInt32))
+        na = Int(ltoh(read(io, UInt32)))
+        nr = Int(ltoh(read(io, UInt32)))
+        m = Int(ltoh(read(io, UInt32)))
+        nsim = Int(ltoh(read(io, Int64)))
+        if version != TOTAL_TABLE_VERSION
+            throw(ArgumentError("Unsupported EDF table version $version"))
+        end
+        nv = length(TOTAL_VARIANTS)
+        if filesize(io) != 32 + 8 * (na + nr + 2 * nv * na * nr)
+            throw(ArgumentError("$path is truncated or corrupt"))
+        end
+        alphas = Int.(ltoh.(read!(io, Vector{Int64}(undef, na))))
+        ratios = ltoh.(read!(io, Vector{Float64}(undef, nr)))
+        edf = Array{Float64}(undef, nv, na, nr)
+        bias = Array{Float64}(undef, nv, na, nr)
+        for v in 1:nv
+            edf[v, :, :] = ltoh.(read!(io, Matrix{Float64}(undef, na, nr)))
+            bias[v, :, :] = ltoh.(read!(io, Matrix{Float64}(undef, na, nr)))
+        end
+        return TotalTables(alphas, ratios, m, nsim, edf, bias)
+    end
+end
+
+# Shipped tables, read on first use (nothing when the file is absent or unreadable)
+const TOTAL_TABLES = Ref{Union{Nothing,TotalTables}}(nothing)
+const TOTAL_TABLES_READ = Ref(false)
+const TOTAL_TABLES_LOCK = ReentrantLock()
+
+"""
+    total_tables()
+
+The shipped [`TotalTables`](@ref), or `nothing` if `data/total_tables.bin` is
+missing or unreadable. The file is read once.
+"""
+function total_tables()
+    TOTAL_TABLES_READ[] && return TOTAL_TABLES[]
+    lock(TOTAL_TABLES_LOCK) do
+        if !TOTAL_TABLES_READ[]
+            if isfile(TOTAL_TABLE_PATH)
+                try
+                    TOTAL_TABLES[] = read_total_tables(TOTAL_TABLE_PATH)
+                catch e
+                    e isa ArgumentError || rethrow()
+                    @warn "Ignoring EDF table: $(e.msg)"
+                end
+            end
+            TOTAL_TABLES_READ[] = true
+        end
+    end
+    return TOTAL_TABLES[]
+end
+
+"""
+    table_lookup(field, var_type, alpha, ratio)
+
+`field` (`:edf` or `:bias`) of `var_type` at α and T/τ = `ratio` from the
+shipped tables, or NaN when there is no table entry. The grid position
+follows from log2 of the octave-spaced T/τ, so a lookup is O(1). EDF is
+interpolated log-log, grows like T/τ past the last column and has no value
+below the first. The bias is interpolated linearly and held past both ends of
+the grid and across columns the estimator does not reach (NaN cells), so
+corrections do not jump at the grid edges.
+"""
+function table_lookup(field::Symbol, var_type::String, alpha::Int, ratio::Real)
+    tables = total_tables()
+    tables === nothing && return NaN
+    v = findfirst(==(var_type), TOTAL_VARIANTS)
+    a = findfirst(==(alpha), tables.alphas)
+    (v === nothing || a === nothing || !(ratio > 0)) && return NaN
+    field === :edf && ratio < tables.ratios[1] && return NaN
+
+    vals = field === :edf ? tables.edf : tables.bias
+    K = length(tables.ratios)
+    u = log2(ratio / tables.ratios[1]) + 1
+    if u >= K
+        last_val = vals[v, a, K]
+        return field === :edf ? last_val * ratio / tables.ratios[K] : last_val
+    end
+    field === :bias && (u = max(u, 1.0))
+    k = floor(Int, u)
+    t = u - k
+    lo, hi = vals[v, a, k], vals[v, a, k+1]
+    field === :edf && return exp((1 - t) * log(lo) + t * log(hi))
+    isnan(lo) && return hi
+    isnan(hi) && return lo
+    return (1 - t) * lo + t * hi
+end
@@ -0,0 +1,75 @@
+# Test Monte-Carlo confidence intervals: compute_ci(result; method="bootstrap")
+# Run with e.g. `julia --threads=4 tests/test_bootstrap.jl`
+
+using Pkg
+Pkg.activate(joinpath(@__DIR__, ".."))
+
+using StabLab
+using Random
+using Statistics
+
+Random.seed!(22)
+
+println("=== Testing Bootstrap Confidence Intervals ($(Threads.nthreads()) threads) ===\n")
+
+N = 4096
+tau0 = 1.0
+x = cumsum(randn(N)) .* 1e-9   # White FM
+mlist = [4, 16, 64, 256]
+
+# 1. Simulated noise
+println("1. Power-law noise generator")
+rng = MersenneTwister(1)
+y = zeros(N)
+StabLab.powerlaw_noise!(y, 2, rng)
+@assert abs(mean(y)) < 0.1 && isapprox(std(y), 1, rtol=0.1)
+StabLab.powerlaw_noise!(y, 1, rng)
+@assert all(isfinite, y) && std(y) > 1   # one unit-variance branch per octave
+StabLab.powerlaw_noise!(y, -2, MersenneTwister(1))
+w = randn(MersenneTwister(1), N)
+@assert y ≈ cumsum(cumsum(w))
+println("  ✓ white, flicker and integrated series")
+
+# 2. Agreement with the SP1065 overlapping-ADEV EDF for White FM
+println("\n2. ADEV, White FM")
+r = adev(x, tau0, mlist=mlist)
+boot = compute_ci(r; method="bootstrap")
+for (k, m) in enumerate(mlist)
+    edf = StabLab.calculate_edf(0, 2, m, m, m, N)
+    @assert boot.ci[k, 1] < boot.deviation[k] < boot.ci[k, 2]
+    @assert isapprox(boot.edf[k], edf, rtol=0.25) "m=$m: EDF $(boot.edf[k]) vs $edf"
+    println("  ✓ m=$(rpad(m, 3)) EDF bootstrap $(round(boot.edf[k], digits=1)), SP1065 $(round(edf, digits=1))")
+end
+
+# 3. Reproducible for any thread count, cached per (method, N, α, m)
+println("\n3. Seeds, threads and the cache")
+empty!(StabLab.BOOTSTRAP_CACHE)
+@assert isequal(compute_ci(r; method="bootstrap", threaded=true).ci, boot.ci)
+@assert !isequal(compute_ci(r; method="bootstrap", seed=7).ci, boot.ci)
+empty!(StabLab.BOOTSTRAP_CACHE)
+t_first = @elapsed compute_ci(mdev(x, tau0, mlist=mlist); method="bootstrap")
+n_cached = length(StabLab.BOOTSTRAP_CACHE)
+@assert n_cached == length(mlist)
+t_repeat = @elapsed compute_ci(tdev(x, tau0, mlist=mlist); method="bootstrap")   # shares the MDEV replicates
+@assert length(StabLab.BOOTSTRAP_CACHE) == n_cached
+println("  ✓ identical serial/threaded, new seed differs; cached repeat $(round(t_repeat * 1e3, digits=2)) ms vs $(round(t_first * 1e3, digits=1)) ms")
+
+# 4. Deviations without an EDF model
+println("\n4. Total deviations")
+for func in (mhtotdev, mtotdev, htotdev, totdev)
+    res = compute_ci(func(x, tau0, mlist=[2, 8, 32], noise=:auto); method="bootstrap", nsim=300)
+    @assert all(res.ci[:, 1] .< res.deviation .< res.ci[:, 2])
+    println("  ✓ $(rpad(nameof(func), 9)) intervals bracket the deviation")
+end
+
+try
+    r = adev(x, tau0, mlist=mlist)
+    compute_ci(DeviationResult{Float64}(r.tau, r.deviation, r.edf, r.ci, r.alpha, r.neff,
+                                        r.tau0, r.N, "theo1", r.confidence); method="bootstrap")
+    @assert false "unsupported method should be rejected"
+catch e
+    @assert e isa ArgumentError
+end
+println("  ✓ unsupported deviation types raise ArgumentError")
+
+println("\n✅ Bootstrap confidence interval tests completed!")
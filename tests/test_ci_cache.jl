@@ -0,0 +1,64 @@
+# Test the memoized EDF and chi-squared quantile caches behind compute_ci
+
+using Pkg
+Pkg.activate(joinpath(@__DIR__, ".."))
+
+using StabLab
+using Distributions
+using Random
+
+Random.seed!(21)
+
+println("=== Testing EDF/CI Caches ===\n")
+
+# 1. LRU behaviour
+println("1. LRU cache")
+cache = StabLab.LRUCache{Int,Int}(8)
+calls = Ref(0)
+square(k) = StabLab.cached!(() -> (calls[] += 1; k^2), cache, k)
+@assert square(3) == 9 && square(3) == 9 && calls[] == 1
+for k in 1:20
+    square(k)
+end
+@assert length(cache) <= 8
+square(20)  # most recent entry survives eviction
+@assert calls[] == 20
+println("  ✓ hits skip the computation, size stays within capacity")
+
+# 2. Cached values equal the direct formulas
+println("\n2. Values")
+empty!(StabLab.EDF_CACHE); empty!(StabLab.CHI2_CACHE)
+for (alpha, d, m, F, S, N) in ((0, 2, 4, 4, 4, 1000), (-1, 3, 16, 1, 1, 5000), (2, 2, 64, 64, 64, 10_000))
+    @assert StabLab.calculate_edf(alpha, d, m, F, S, N) === StabLab.sp1065_edf(alpha, d, m, F, S, N)
+end
+lo, hi = StabLab.chi2_bounds(37.5, 0.95)
+@assert lo == quantile(Chisq(37.5), 0.025) && hi == quantile(Chisq(37.5), 0.975)
+println("  ✓ memoized EDF and quantiles match the uncached computations")
+
+# 3. compute_ci: same intervals, repeat calls hit the tables
+println("\n3. compute_ci")
+x = cumsum(randn(20_000)) .* 1e-9
+results = [f(x, 1.0, noise=:auto) for f in (adev, mdev, hdev, mhdev, tdev, totdev)]
+empty!(StabLab.EDF_CACHE); empty!(StabLab.CHI2_CACHE)
+first_pass = [compute_ci(r) for r in results]
+n_edf, n_chi2 = length(StabLab.EDF_CACHE), length(StabLab.CHI2_CACHE)
+second_pass = [compute_ci(r) for r in results]
+@assert all(isequal(a.ci, b.ci) && isequal(a.edf, b.edf) for (a, b) in zip(first_pass, second_pass))
+@assert length(StabLab.EDF_CACHE) == n_edf && length(StabLab.CHI2_CACHE) == n_chi2
+t_cached = @elapsed for r in results; compute_ci(r); end
+println("  ✓ identical intervals, no new entries on repeat ($(round(t_cached * 1e3, digits=2)) ms for $(length(results)) results)")
+
+# 4. Octave tables and concurrent use
+println("\n4. precompute_ci_tables and threads")
+empty!(StabLab.EDF_CACHE); empty!(StabLab.CHI2_CACHE)
+npoints = precompute_ci_tables(20_000)
+@assert npoints > 0 && length(StabLab.EDF_CACHE) > 0
+n_edf = length(StabLab.EDF_CACHE)
+compute_ci(adev(x, 1.0))
+compute_ci(mdev(x, 1.0, noise=fill(-1, length(mdev(x, 1.0).tau))))
+@assert length(StabLab.EDF_CACHE) == n_edf
+tasks = [Threads.@spawn compute_ci(r) for r in repeat(results, 8)]
+@assert all(isequal(fetch(t).ci, compute_ci(r).ci) for (t, r) in zip(tasks, repeat(results, 8)))
+println("  ✓ $npoints octave points tabulated; concurrent compute_ci calls agree")
+
+println("\n✅ EDF/CI cache tests completed!")
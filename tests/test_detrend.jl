@@ -0,0 +1,93 @@
+# Test closed-form, streaming polynomial detrending (src/detrend.jl)
+
+using Pkg
+Pkg.activate(joinpath(@__DIR__, ".."))
+
+using StabLab
+using Random
+
+Random.seed!(25)
+
+println("=== Testing Detrending ===\n")
+
+N = 100_000
+t = collect(1.0:N)
+x = cumsum(randn(N)) .* 1e-9 .+ 2e-12 .* t .^ 2 .- 3e-8 .* t .+ 1e-3
+
+# Design-matrix least squares, the previous implementation
+function reference_detrend(x, degree)
+    t = collect(1.0:length(x))
+    A = degree == 1 ? hcat(ones(length(x)), t) : hcat(ones(length(x)), t, t .^ 2)
+    return x - A * (A \ x)
+end
+
+# 1. Agreement with the design-matrix fit
+println("1. Linear and quadratic fits")
+for degree in (1, 2)
+    ref = reference_detrend(x, degree)
+    z = StabLab.detrend(x, degree)
+    @assert isapprox(z, ref, atol=1e-7 * maximum(abs, ref)) "degree $degree"
+    println("  ✓ degree $degree: max |Δ| $(round(maximum(abs, z .- ref), sigdigits=2)) s")
+end
+@assert StabLab.detrend_linear(x) == StabLab.detrend(x, 1)
+@assert StabLab.detrend_quadratic(x) == StabLab.detrend(x, 2)
+@assert StabLab.detrend_linear([1.5]) == [1.5] && StabLab.detrend_quadratic([1.0, 2.0]) == [1.0, 2.0]
+x32 = Float32.(x)
+@assert eltype(StabLab.detrend_linear(x32)) == Float32
+@assert isapprox(StabLab.detrend(x32, 2), reference_detrend(Float64.(x32), 2), atol=1e-6 * maximum(abs, x32))
+println("  ✓ wrappers, short records and Float32 input")
+
+# 2. In place, copy and lazy view agree
+println("\n2. detrend!, detrend and detrended")
+z = StabLab.detrend(x, 2)
+y = copy(x)
+@assert StabLab.detrend!(y, 2) === y && y == z
+v = StabLab.detrended(x, 2)
+@assert length(v) == N && collect(v) == z
+s = view(x, 1:7:N)
+@assert collect(StabLab.detrended(s, 2)) == StabLab.detrend(collect(s), 2)
+function detrend_bytes(y)
+    StabLab.detrend!(y, 2)  # compile
+    return @allocated StabLab.detrend!(y, 2)
+end
+bytes = detrend_bytes(copy(x))
+@assert bytes < 1024 "detrend! allocated $bytes bytes"
+println("  ✓ identical results; in-place detrend of $N points allocates $bytes bytes")
+
+# 3. Chunked and memory-mapped records
+println("\n3. Chunked fits")
+sums = StabLab.TrendSums{Float64}(N)
+for a in 1:4096:N
+    append!(sums, view(x, a:min(a + 4095, N)))
+end
+fit = StabLab.trend_fit(sums, 2)
+@assert fit.c0 == StabLab.trend_fit(x, 2).c0 && fit.c2 == StabLab.trend_fit(x, 2).c2
+y = copy(x)
+for a in 1:4096:N
+    StabLab.detrend!(view(y, a:min(a + 4095, N)), fit; offset=a - 1)
+end
+@assert y == z
+
+path = tempname() * ".phs"
+write_phase_file(path, x .* 1e9, scale=1e-9)
+pf = open_phase_file(path)
+fit_pf = StabLab.trend_fit(pf, 2; chunk=1000)
+@assert isapprox(fit_pf.c1, fit.c1, rtol=1e-12) && isapprox(fit_pf.c2, fit.c2, rtol=1e-12)
+println("  ✓ 4096-sample chunks and a memory-mapped phase file match the one-shot fit")
+
+for thunk in (() -> StabLab.trend_fit(x, 3),
+              () -> StabLab.trend_fit(append!(StabLab.TrendSums{Float64}(N + 1), x), 1),
+              () -> append!(StabLab.TrendSums{Float64}(10), x))
+    try
+        thunk()
+        @assert false "expected ArgumentError"
+    catch e
+        @assert e isa ArgumentError
+    end
+end
+println("  ✓ bad degree, incomplete sums and overlong chunks raise ArgumentError")
+
+pf = nothing; GC.gc()
+rm(path)
+
+println("\n✅ Detrending tests completed!")
@@ -41,6 +41,19 @@ println("✓ $(length(valid_alphas))/$(length(alphas)) valid estimates")
 println("  Alpha values: $alphas")
 println("  Expected: 0 (White FM)")
 
+# Test noise keyword: skip (default), auto, and precomputed alphas
+print("Testing noise keyword... ")
+result_skip = adev(phase_data, tau0, mlist=m_list)
+result_auto = adev(phase_data, tau0, mlist=m_list, noise=:auto)
+result_pre = adev(phase_data, tau0, mlist=m_list, noise=alphas)
+@assert all(result_skip.alpha .== 0)
+@assert result_auto.alpha == result_pre.alpha
+@assert result_auto.deviation == result_skip.deviation
+println("✓ auto alphas: $(result_auto.alpha)")
+
+ci_pre = compute_ci(result_pre, 0.683)
+println("  EDF at τ=1s with identified α: $(round(ci_pre.edf[1], digits=1))")
+
 # Test all deviation types with CI
 println("\nTesting all deviation types with confidence intervals:")
 functions = [
@@ -0,0 +1,198 @@
+# Test allocation-free difference kernels against the slice-based formulas
+
+using Pkg
+Pkg.activate(joinpath(@__DIR__, ".."))
+
+using StabLab
+using Random
+using Statistics
+
+Random.seed!(42)
+
+println("=== Testing Fused Deviation Kernels ===\n")
+
+N = 10000
+tau0 = 1.0
+x = cumsum(randn(N)) * 1e-9  # White FM noise
+mlist = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512]
+
+# Reference implementations using the original slice/cumsum formulations
+function ref_adev(x, m)
+    N = length(x); L = N - 2*m
+    d2 = x[1+2*m:N] - 2*x[1+m:N-m] + x[1:L]
+    return sqrt(mean(d2.^2) / (2 * m^2 * tau0^2))
+end
+
+function ref_mdev(x, m)
+    N = length(x); n = N - 3*m + 1
+    cs = cumsum([0.0; x])
+    s1 = cs[1+m:n+m] - cs[1:n]
+    s2 = cs[1+2*m:n+2*m] - cs[1+m:n+m]
+    s3 = cs[1+3*m:n+3*m] - cs[1+2*m:n+2*m]
+    d = (s3 - 2*s2 + s1) / m
+    return sqrt(mean(d.^2) / (2 * m^2 * tau0^2))
+end
+
+function ref_hdev(x, m)
+    N = length(x); L = N - 3*m
+    d3 = x[1+3*m:N] - 3*x[1+2*m:N-m] + 3*x[1+m:N-2*m] - x[1:L]
+    return sqrt(mean(d3.^2) / (6 * (m * tau0)^2))
+end
+
+function ref_mhdev(x, m)
+    N = length(x); n = N - 4*m + 1
+    d4 = x[1:n] - 3*x[1+m:n+m] + 3*x[1+2*m:n+2*m] - x[1+3*m:n+3*m]
+    S = cumsum([0.0; d4])
+    avg = S[m+1:end] - S[1:end-m]
+    return sqrt(mean(avg.^2) / (6 * m^2)) / (m * tau0)
+end
+
+# 1. Agreement with the original formulas
+println("1. Agreement with slice-based formulas")
+for (name, func, ref) in [("adev", adev, ref_adev), ("mdev", mdev, ref_mdev),
+                          ("hdev", hdev, ref_hdev), ("mhdev", mhdev, ref_mhdev)]
+    result = func(x, tau0, mlist=mlist[1:6])
+    expected = [ref(x, m) for m in mlist[1:6]]
+    max_rel = maximum(abs.(result.deviation .- expected) ./ expected)
+    @assert max_rel < 1e-6 "$name disagrees with reference (rel err $max_rel)"
+    println("  ✓ $(rpad(name, 6)) max relative difference: $(round(max_rel, sigdigits=3))")
+end
+
+# 2. Zero heap allocation per tau
+println("\n2. Kernel allocations")
+function kernel_bytes(kernel, x, m)
+    kernel(x, m)  # compile
+    return @allocated kernel(x, m)
+end
+
+for kernel in [StabLab.adev_sumsq, StabLab.hdev_sumsq,
+               StabLab.mdev_sumsq, StabLab.mhdev_sumsq]
+    bytes = kernel_bytes(kernel, x, 64)
+    @assert bytes == 0 "$(nameof(kernel)) allocated $bytes bytes"
+    println("  ✓ $(rpad(nameof(kernel), 12)) 0 bytes")
+end
+
+# 3. Whole-call allocations no longer scale with N (noise identification skipped)
+println("\n3. Whole-call allocations")
+function call_bytes(func, x, tau0, mlist)
+    func(x, tau0, mlist=mlist)  # compile
+    return @allocated func(x, tau0, mlist=mlist)
+end
+
+x_long = cumsum(randn(10N)) * 1e-9
+for func in [adev, mdev, hdev, mhdev, totdev]
+    bytes_short = call_bytes(func, x, tau0, mlist[1:6])
+    bytes_long = call_bytes(func, x_long, tau0, mlist[1:6])
+    @assert bytes_long <= 2 * bytes_short "$(nameof(func)) allocations scale with N"
+    println("  ✓ $(rpad(nameof(func), 6)) N=$N: $bytes_short bytes, N=$(10N): $bytes_long bytes")
+end
+
+# 4. Reflected-subsequence engine against the per-subsequence formulas
+println("\n4. Total deviation engine")
+
+# Uninverted even reflection of each detrended subsequence, summed directly
+function ref_reflected(u, m, slope_of)
+    L = 3*m
+    total = 0.0
+    for n in 1:length(u)-L+1
+        z = u[n:n+L-1]
+        z = z .- slope_of(z) .* (0:L-1)
+        cs = cumsum([0.0; reverse(z); z; reverse(z)])
+        d = [cs[j+3m] - 3cs[j+2m] + 3cs[j+m] - cs[j] for j in 1:6m] ./ m
+        total += sum(d.^2) / (6m)
+    end
+    return total
+end
+
+function mtot_slope(z)
+    L = length(z); h = L ÷ 2
+    return L == 3 ? (z[3] - z[1]) / 2 : (mean(z[h+1:end]) - mean(z[1:h])) / (L/2)
+end
+
+function htot_slope(z)
+    L = length(z)
+    return (mean(z[cld(L, 2)+1:end]) - mean(z[1:L÷2])) / (isodd(L) ? (L+1)/2 : L/2)
+end
+
+x_short = x[1:600] .+ 1e-6
+y_short = diff(x_short)
+ms = [1, 2, 3, 5, 8, 16, 50]
+mt = mtotdev(x_short, tau0, mlist=ms)
+expected = [sqrt(ref_reflected(x_short, m, mtot_slope) / (2m^2 * (length(x_short)-3m+1)))
+            for m in ms]
+max_rel = maximum(abs.(mt.deviation .- expected) ./ expected)
+@assert max_rel < 1e-9 "mtotdev disagrees with reference (rel err $max_rel)"
+println("  ✓ mtotdev max relative difference: $(round(max_rel, sigdigits=3))")
+
+ht = htotdev(x_short, tau0, mlist=ms[2:end])
+expected = [sqrt(ref_reflected(y_short, m, htot_slope) / (6 * (length(y_short)-3m+1)))
+            for m in ms[2:end]]
+max_rel = maximum(abs.(ht.deviation .- expected) ./ expected)
+@assert max_rel < 1e-9 "htotdev disagrees with reference (rel err $max_rel)"
+println("  ✓ htotdev max relative difference: $(round(max_rel, sigdigits=3))")
+
+function ref_mhtotdev(x, m)
+    nsubs = length(x) - 4m + 1
+    total = 0.0
+    for n in 1:nsubs
+        z = StabLab.detrend_linear(x[n:n+3m])
+        ext = [reverse(z); z; reverse(z)]
+        L = length(ext) - 3m
+        d3 = ext[1:L] - 3ext[1+m:L+m] + 3ext[1+2m:L+2m] - ext[1+3m:L+3m]
+        S = cumsum([0.0; d3])
+        total += mean((S[m+1:end] - S[1:end-m]).^2) / (6m^2)
+    end
+    return sqrt(total / nsubs) / m
+end
+
+mht = mhtotdev(x_short, tau0, mlist=ms)
+expected = [ref_mhtotdev(x_short, m) for m in ms]
+max_rel = maximum(abs.(mht.deviation .- expected) ./ expected)
+@assert max_rel < 1e-9 "mhtotdev disagrees with reference (rel err $max_rel)"
+println("  ✓ mhtotdev max relative difference: $(round(max_rel, sigdigits=3))")
+
+function ref_totdev(x, m)
+    N = length(x)
+    xd = StabLab.detrend_linear(x)
+    x_star = [2xd[1] .- xd[2:N-1]; xd; 2xd[end] .- xd[end-1:-1:2]]
+    i = [i for i in 1:(3N - 2m - 4) if 1 <= i + m <= N]
+    d2 = x_star[N-2 .+ i .+ 2m] - 2x_star[N-2 .+ i .+ m] + x_star[N-2 .+ i]
+    return sqrt(sum(d2.^2) / (2 * (N - 2) * m^2))
+end
+
+tt = totdev(x_short, tau0, mlist=ms)
+expected = [ref_totdev(x_short, m) for m in ms]
+max_rel = maximum(abs.(tt.deviation .- expected) ./ expected)
+@assert max_rel < 1e-9 "totdev disagrees with reference (rel err $max_rel)"
+println("  ✓ totdev   max relative difference: $(round(max_rel, sigdigits=3))")
+
+@assert htotdev(x, tau0, mlist=[1]).deviation[1] ≈ hdev(x, tau0, mlist=[1]).deviation[1]
+println("  ✓ htotdev(m=1) equals overlapping HDEV")
+
+# 5. Parabolic deviation from running sums
+println("\n5. Parabolic deviation")
+
+function ref_pdev(x, m)
+    M = length(x) - 2m
+    s = 0.0
+    for i in 0:M-1
+        inner = sum(((m-1)/2 - k) * (x[i+k+1] - x[i+k+m+1]) for k in 0:m-1)
+        s += inner^2
+    end
+    return sqrt(72 * s / (M * m^4 * (m * tau0)^2))
+end
+
+x_drift = x_short .+ 1e-9 .* (1:length(x_short))
+for (label, data) in [("random walk", x_short), ("with drift", x_drift)]
+    pd = pdev(data, tau0, m_list=ms[2:end])
+    expected = [ref_pdev(data, m) for m in ms[2:end]]
+    max_rel = maximum(abs.(pd.deviation .- expected) ./ expected)
+    @assert max_rel < 1e-9 "pdev disagrees with reference on $label (rel err $max_rel)"
+    println("  ✓ pdev $(rpad(label, 12)) max relative difference: $(round(max_rel, sigdigits=3))")
+end
+
+x_chunks = cumsum(randn(3 * StabLab.PDEV_CHUNK)) * 1e-9
+@assert StabLab.pdev_sumsq(x_chunks, 100; threaded=true) == StabLab.pdev_sumsq(x_chunks, 100)
+println("  ✓ threaded and serial chunk sums are identical")
+
+println("\n✅ Kernel tests completed!")
@@ -0,0 +1,94 @@
+# Test the closed-form, single-pass noise identification engine
+
+using Pkg
+Pkg.activate(joinpath(@__DIR__, ".."))
+
+using StabLab
+using Random
+using Statistics
+
+Random.seed!(24)
+
+println("=== Testing Noise Identification ===\n")
+
+# Reference: design-matrix detrend and the differencing loop on copies
+function reference_lag1acf(x, m)
+    xd = x[1:m:end]
+    t = collect(1.0:length(xd))
+    A = hcat(ones(length(xd)), t, t .^ 2)
+    z = xd - A * (A \ xd)
+    d = 0
+    while true
+        rho = StabLab.compute_lag1_acf(z) / (1 + StabLab.compute_lag1_acf(z))
+        (rho < 0.25 || d >= 2) && return -2 * (rho + d) + 2
+        z = diff(z)
+        d += 1
+    end
+end
+
+# 1. Closed-form detrend
+println("1. Polynomial fits")
+N = 5000
+t = collect(1.0:N)
+x = cumsum(randn(N)) .+ 3e-2 .* t .^ 2 .- 40 .* t .+ 1e6
+A = hcat(ones(N), t, t .^ 2)
+@assert isapprox(StabLab.detrend_quadratic(x), x - A * (A \ x), atol=1e-6 * maximum(abs, x - A * (A \ x)))
+fit = StabLab.trend_fit(x, 1)
+@assert fit.c2 == 0 && isapprox(fit.c1 / fit.halfwidth, (hcat(ones(N), t) \ x)[2], rtol=1e-10)
+println("  ✓ quadratic and linear fits match the least-squares solution")
+
+# 2. Lag-1 ACF of every differencing order from one pass
+println("\n2. Lag-1 ACF orders")
+z = x - A * (A \ x)
+r1 = StabLab.lag1_acf_orders(x, 2, 2)
+@assert r1[1] ≈ StabLab.compute_lag1_acf(z)
+@assert r1[2] ≈ StabLab.compute_lag1_acf(diff(z))
+@assert r1[3] ≈ StabLab.compute_lag1_acf(diff(diff(z)))
+@assert isnan(StabLab.lag1_acf_orders(randn(5), 2, 2)[3])   # 3 points left after two differences
+println("  ✓ r1 after 0, 1 and 2 differences")
+
+# 3. Same α as the design-matrix implementation
+println("\n3. noise_id against the reference")
+mlist = [2^k for k in 0:8]
+for (name, series) in (("White PM", randn(20_000)), ("White FM", cumsum(randn(20_000))),
+                       ("RW FM", cumsum(cumsum(randn(20_000)))))
+    x_clean = StabLab.preprocess_x(series)
+    expected = [round(Int, reference_lag1acf(x_clean, m)) for m in mlist if length(x_clean) ÷ m >= 30]
+    got = noise_id(series, mlist)
+    @assert got[1:length(expected)] == expected "$name: $got vs $expected"
+    println("  ✓ $(rpad(name, 9)) α = $(Int.(got))")
+end
+
+datafile = joinpath(@__DIR__, "..", "validation", "data", "6krbsnip.txt")
+if isfile(datafile)
+    phase = Float64[parse(Float64, split(line)[2]) for line in eachline(datafile) if !isempty(strip(line))]
+    x_clean = StabLab.preprocess_x(phase)
+    octaves = [2^k for k in 0:floor(Int, log2(length(x_clean) / 30))]
+    @assert noise_id(phase, octaves) == [round(Int, reference_lag1acf(x_clean, m)) for m in octaves]
+    println("  ✓ 6krbsnip: identical α at $(length(octaves)) octave τ")
+end
+
+# 4. Few-point τ use the B1/R(n) test instead of failing
+println("\n4. B1 ratio path")
+x = cumsum(randn(3000))
+alpha = noise_id(x, [200, 500])
+@assert all(!isnan, alpha)
+@assert StabLab.simple_avar(x, 10) ≈ mean((x[21:end] .- 2 .* x[11:end-10] .+ x[1:end-20]) .^ 2) / 200
+@assert StabLab.simple_mvar(x, 10) ≈ mdev(x, 1.0, mlist=[10]).deviation[1]^2
+@assert StabLab.simple_mdev(x, 10, 1.0) ≈ 10 * mdev(x, 1.0, mlist=[10]).deviation[1]   # window sums, not means
+println("  ✓ α = $(Int.(alpha)) for N/m < 30")
+
+# Simulated power-law noise at N/m = 28: the median α over realizations is
+# the true one (each realization is right about three times in four)
+rng = MersenneTwister(24)
+xs = zeros(7168)
+for alpha in 2:-1:-2
+    ids = [noise_id(StabLab.powerlaw_noise!(xs, alpha, rng), [256])[1] for _ in 1:51]
+    @assert median(ids) == alpha "α = $alpha identified as $(Int.(ids))"
+    println("  ✓ α = $(rpad(alpha, 2)) recovered in $(count(==(alpha), ids))/51 realizations")
+end
+
+t_id = @elapsed noise_id(cumsum(randn(1_000_000)), [2^k for k in 0:14])
+println("  1M points, 15 τ: $(round(t_id * 1e3, digits=1)) ms")
+
+println("\n✅ Noise identification tests completed!")
@@ -0,0 +1,85 @@
+# Test the streaming accumulators against the batch deviation functions
+
+using Pkg
+Pkg.activate(joinpath(@__DIR__, ".."))
+
+using StabLab
+using Random
+
+Random.seed!(11)
+
+println("=== Testing Online Accumulators ===\n")
+
+tau0 = 0.5
+mlist = [1, 2, 3, 8, 50, 200]
+x = cumsum(randn(20_000)) * 1e-9 .+ 1e-6
+
+pairs = [(OnlineADEV, adev), (OnlineMDEV, mdev), (OnlineHDEV, hdev), (OnlineTDEV, tdev)]
+
+# 1. Sample-by-sample and chunked feeding agree with the batch functions
+println("1. Agreement with batch results")
+for (Acc, batch) in pairs
+    acc = Acc(tau0, mlist)
+    for chunk in Iterators.partition(x, 997)
+        append!(acc, collect(chunk))
+    end
+    online = DeviationResult(acc)
+    expected = batch(x, tau0, mlist=mlist)
+    @assert online.tau == expected.tau
+    @assert online.neff == expected.neff
+    @assert isapprox(online.deviation, expected.deviation, rtol=1e-9) "$(nameof(Acc)) drifted from $(nameof(batch))"
+    println("  ✓ $(rpad(nameof(Acc), 11)) matches $(nameof(batch)) after $(length(x)) samples")
+end
+
+# 2. Results are available at any moment; τ without enough samples stay NaN
+println("\n2. Partial results")
+acc = OnlineMDEV(tau0, mlist)
+append!(acc, x[1:100])
+partial = DeviationResult(acc)
+@assert partial.deviation[1:4] ≈ mdev(x[1:100], tau0, mlist=mlist[1:4]).deviation
+@assert all(isnan, partial.deviation[5:6]) && partial.neff[5:6] == [0, 0]
+println("  ✓ MDEV after 100 samples: $(count(!isnan, partial.deviation)) of $(length(mlist)) τ available")
+
+# 3. Memory does not grow with the stream
+println("\n3. Bounded memory")
+acc = OnlineHDEV(tau0, mlist)
+append!(acc, x)
+@assert length(acc.ring.data) == 3 * maximum(mlist) + 1
+println("  ✓ ring buffer holds $(length(acc.ring.data)) samples for $(acc.ring.count) pushed")
+
+try
+    push!(OnlineADEV(tau0, mlist), NaN)
+    @assert false "non-finite samples should be rejected"
+catch e
+    @assert e isa ArgumentError
+end
+println("  ✓ non-finite samples raise ArgumentError")
+
+# 4. Resumable batch results
+println("\n4. update() on batch results")
+for batch in (adev, mdev, hdev)
+    result, state = batch(x[1:5000], tau0, mlist=mlist, return_state=true)
+    @assert result.deviation == batch(x[1:5000], tau0, mlist=mlist).deviation
+    for chunk in (x[5001:5001], x[5002:12_345], x[12_346:end])
+        result, state = update(result, state, chunk)
+    end
+    expected = batch(x, tau0, mlist=mlist)
+    @assert result.N == expected.N && result.neff == expected.neff
+    @assert isapprox(result.deviation, expected.deviation, rtol=1e-12) "$(nameof(batch)) update drifted"
+    println("  ✓ $(rpad(nameof(batch), 4)) updated in three appends matches the full recompute")
+end
+
+result, state = adev(x[1:5000], tau0, mlist=mlist, noise=:auto, return_state=true)
+updated, _ = update(result, state, x[5001:6000])
+@assert updated.alpha == result.alpha
+println("  ✓ noise exponents carried over")
+
+try
+    update(mdev(x, tau0, mlist=mlist), state, x[1:10])
+    @assert false "mismatched state should be rejected"
+catch e
+    @assert e isa ArgumentError
+end
+println("  ✓ mismatched state raises ArgumentError")
+
+println("\n✅ Online accumulator tests completed!")
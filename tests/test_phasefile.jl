@@ -0,0 +1,83 @@
+# Test the memory-mapped binary phase format and chunked deviations
+
+using Pkg
+Pkg.activate(joinpath(@__DIR__, ".."))
+
+using StabLab
+using Random
+
+Random.seed!(13)
+
+println("=== Testing Binary Phase Files ===\n")
+
+tau0 = 0.25
+x_ns = cumsum(randn(50_000))  # phase in ns
+x = x_ns .* 1e-9
+path = tempname() * ".phs"
+
+# 1. Header and samples round-trip
+println("1. Round trip")
+write_phase_file(path, x_ns, tau0=tau0, scale=1e-9, start_time=60000.5)
+pf = open_phase_file(path)
+@assert pf isa PhaseFile{Float64}
+@assert pf.tau0 == tau0 && pf.scale == 1e-9 && pf.start_time == 60000.5
+@assert length(pf) == length(x_ns) && pf.data == x_ns
+@assert filesize(path) == 64 + 8 * length(x_ns)
+println("  ✓ header and $(length(pf)) Float64 samples read back")
+
+path32 = tempname() * ".phs"
+write_phase_file(path32, x_ns, tau0=tau0, scale=1e-9, dtype=Float32)
+pf32 = open_phase_file(path32)
+@assert pf32 isa PhaseFile{Float32} && pf32.data == Float32.(x_ns)
+println("  ✓ Float32 storage")
+
+# 2. Chunked evaluation agrees with the in-memory functions, for chunks
+#    smaller than m as well as larger ones
+println("\n2. Chunked deviations")
+mlist = [1, 2, 5, 16, 100, 1000]
+for (name, func) in [("adev", adev), ("mdev", mdev), ("hdev", hdev), ("mhdev", mhdev), ("tdev", tdev)]
+    expected = func(x, tau0, mlist=mlist)
+    for chunk in (StabLab.PHASEFILE_CHUNK, 4096, 7)
+        result = func(pf, mlist=mlist, chunk=chunk)
+        @assert result.tau == expected.tau && result.neff == expected.neff
+        @assert isapprox(result.deviation, expected.deviation, rtol=1e-10) "$name differs at chunk=$chunk"
+    end
+    println("  ✓ $(rpad(name, 5)) matches the in-memory result")
+end
+
+# Near the largest m the third differences still exist (N - 4m + 1 > 0) but
+# no m-point average of them fits (N - 5m + 2 ≤ 0)
+N = length(x)
+edge = [(N + 2) ÷ 5, (N + 2) ÷ 5 + 1, (N + 1) ÷ 4, (N + 1) ÷ 4 + 1]
+expected = mhdev(x, tau0, mlist=edge)
+result = mhdev(pf, mlist=edge, chunk=4096)
+@assert result.neff == expected.neff == vcat([N - 4m + 1 for m in edge[1:3]], 0)
+@assert isfinite(result.deviation[1]) && isapprox(result.deviation[1], expected.deviation[1], rtol=1e-10)
+@assert all(isnan, result.deviation[2:end]) && all(isnan, expected.deviation[2:end])
+println("  ✓ mhdev neff and NaN deviations match in memory near the largest m")
+
+default_tau = adev(pf).tau
+@assert default_tau == adev(x, tau0).tau
+println("  ✓ default τ grid and τ₀ taken from the header")
+
+# 3. Errors
+println("\n3. Errors")
+bad = tempname()
+write(bad, "not a phase file, just some text padding it out to 64 bytes......")
+for thunk in (() -> open_phase_file(bad),
+              () -> adev(pf, noise=:auto),
+              () -> write_phase_file(tempname(), x, scale=0.0))
+    try
+        thunk()
+        @assert false "expected ArgumentError"
+    catch e
+        @assert e isa ArgumentError
+    end
+end
+println("  ✓ bad magic, noise=:auto and invalid scale raise ArgumentError")
+
+rm(bad); rm(path32)
+pf = pf32 = nothing; GC.gc()
+rm(path)
+
+println("\n✅ Phase file tests completed!")
@@ -0,0 +1,79 @@
+# Test reusable analysis plans (stability_plan / execute!)
+
+using Pkg
+Pkg.activate(joinpath(@__DIR__, ".."))
+
+using StabLab
+using Random
+
+Random.seed!(18)
+
+println("=== Testing Analysis Plans ===\n")
+
+N = 5000
+tau0 = 0.5
+methods = ["adev", "mdev", "hdev", "mhdev", "tdev", "ldev", "totdev"]
+funcs = Dict("adev" => adev, "mdev" => mdev, "hdev" => hdev, "mhdev" => mhdev,
+             "tdev" => tdev, "ldev" => ldev, "totdev" => totdev)
+
+# 1. Results match the individual functions
+println("1. execute! against the individual functions")
+plan = stability_plan(N, tau0, methods)
+for trial in 1:3
+    x = cumsum(randn(N)) .* 1e-9
+    results = execute!(plan, x)
+    for method in methods
+        single = funcs[method](x, tau0)
+        r = results[method]
+        @assert r.tau == single.tau && r.neff == single.neff "$method τ grid differs"
+        @assert isapprox(r.deviation, single.deviation, rtol=1e-12, nans=true) "$method differs"
+    end
+end
+println("  ✓ all $(length(methods)) methods match on three series through one plan")
+
+mlist = [1, 2, 5, 10, 50]
+plan_m = stability_plan(N, tau0, ["adev", "totdev"], mlist=mlist)
+x = cumsum(randn(N)) .* 1e-9
+@assert isapprox(execute!(plan_m, x)["adev"].deviation, adev(x, tau0, mlist=mlist).deviation, rtol=1e-12)
+@assert isapprox(execute!(plan_m, x)["totdev"].deviation, totdev(x, tau0, mlist=mlist).deviation, rtol=1e-12)
+println("  ✓ explicit mlist")
+
+# 2. Tabulated confidence intervals
+println("\n2. EDF/CI tables")
+alpha = fill(0, length(mlist))
+plan_ci = stability_plan(N, tau0, ["adev", "mdev"], mlist=mlist, ci=true, noise=alpha)
+results = execute!(plan_ci, x)
+for method in ("adev", "mdev")
+    ref = compute_ci(funcs[method](x, tau0, mlist=mlist, noise=alpha))
+    @assert isapprox(results[method].ci, ref.ci, rtol=1e-12) "$method CI differs"
+    @assert isapprox(results[method].edf, ref.edf, rtol=1e-12, nans=true)
+end
+println("  ✓ intervals equal compute_ci on the same α")
+
+# 3. No allocations once the plan exists
+println("\n3. Allocations")
+measure(plan, x) = @allocated execute!(plan, x)
+x32 = Float32.(cumsum(randn(N)) .* 1e-9)
+for (p, series) in ((plan, x), (plan_ci, x), (plan, x32))
+    measure(p, series)  # compile
+    bytes = measure(p, series)
+    @assert bytes == 0 "execute! allocated $bytes bytes"
+end
+println("  ✓ execute! allocates 0 bytes (Float64 and Float32 input, with and without CI)")
+
+# 4. Argument checks
+println("\n4. Errors")
+for bad in (() -> execute!(plan, randn(N - 1)),
+            () -> stability_plan(N, tau0, ["mtotdev"]),
+            () -> stability_plan(N, tau0, ["adev"], noise=:auto),
+            () -> stability_plan(N, 0.0, ["adev"]))
+    try
+        bad()
+        @assert false "expected ArgumentError"
+    catch e
+        @assert e isa ArgumentError
+    end
+end
+println("  ✓ wrong length, unsupported method, noise=:auto and bad τ₀ raise ArgumentError")
+
+println("\n✅ Plan tests completed!")
@@ -0,0 +1,54 @@
+# Test the precision policy: Float32 storage, Float64 accumulation, input
+# element type preserved in the results
+
+using Pkg
+Pkg.activate(joinpath(@__DIR__, ".."))
+
+using StabLab
+using Random
+
+Random.seed!(15)
+
+println("=== Testing Precision Policy ===\n")
+
+N = 1_000_000
+tau0 = 1.0
+# Large phase offset relative to the noise, stored in single precision
+x32 = Float32.(1e-3 .+ cumsum(randn(N)) .* 1e-9)
+x64 = Float64.(x32)  # exactly the same samples
+mlist = [1, 4, 16, 64, 256, 1024]
+
+# 1. Kernels accumulate in Float64 whatever the storage type
+println("1. Accumulation type")
+@assert StabLab.accumulation_type(Float32) == Float64
+@assert StabLab.accumulation_type(Float64) == Float64
+@assert StabLab.accumulation_type(BigFloat) == BigFloat
+for kernel in (StabLab.adev_sumsq, StabLab.hdev_sumsq, StabLab.mdev_sumsq)
+    s32, s64 = kernel(x32, 16), kernel(x64, 16)
+    @assert s32 isa Float64 && s32 == s64 "$(nameof(kernel)) depends on the storage type"
+end
+println("  ✓ Float32 and Float64 copies of the same samples give identical sums")
+
+# 2. Float32 in, Float32 out, same values as the Float64 run
+println("\n2. Result element type")
+for func in (adev, mdev, hdev, mhdev, tdev, ldev, totdev, mtotdev, htotdev, mhtotdev)
+    ms = func in (mtotdev, htotdev, mhtotdev) ? mlist[2:4] : mlist
+    xs32, xs64 = func in (mtotdev, htotdev, mhtotdev) ? (x32[1:20_000], x64[1:20_000]) : (x32, x64)
+    r32 = func(xs32, tau0, mlist=ms)
+    r64 = func(xs64, tau0, mlist=ms)
+    @assert r32 isa DeviationResult{Float32} "$(nameof(func)) did not keep Float32"
+    @assert isapprox(r32.deviation, Float32.(r64.deviation), rtol=1e-6) "$(nameof(func)) lost precision"
+    println("  ✓ $(rpad(nameof(func), 8)) DeviationResult{Float32}, matches Float64 run")
+end
+
+suite = stability_suite(x32, tau0, methods=["adev", "mdev"], mlist=mlist)
+@assert suite["adev"] isa DeviationResult{Float32}
+println("  ✓ stability_suite keeps Float32")
+
+# 3. Confidence intervals on single-precision results
+println("\n3. compute_ci")
+ci = compute_ci(adev(x32, tau0, mlist=mlist))
+@assert ci isa DeviationResult{Float32} && all(ci.ci[:, 1] .< ci.deviation .< ci.ci[:, 2])
+println("  ✓ compute_ci works on DeviationResult{Float32}")
+
+println("\n✅ Precision tests completed!")
@@ -0,0 +1,97 @@
+# Test the decimation pyramid (phase_pyramid) and its queries
+
+using Pkg
+Pkg.activate(joinpath(@__DIR__, ".."))
+
+using StabLab
+using Random
+
+Random.seed!(20)
+
+println("=== Testing Decimation Pyramid ===\n")
+
+N = 100_003  # not a power of two: every level has an incomplete block
+tau0 = 1e-3
+x = cumsum(randn(N)) .* 1e-9
+pyr = phase_pyramid(x)
+
+# 1. Levels
+println("1. Levels")
+for k in (1, 5, 16)
+    g = 2^k
+    @assert pyr.heads[k] == x[1:g:end]
+    nb = N ÷ g
+    @assert pyr.sums[k] ≈ [sum(x[(j-1)*g+1:j*g]) for j in 1:nb]
+    @assert pyr.maxs[k] == [maximum(x[(j-1)*g+1:j*g]) for j in 1:nb]
+    @assert pyr.mins[k] == [minimum(x[(j-1)*g+1:j*g]) for j in 1:nb]
+end
+println("  ✓ heads, block sums and extremes at $(length(pyr.heads)) levels")
+
+# 2. Queries against direct computations
+println("\n2. Queries")
+mlist = [1, 2, 8, 64, 1024, 4096, 12]
+r = adev(pyr, tau0, mlist=mlist)
+for (k, m) in enumerate(mlist)
+    xd = x[1:m:end]
+    d2 = xd[3:end] .- 2 .* xd[2:end-1] .+ xd[1:end-2]
+    @assert r.neff[k] == length(d2)
+    @assert r.deviation[k] ≈ sqrt(sum(d2 .^ 2) / length(d2) / (2 * (m * tau0)^2))
+end
+println("  ✓ adev(pyr) equals the non-overlapping ADEV of x[1:m:end]")
+
+r = mdev(pyr, tau0, mlist=mlist)
+full = mdev(x, tau0, mlist=[1])
+@assert r.deviation[1] ≈ full.deviation[1]   # m = 1 uses every window
+for (k, m) in enumerate(mlist)
+    g = 2^trailing_zeros(m)
+    starts = 1:g:N-3m+1
+    D = [sum(x[i+2m:i+3m-1]) - 2 * sum(x[i+m:i+2m-1]) + sum(x[i:i+m-1]) for i in starts]
+    @assert r.neff[k] == length(starts)
+    @assert r.deviation[k] ≈ sqrt(sum(D .^ 2) / m^2 / length(D) / (2 * m^2 * tau0^2))
+end
+println("  ✓ mdev(pyr) equals MDEV over windows every 2^k samples")
+
+# Their own method tags, so compute_ci uses the EDF of the strided estimators
+ra = compute_ci(adev(pyr, tau0, mlist=mlist))
+rm_ = compute_ci(r)
+@assert ra.method == "adev_decimated" && rm_.method == "mdev_strided"
+for (k, m) in enumerate(mlist)
+    @assert ra.edf[k] ≈ StabLab.calculate_edf(0, 2, m, m, 1, N)
+    @assert rm_.edf[k] ≈ StabLab.calculate_edf(0, 2, m, 1, m ÷ 2^trailing_zeros(m), N)
+end
+println("  ✓ adev_decimated / mdev_strided tags with stride-matched EDF")
+
+m_list = [1, 2, 3, 5, 16, 100, 1000, 4095, 30000, N - 1]
+@assert mtie(pyr, tau0, m_list=m_list).deviation == mtie(x, tau0, m_list=m_list).deviation
+ramp = collect(1.0:5000.0) .+ randn(5000)
+@assert mtie(phase_pyramid(ramp), m_list=collect(1:50:4999)).deviation ==
+        mtie(ramp, m_list=collect(1:50:4999)).deviation
+println("  ✓ mtie(pyr) is identical to mtie on the data (noise and ramp)")
+
+octaves = [2^k for k in 0:10]
+@assert noise_id(pyr, octaves) == noise_id(x, octaves)
+println("  ✓ noise_id(pyr) gives the same α as noise_id(x)")
+
+# 3. Stored next to a phase file
+println("\n3. Persistence")
+path = tempname() * ".phs"
+write_phase_file(path, x ./ 1e-9; tau0=tau0, scale=1e-9, dtype=Float32)
+pf = open_phase_file(path)
+built = phase_pyramid(pf)
+@assert isfile(path * ".pyr")
+loaded = phase_pyramid(pf)
+@assert loaded.heads == built.heads && loaded.sums == built.sums && loaded.mins == built.mins
+@assert mdev(loaded, tau0, mlist=octaves).deviation == mdev(built, tau0, mlist=octaves).deviation
+@assert isapprox(mdev(loaded, tau0, mlist=[256]).deviation, mdev(phase_pyramid(Float64.(pf.data) .* 1e-9), tau0, mlist=[256]).deviation, rtol=1e-6)
+println("  ✓ .pyr written on first use, loaded on the next, same results")
+
+try
+    read_pyramid(path * ".pyr", x[1:1000])
+    @assert false "pyramid of another record should be rejected"
+catch e
+    @assert e isa ArgumentError
+end
+println("  ✓ pyramid from another record raises ArgumentError")
+rm(path * ".pyr"); rm(path)
+
+println("\n✅ Pyramid tests completed!")
@@ -0,0 +1,87 @@
+# Test the text/CSV/gzip phase reader
+
+using Pkg
+Pkg.activate(joinpath(@__DIR__, ".."))
+
+using StabLab
+using DelimitedFiles
+using CodecZlib
+using Random
+
+Random.seed!(14)
+
+println("=== Testing Phase Data Reader ===\n")
+
+x = cumsum(randn(200_000))
+dir = mktempdir()
+
+# 1. Formats
+println("1. File formats")
+one_col = joinpath(dir, "one.txt")
+open(one_col, "w") do io
+    println(io, "# phase in ns")
+    println(io, "% exported by a counter")
+    println(io)
+    foreach(v -> println(io, v), x)
+end
+@assert read_phase_data(one_col) == x
+println("  ✓ one column with '#', '%' and blank lines")
+
+two_col = joinpath(dir, "two.csv")
+open(two_col, "w") do io
+    for (k, v) in enumerate(x)
+        println(io, 60000 + k / 86400, ", ", v, "\r")
+    end
+end
+@assert read_phase_data(two_col, scale=1e-9) == x .* 1e-9
+println("  ✓ two-column CSV with CRLF line endings, scaled")
+
+gz = joinpath(dir, "one.txt.gz")
+write(gz, transcode(GzipCompressor, read(one_col)))
+@assert read_phase_data(gz) == x
+println("  ✓ gzip stream")
+
+rb = joinpath(@__DIR__, "..", "validation", "data", "6krbsnip.txt")
+if isfile(rb)
+    @assert read_phase_data(rb, scale=1e-9) == readdlm(rb, Float64)[:, 2] .* 1e-9
+    @assert load_phase_data(rb) == read_phase_data(rb, scale=1e-9)
+    println("  ✓ 6krbsnip.txt matches readdlm")
+end
+
+# 2. Threaded parsing splits at line breaks and keeps file order
+println("\n2. Parallel parsing")
+text = read(one_col, String)
+@assert StabLab.parse_phase_text(text, 1; threaded=true) == x
+@assert StabLab.parse_phase_text(text, 1; threaded=false) == x
+println("  ✓ threaded and serial parsing agree ($(Threads.nthreads()) threads)")
+
+# 3. Incremental blocks feed an online accumulator
+println("\n3. Streaming blocks")
+chunks = collect(phase_chunks(gz, block_bytes=10_000))
+@assert length(chunks) > 1 && reduce(vcat, chunks) == x
+acc = OnlineADEV(1.0, [1, 10, 100])
+for chunk in phase_chunks(two_col, scale=1e-9, block_bytes=65_536)
+    append!(acc, chunk)
+end
+@assert DeviationResult(acc).deviation ≈ adev(x .* 1e-9, 1.0, mlist=[1, 10, 100]).deviation
+println("  ✓ $(length(chunks)) blocks reassemble the file; OnlineADEV fed from blocks matches adev")
+
+# 4. Errors
+println("\n4. Errors")
+bad = joinpath(dir, "bad.txt")
+write(bad, "1.0 2.0 3.0\n")
+ragged = joinpath(dir, "ragged.txt")
+write(ragged, "1.0 2.0\n3.0\n")
+for file in (bad, ragged)
+    try
+        read_phase_data(file)
+        @assert false "expected ArgumentError"
+    catch e
+        @assert e isa ArgumentError
+    end
+end
+println("  ✓ three columns and ragged rows raise ArgumentError")
+
+rm(dir, recursive=true)
+
+println("\n✅ Reader tests completed!")
@@ -0,0 +1,67 @@
+# Test the multi-statistic engine against the individual deviation functions
+
+using Pkg
+Pkg.activate(joinpath(@__DIR__, ".."))
+
+using StabLab
+using Random
+
+Random.seed!(7)
+
+println("=== Testing stability_suite ===\n")
+
+N = 5000
+tau0 = 2.0
+x = cumsum(randn(N)) * 1e-9 .+ 1e-12 .* (1:N) .^ 2  # White FM plus drift
+
+individual = Dict("adev" => adev, "mdev" => mdev, "hdev" => hdev, "mhdev" => mhdev,
+                  "tdev" => tdev, "ldev" => ldev, "totdev" => totdev,
+                  "mtotdev" => mtotdev, "htotdev" => htotdev, "mhtotdev" => mhtotdev)
+all_methods = collect(keys(individual))
+
+function same_result(a, b)
+    return a.tau == b.tau && a.neff == b.neff && a.alpha == b.alpha && a.method == b.method &&
+           isapprox(a.deviation, b.deviation, rtol=1e-10, nans=true)
+end
+
+# 1. Default τ grids match each function's own defaults
+println("1. Default averaging factors")
+suite = stability_suite(x, tau0, methods=all_methods)
+for method in all_methods
+    @assert same_result(suite[method], individual[method](x, tau0)) "$method differs from $(method)()"
+    println("  ✓ $(rpad(method, 9)) $(length(suite[method].tau)) τ values")
+end
+
+# 2. Shared explicit mlist, including τ that some methods cannot reach
+println("\n2. Explicit mlist and precomputed noise")
+mlist = [1, 3, 10, 100, 1000, 2000]
+alpha = [-2, -1, 0, 0, 1, 1]
+suite = stability_suite(x, tau0, methods=all_methods, mlist=mlist, noise=alpha)
+for method in all_methods
+    expected = individual[method](x, tau0, mlist=mlist, noise=alpha)
+    @assert isapprox(suite[method].deviation, expected.deviation, rtol=1e-10, nans=true) "$method differs"
+    @assert suite[method].alpha == expected.alpha
+end
+println("  ✓ all methods agree on mlist = $mlist")
+
+# 3. Fused kernel against the single-statistic kernels
+println("\n3. Fused Allan-family kernel")
+for m in [1, 2, 7, 64, 999]
+    sums = StabLab.allan_family_sumsq(x, m)
+    @assert sums.adev ≈ StabLab.adev_sumsq(x, m)
+    @assert sums.hdev ≈ StabLab.hdev_sumsq(x, m)
+    @assert sums.mdev ≈ StabLab.mdev_sumsq(x, m)
+    @assert sums.mhdev ≈ StabLab.mhdev_sumsq(x, m)[1]
+end
+println("  ✓ ADEV, HDEV, MDEV and MHDEV sums match")
+
+# 4. Unknown methods are rejected
+try
+    stability_suite(x, tau0, methods=["adev", "foo"])
+    @assert false "unknown method should throw"
+catch e
+    @assert e isa ArgumentError
+end
+println("  ✓ unknown method raises ArgumentError")
+
+println("\n✅ stability_suite tests completed!")
@@ -0,0 +1,75 @@
+# Test opt-in multithreading of a single series (threaded=true)
+# Run with e.g. `julia --threads=4 tests/test_threads.jl`
+
+using Pkg
+Pkg.activate(joinpath(@__DIR__, ".."))
+
+using StabLab
+using Random
+
+Random.seed!(19)
+
+println("=== Testing Threaded Single-Series Execution ($(Threads.nthreads()) threads) ===\n")
+
+tau0 = 1.0
+
+# 1. Ranged kernels cover the full sums
+println("1. Kernels over position ranges")
+x = cumsum(randn(10_000)) .* 1e-9
+m = 7
+for (kernel, n) in ((StabLab.adev_sumsq, 10_000 - 2m), (StabLab.hdev_sumsq, 10_000 - 3m),
+                    (StabLab.mdev_sumsq, 10_000 - 3m + 1), (StabLab.mhdev_window_sumsq, 10_000 - 5m + 2))
+    whole = kernel(x, m, 1:n)
+    split = kernel(x, m, 1:3000) + kernel(x, m, 3001:7777) + kernel(x, m, 7778:n)
+    @assert isapprox(split, whole, rtol=1e-12) "$(nameof(kernel)) ranges do not add up"
+end
+@assert StabLab.mhdev_window_sumsq(x, m, 1:10_000 - 5m + 2) == first(StabLab.mhdev_sumsq(x, m))
+println("  ✓ adev/hdev/mdev/mhdev sums split over ranges match the whole")
+
+# 2. Block reductions do not depend on how blocks are scheduled
+println("\n2. Fixed-block reductions")
+N = 3 * StabLab.REDUCE_BLOCK + 123
+x = cumsum(randn(N)) .* 1e-9
+for m in (1, 16, 1000)
+    serial = StabLab.blocked_sumsq(StabLab.mdev_sumsq, x, m, N - 3m + 1; threaded=false)
+    threaded = StabLab.blocked_sumsq(StabLab.mdev_sumsq, x, m, N - 3m + 1; threaded=true)
+    @assert serial === threaded "block order changed the sum at m=$m"
+end
+println("  ✓ threaded block sums are bit-identical to the serial block order")
+
+# 3. Deviation functions: threaded agrees with serial and repeats exactly
+println("\n3. threaded=true against threaded=false")
+for func in (adev, mdev, hdev, mhdev, tdev, ldev, totdev)
+    a = func(x, tau0, threaded=true)
+    b = func(x, tau0)
+    @assert a.tau == b.tau && a.neff == b.neff
+    @assert isapprox(a.deviation, b.deviation, rtol=1e-10, nans=true) "$(nameof(func)) differs"
+    @assert isequal(func(x, tau0, threaded=true).deviation, a.deviation) "$(nameof(func)) not reproducible"
+    println("  ✓ $(rpad(nameof(func), 8)) $(length(a.tau)) τ")
+end
+
+xs = x[1:20_000]
+for func in (mtotdev, htotdev, mhtotdev)
+    a = func(xs, tau0, threaded=true)
+    b = func(xs, tau0)
+    @assert a.tau == b.tau && isequal(a.deviation, b.deviation) "$(nameof(func)) differs"
+    println("  ✓ $(rpad(nameof(func), 8)) identical (τ-level only)")
+end
+
+a = pdev(x, tau0, m_list=[2, 64, 256], threaded=true)
+@assert isequal(a.deviation, pdev(x, tau0, m_list=[2, 64, 256]).deviation) "pdev differs"
+println("  ✓ pdev     identical (chunks added in order)")
+
+xt = x[1:4000]
+for func in (theo1, theobr)
+    a = func(xt, tau0, m_list=[10, 128, 512], fast=false, threaded=true)
+    @assert isequal(a.deviation, func(xt, tau0, m_list=[10, 128, 512], fast=false).deviation) "$(nameof(func)) differs"
+    println("  ✓ $(rpad(nameof(func), 8)) identical (lag chunks added in order)")
+end
+
+# 4. Short records fit in one block: threaded equals serial exactly
+short = cumsum(randn(5000)) .* 1e-9
+@assert adev(short, tau0, threaded=true).deviation == adev(short, tau0).deviation
+println("  ✓ records shorter than one block give the serial result exactly")
+
+println("\n✅ Threading tests completed!")
@@ -153,4 +153,99 @@ for (tau, limit) in zip(tau_test, mask_g811)
     println("  τ = $(tau) s: MTIE limit = $(limit_ns) ns")
 end
 
+# MTIE sliding-window engines against a direct scan
+println("\n8. Testing MTIE Engines Against Direct Scan")
+println("-"^30)
+function brute_mtie(x, m)
+    w = m + 1
+    return maximum(maximum(x[i:i+w-1]) - minimum(x[i:i+w-1]) for i in 1:length(x)-m)
+end
+
+for (label, x) in [("random walk", phase_data[1:700]), ("falling ramp", collect(700.0:-1.0:1.0) .* 1e-9)]
+    ms = [1, 2, 3, 7, 64, 99, 100, 101, 255, 256, 511, 699]
+    expected = [brute_mtie(x, m) for m in ms]
+    idx = MTIEIndex(x)
+    @assert mtie(x, tau0, m_list=ms).deviation ≈ expected "deque MTIE mismatch on $label"
+    @assert mtie(x, tau0, m_list=ms, index=idx).deviation ≈ expected "indexed MTIE mismatch on $label"
+    println("  ✓ $label: deque and sparse-table paths match the direct scan")
+end
+
+short_idx = MTIEIndex(phase_data[1:700], max_window=64)
+@assert mtie(phase_data[1:700], tau0, m_list=[1:63;], index=short_idx).deviation ≈
+        mtie(phase_data[1:700], tau0, m_list=[1:63;]).deviation
+try
+    mtie(phase_data[1:700], tau0, m_list=[200], index=short_idx)
+    @assert false "window beyond max_window should throw"
+catch e
+    @assert e isa ArgumentError
+end
+try
+    mtie(phase_data, tau0, index=short_idx)
+    @assert false "index length mismatch should throw"
+catch e
+    @assert e isa ArgumentError
+end
+println("  ✓ max_window limit and length mismatch raise ArgumentError")
+
+# THEO1 engines and the TheoBR/TheoH family
+println("\n9. Testing THEO1, TheoBR and TheoH")
+println("-"^30)
+function brute_theo1(x, m, tau0)
+    N = length(x); h = div(m, 2); s = 0.0
+    for i in 1:N-m, delta in 0:h-1
+        s += ((x[i] - x[i-delta+h]) + (x[i+m] - x[i+delta+h]))^2 / (h - delta)
+    end
+    return sqrt(s / (0.75 * (N - m) * (m * tau0)^2))
+end
+
+x_theo = phase_data[1:2000]
+ms_theo = [10, 16, 64, 256, 1000]
+@assert theo1(x_theo, tau0, m_list=ms_theo).deviation ≈ [brute_theo1(x_theo, m, tau0) for m in ms_theo]
+println("  ✓ theo1 matches the direct double sum")
+
+exact = theo1(phase_data, tau0, m_list=[256, 1024]).deviation
+fast = theo1(phase_data, tau0, m_list=[256, 1024], fast=true).deviation
+@assert all(abs.(fast ./ exact .- 1) .< 0.05) "strided THEO1 strays from the exact sum: $(fast ./ exact)"
+println("  ✓ strided THEO1 within 5% of exact (ratios $(round.(fast ./ exact, digits=4)))")
+
+# The documented bound of the strided approximation, WPM through RWFM
+x_pl = zeros(8192)
+for alpha in 2:-1:-2
+    StabLab.powerlaw_noise!(x_pl, alpha, Random.default_rng())
+    for m in (128, 256, 512, 1024)
+        err = StabLab.theo1_sumsq_strided(x_pl, m) / StabLab.theo1_sumsq(x_pl, m) - 1
+        @assert abs(err) < 0.05 "strided THEO1 off by $(round(100err, digits=2))% at α=$alpha, m=$m"
+    end
+end
+println("  ✓ strided THEO1 within 5% of exact for α = 2..-2, m = 128..1024")
+@assert theobr(x_theo, tau0, m_list=ms_theo).deviation == theobr(x_theo, tau0, m_list=ms_theo, fast=false).deviation
+println("  ✓ theobr/theoh default to the exact sums")
+
+br = theobr(x_theo, tau0, m_list=ms_theo, fast=false)
+t1 = theo1(x_theo, tau0, m_list=ms_theo)
+scale = br.deviation ./ t1.deviation
+@assert all(scale .≈ scale[1]) "TheoBR must be a constant rescaling of THEO1"
+println("  ✓ TheoBR = $(round(scale[1], digits=4)) × THEO1")
+
+@assert br.tau ≈ 0.75 .* t1.tau
+println("  ✓ TheoBR reported at τ = 0.75·m·τ₀")
+
+th = theoh(phase_data, tau0)
+adev_short = adev(phase_data, tau0, mlist=[1, 2, 4]).deviation
+@assert th.deviation[1:3] ≈ adev_short
+k_th = 2^floor(Int, log2(0.1 * N))
+m_th = 2 * cld(ceil(Int, k_th / 0.75), 2)
+br_th = theobr(phase_data, tau0, m_list=[m_th])
+@assert th.tau[round(Int, log2(k_th)) + 2] ≈ br_th.tau[1]
+@assert th.deviation[round(Int, log2(k_th)) + 2] ≈ br_th.deviation[1]
+@assert issorted(th.tau) && th.tau[end] <= 0.75 * (N - 1) * tau0
+println("  ✓ TheoH: $(length(th.tau)) points from τ = $(th.tau[1]) s to $(th.tau[end]) s")
+
+try
+    theobr(phase_data[1:50], tau0)
+    @assert false "short records should be rejected"
+catch e
+    @assert e isa ArgumentError
+end
+
 println("\nAll time interval error functions tested successfully!")
\ No newline at end of file
@@ -0,0 +1,132 @@
+# Test the simulated EDF/bias tables of the total variances
+
+using Pkg
+Pkg.activate(joinpath(@__DIR__, ".."))
+
+using StabLab
+using Random
+
+Random.seed!(23)
+
+println("=== Testing Total-Variance EDF Tables ===\n")
+
+# 1. Shipped table
+println("1. data/total_tables.bin")
+tables = StabLab.total_tables()
+@assert tables !== nothing
+@assert size(tables.edf) == (length(StabLab.TOTAL_VARIANTS), length(tables.alphas), length(tables.ratios))
+@assert tables.alphas == collect(-2:2)
+@assert all(>(0), tables.edf)
+println("  ✓ $(length(tables.alphas)) α × $(length(tables.ratios)) T/τ, $(tables.nsim) replicates per point")
+
+# Published White FM TOTVAR EDF is 1.5·T/τ
+edf_256 = StabLab.totaldev_edf("totvar", 0, 256.0, 1.0)
+@assert isapprox(edf_256, 1.5 * 256, rtol=0.2)
+println("  ✓ TOTVAR White FM EDF at T/τ=256: $(round(edf_256, digits=1)) (published $(1.5 * 256))")
+
+# 2. O(1) lookup: grid points, interpolation, extrapolation, misses
+println("\n2. Lookup")
+v = findfirst(==("mhtot"), StabLab.TOTAL_VARIANTS)
+for (r, ratio) in enumerate(tables.ratios)
+    @assert StabLab.table_lookup(:edf, "mhtot", -1, ratio) ≈ tables.edf[v, 2, r]
+end
+lo, hi = tables.edf[v, 3, 3], tables.edf[v, 3, 4]
+mid = StabLab.table_lookup(:edf, "mhtot", 0, sqrt(tables.ratios[3] * tables.ratios[4]))
+@assert mid ≈ sqrt(lo * hi)
+@assert StabLab.table_lookup(:edf, "mhtot", 0, 4 * tables.ratios[end]) ≈ 4 * tables.edf[v, 3, end]
+@assert isnan(StabLab.table_lookup(:edf, "mhtot", -3, 100.0))
+@assert isnan(StabLab.table_lookup(:edf, "mhtot", 0, 2.0))
+@assert isnan(StabLab.table_lookup(:edf, "theo1", 0, 100.0))
+println("  ✓ grid values, log-log interpolation, EDF ∝ T/τ past the grid, NaN off the table")
+
+# 3. compute_ci and bias_correction read the tables
+println("\n3. compute_ci and bias_correction")
+x = cumsum(randn(8192)) .* 1e-9
+r = mhtotdev(x, 1.0, mlist=[4, 16, 64, 256], noise=fill(0, 4))
+ci = compute_ci(r)
+for k in eachindex(r.tau)
+    @assert ci.edf[k] ≈ StabLab.table_lookup(:edf, "mhtot", 0, (r.N - 1) / (r.tau[k] / r.tau0))
+    @assert ci.ci[k, 1] < ci.deviation[k] < ci.ci[k, 2]
+end
+println("  ✓ mhtotdev gets chi-squared intervals from the table")
+
+B = StabLab.bias_correction([0, -1, -2], "mhtot", [64.0, 64.0, 64.0], 64.0 * 64)
+@assert all(isfinite, B) && all(>(0), B)
+@assert StabLab.bias_correction(-1, "totvar", 1.0, tables.ratios[5])[1] ≈ sqrt(tables.bias[1, 2, 5])
+@assert StabLab.bias_correction(-2, "mhtot", 1.0, tables.ratios[5])[1] ≈ sqrt(tables.bias[v, 1, 5])
+@assert StabLab.bias_correction(-3, "htot", 1.0, 100.0)[1] ≈ sqrt(1 - 0.283)   # published fallback
+@assert StabLab.bias_correction(-3, "mhtot", 1.0, 100.0)[1] == 1.0
+println("  ✓ bias factors √R from the table, published values off the table")
+
+# No jump at the grid edges: below the first T/τ column, and over the mhtot
+# column that MHDEV cannot reach, the nearest table value is held
+for (name, alpha) in (("totvar", -2), ("mtot", 0), ("htot", -1))
+    edge = StabLab.bias_correction(alpha, name, 1.0, tables.ratios[1])[1]
+    @assert StabLab.bias_correction(alpha, name, 1.0, 0.99 * tables.ratios[1])[1] ≈ edge
+    @assert StabLab.bias_correction(alpha, name, 1.0, 3.0)[1] ≈ edge
+end
+@assert isnan(tables.bias[v, 3, 1])
+@assert StabLab.bias_correction(0, "mhtot", 1.0, 5.0)[1] ≈ sqrt(tables.bias[v, 3, 2])
+@assert isapprox(StabLab.bias_correction(0, "mhtot", 1.0, 1.01 * tables.ratios[2])[1],
+                 sqrt(tables.bias[v, 3, 2]), rtol=0.02)
+println("  ✓ factors continuous at the T/τ grid edges")
+
+# MHTOTDEV is biased high at Random Walk FM; the corrected deviation must move
+# toward MHDEV, not away from it
+mlist = [4, 8, 16]
+raw = zeros(length(mlist)); corrected = zeros(length(mlist)); base = zeros(length(mlist))
+for _ in 1:20
+    x = cumsum(cumsum(randn(4096)))
+    tot = mhtotdev(x, 1.0, mlist=mlist, noise=fill(-2, length(mlist)))
+    raw .+= tot.deviation .^ 2
+    corrected .+= StabLab.apply_bias_correction!(tot).deviation .^ 2
+    base .+= mhdev(x, 1.0, mlist=mlist).deviation .^ 2
+end
+@assert all(raw .> base)
+@assert all(abs.(log.(corrected ./ base)) .< abs.(log.(raw ./ base)))
+println("  ✓ RWFM mhtotdev corrected toward mhdev: ",
+        join([string(round(sqrt(raw[k] / base[k]), digits=2), " → ",
+                     round(sqrt(corrected[k] / base[k]), digits=2)) for k in eachindex(mlist)], ", "))
+
+# 4. Generator and file format
+println("\n4. Generator")
+small = StabLab.simulate_total_tables(alphas=[0, 1], ratios=[4.0, 8.0], m=4, nsim=40)
+@assert isequal(small.edf, StabLab.simulate_total_tables(alphas=[0, 1], ratios=[4.0, 8.0], m=4, nsim=40,
+                                                         threaded=false).edf)
+path = tempname()
+StabLab.write_total_tables(path, small)
+back = StabLab.read_total_tables(path)
+@assert back.alphas == small.alphas && back.ratios == small.ratios && back.m == 4 && back.nsim == 40
+@assert isequal(back.edf, small.edf) && isequal(back.bias, small.bias)
+write(path, read(path)[1:end-8])
+try
+    StabLab.read_total_tables(path)
+    @assert false "truncated table should be rejected"
+catch e
+    @assert e isa ArgumentError
+end
+rm(path)
+println("  ✓ reproducible for any thread count, round trip through the file, truncation detected")
+
+# The shipped cells must be what the generator produces, to within the
+# Monte-Carlo error of a fresh, smaller run on an independent seed
+nsim = 400
+fresh = StabLab.simulate_total_tables(alphas=[-2, 0, 2], ratios=[16.0, 32.0], m=tables.m,
+                                      nsim=nsim, seed=1)
+for (a, alpha) in enumerate(fresh.alphas), (r, ratio) in enumerate(fresh.ratios)
+    ta = findfirst(==(alpha), tables.alphas)
+    tr = findfirst(==(ratio), tables.ratios)
+    for (v, name) in enumerate(StabLab.TOTAL_VARIANTS)
+        edf, shipped_edf = fresh.edf[v, a, r], tables.edf[v, ta, tr]
+        bias, shipped_bias = fresh.bias[v, a, r], tables.bias[v, ta, tr]
+        # Relative s.e. of a sample variance of nsim χ²(edf)/edf draws, and of
+        # a ratio of two means whose relative variances are at most 2/edf each
+        se_edf = sqrt(2 / nsim * (1 + 6 / edf))
+        se_bias = sqrt(4 / edf / nsim)
+        @assert abs(log(edf / shipped_edf)) < 5 * se_edf "$name EDF at α=$alpha, T/τ=$ratio"
+        @assert abs(log(bias / shipped_bias)) < 5 * se_bias "$name bias at α=$alpha, T/τ=$ratio"
+    end
+end
+println("  ✓ shipped cells agree with simulate_total_tables within Monte-Carlo error")
+
+println("\n✅ Total-variance table tests completed!")
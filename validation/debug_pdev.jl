@@ -92,4 +92,23 @@ variance_alt2 = 6 * sum_sq / (M * m^2 * tau_val^2)
 pdev_alt2 = sqrt(variance_alt2)
 println(@sprintf("Alt 2 (6/m^2 factor): %.6e", pdev_alt2))
 
+# Running-sum implementation against the explicit double loop
+println("\nChecking pdev against the direct double loop...")
+for m in [2, 3, 4, 8, 16, 50, 200]
+    M = N - 2*m
+    direct = 0.0
+    for i in 0:M-1
+        inner_sum = 0.0
+        for k in 0:m-1
+            inner_sum += ((m-1)/2.0 - k) * (phase_data[i+k+1] - phase_data[i+k+m+1])
+        end
+        direct += inner_sum^2
+    end
+    direct_pdev = sqrt(72 * direct / (M * m^4 * (m * tau0)^2))
+    fast_pdev = pdev(phase_data, tau0, m_list=[m]).deviation[1]
+    rel = abs(fast_pdev - direct_pdev) / direct_pdev
+    println(@sprintf("  m = %-4d direct %.6e  pdev %.6e  rel diff %.1e %s",
+                     m, direct_pdev, fast_pdev, rel, rel < 1e-9 ? "✓" : "✗"))
+end
+
 println("\nPDEV debugging complete.")
\ No newline at end of file
@@ -0,0 +1,28 @@
+# Regenerate data/total_tables.bin, the simulated EDF and bias tables of the
+# total variances read by compute_ci and bias_correction.
+# Run offline with e.g. `julia --threads=auto validation/generate_total_tables.jl [nsim]`
+# and commit the output; tests/test_total_tables.jl checks that the shipped
+# cells agree with a fresh run of simulate_total_tables.
+
+using Pkg
+Pkg.activate(joinpath(@__DIR__, ".."))
+
+using StabLab
+using Printf
+
+nsim = isempty(ARGS) ? 2000 : parse(Int, ARGS[1])
+println("Simulating total-variance tables: $nsim replicates per point, $(Threads.nthreads()) threads")
+
+t = @elapsed tables = StabLab.simulate_total_tables(nsim=nsim)
+
+for (v, name) in enumerate(StabLab.TOTAL_VARIANTS)
+    println("\n$name: EDF / bias by α (rows) and T/τ (columns)")
+    println(rpad("α", 4), join([@sprintf("%10d", round(Int, r)) for r in tables.ratios]))
+    for (a, alpha) in enumerate(tables.alphas)
+        println(rpad(alpha, 4), join([@sprintf("%10.1f", e) for e in tables.edf[v, a, :]]))
+        println(rpad("", 4), join([@sprintf("%10.4f", b) for b in tables.bias[v, a, :]]))
+    end
+end
+
+StabLab.write_total_tables(StabLab.TOTAL_TABLE_PATH, tables)
+println("\nWrote $(StabLab.TOTAL_TABLE_PATH) in $(round(t, digits=1)) s")
@@ -0,0 +1,157 @@
+# Validate the streaming total-deviation engines against the original
+# per-subsequence implementations on real rubidium clock data (6krbsnip.txt)
+
+using Pkg
+Pkg.activate(joinpath(@__DIR__, ".."))
+
+using StabLab
+using DelimitedFiles
+using Statistics
+using Printf
+
+println("Total Deviation Engine Validation: 6krbsnip.txt")
+println("="^50)
+
+data_file = joinpath(@__DIR__, "data", "6krbsnip.txt")
+if !isfile(data_file)
+    println("Error: Data file not found: $data_file")
+    exit(1)
+end
+
+# Two-column file (MJD, phase in ns); the original algorithms are O(N·m) with
+# heavy allocation, so a subset keeps the reference runs short
+raw = readdlm(data_file, Float64)
+N_subset = min(4000, size(raw, 1))
+phase_data = raw[1:N_subset, 2] .* 1e-9
+tau0 = 1.0
+println("Using $N_subset of $(size(raw, 1)) points, τ₀ = $tau0 s\n")
+
+# -------------------- Reference implementations --------------------
+
+function reference_mtotdev(x, tau0, mlist)
+    N = length(x)
+    out = fill(NaN, length(mlist))
+    for (k, m) in enumerate(mlist)
+        nsubs = N - 3*m + 1
+        nsubs < 1 && continue
+        outer_sum = 0.0
+        for n in 1:nsubs
+            seq = x[n:n+3*m-1]
+            half_n = 3*m / 2
+            if m == 1
+                slope = (seq[3] - seq[1]) / (2 * tau0)
+            else
+                first_half = mean(seq[1:floor(Int, half_n)])
+                last_half = mean(seq[floor(Int, half_n)+1:end])
+                slope = (last_half - first_half) / (half_n * tau0)
+            end
+            seq_detrended = seq - slope * tau0 * (0:3*m-1)
+            ext = [seq_detrended[end:-1:1]; seq_detrended; seq_detrended[end:-1:1]]
+            cs = cumsum([0.0; ext])
+            avg1 = (cs[1+m:6*m+m] - cs[1:6*m]) ./ m
+            avg2 = (cs[1+2*m:6*m+2*m] - cs[1+m:6*m+m]) ./ m
+            avg3 = (cs[1+3*m:6*m+3*m] - cs[1+2*m:6*m+2*m]) ./ m
+            d2 = avg3 - 2*avg2 + avg1
+            outer_sum += sum(d2.^2) / (6 * m)
+        end
+        out[k] = sqrt(outer_sum / (2 * (m * tau0)^2 * nsubs))
+    end
+    return out
+end
+
+function reference_htotdev(x, tau0, mlist)
+    y = diff(x) ./ tau0
+    Ny = length(y)
+    out = fill(NaN, length(mlist))
+    for (k, m) in enumerate(mlist)
+        n_iterations = Ny - 3*m + 1
+        (m == 1 || n_iterations < 1) && continue
+        dev_sum = 0.0
+        for i in 0:(n_iterations-1)
+            xs = y[i+1:i+3*m]
+            mean1 = mean(xs[1:floor(Int, 3*m/2)])
+            mean2 = mean(xs[ceil(Int, 3*m/2)+1:end])
+            slope = isodd(3*m) ? (mean2 - mean1) / (0.5*(3*m-1) + 1) : (mean2 - mean1) / (0.5*3*m)
+            x0 = [xs[j+1] - slope * (j - floor(3*m/2)) for j in 0:3*m-1]
+            xstar = [x0[end:-1:1]; x0; x0[end:-1:1]]
+            cs = cumsum([0.0; xstar])
+            j = 0:(6*m-1)
+            H = ((cs[j.+3*m.+1] - cs[j.+2*m.+1]) - 2*(cs[j.+2*m.+1] - cs[j.+m.+1]) +
+                 (cs[j.+m.+1] - cs[j.+1])) ./ m
+            dev_sum += sum(H.^2) / (6*m)
+        end
+        out[k] = sqrt(dev_sum / (6 * n_iterations))
+    end
+    return out
+end
+
+function reference_mhtotdev(x, tau0, mlist)
+    N = length(x)
+    out = fill(NaN, length(mlist))
+    for (k, m) in enumerate(mlist)
+        nsubs = N - 4*m + 1
+        nsubs < 1 && continue
+        total_sum = 0.0
+        for n in 1:nsubs
+            phase_detrended = StabLab.detrend_linear(x[n:n+3*m])
+            ext = [phase_detrended[end:-1:1]; phase_detrended; phase_detrended[end:-1:1]]
+            L = length(ext) - 3*m
+            d3 = ext[1:L] - 3*ext[1+m:L+m] + 3*ext[1+2*m:L+2*m] - ext[1+3*m:L+3*m]
+            S = cumsum([0.0; d3])
+            avg = S[m+1:end] - S[1:end-m]
+            total_sum += mean(avg.^2) / (6 * m^2)
+        end
+        out[k] = sqrt(total_sum / nsubs) / (m * tau0)
+    end
+    return out
+end
+
+function reference_totdev(x, tau0, mlist)
+    N = length(x)
+    x_drift_removed = StabLab.detrend_linear(x)
+    x_left = 2*x_drift_removed[1] .- x_drift_removed[2:N-1]
+    x_right = 2*x_drift_removed[end] .- x_drift_removed[end-1:-1:2]
+    x_star = [x_left; x_drift_removed; x_right]
+    offset = length(x_left)
+    out = fill(NaN, length(mlist))
+    for (k, m) in enumerate(mlist)
+        i_all = 1:(3*N - 2*m - 4)
+        i = i_all[(i_all .+ m .>= 1) .& (i_all .+ m .<= N)]
+        isempty(i) && continue
+        d2 = x_star[offset .+ i .+ 2*m] - 2*x_star[offset .+ i .+ m] + x_star[offset .+ i]
+        out[k] = sqrt(sum(d2.^2) / (2 * (N - 2) * (m * tau0)^2))
+    end
+    return out
+end
+
+# -------------------- Comparison --------------------
+
+function compare(name, engine, reference, mlist; rtol=1e-9)
+    t_ref = @elapsed ref = reference(phase_data, tau0, mlist)
+    t_new = @elapsed res = engine(phase_data, tau0, mlist=mlist)
+    rel = maximum(abs.(res.deviation .- ref) ./ ref)
+    status = rel < rtol ? "✓" : "✗"
+    println(@sprintf("%s %-9s max rel diff %.2e | reference %.3f s, engine %.3f s",
+                     status, name, rel, t_ref, t_new))
+    return rel < rtol
+end
+
+all_ok = true
+all_ok &= compare("totdev", totdev, reference_totdev, [1, 2, 4, 8, 16, 32, 64, 128, 1024])
+all_ok &= compare("mtotdev", mtotdev, reference_mtotdev, [1, 2, 4, 8, 16, 32, 64, 128])
+all_ok &= compare("htotdev", htotdev, reference_htotdev, [2, 4, 8, 16, 32, 64, 128])
+all_ok &= compare("mhtotdev", mhtotdev, reference_mhtotdev, [1, 2, 4, 8, 16, 32, 64, 128])
+
+# -------------------- Full-day sweep --------------------
+
+println("\nOctave sweep on one day of 1 Hz data (86,400 points)")
+day = cumsum(randn(86_400)) .* 1e-9
+for (name, func) in [("totdev", totdev), ("mtotdev", mtotdev), ("htotdev", htotdev), ("mhtotdev", mhtotdev)]
+    func(day[1:1000], 1.0)  # compile
+    t = @elapsed res = func(day, 1.0)
+    println(@sprintf("  %-9s %2d τ values in %.3f s", name, length(res.tau), t))
+end
+
+println()
+println(all_ok ? "✅ All engines match the reference implementations" :
+                 "❌ Engine mismatch detected")